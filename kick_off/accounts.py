@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+
+
+PLAYER_CLAIM = 'player_id'
+
+
+# Firebase 로그인한 선수(kick_off.User)에게 API 토큰 발급
+# JWTAuthentication 은 django.contrib.auth 사용자로 인증하므로 Firebase UID 를 사용자 이름으로 한 로그인 계정을 만들고
+# (비밀번호로는 로그인할 수 없음), 어떤 선수인지는 토큰의 player_id 클레임에 담는다.
+# 토큰을 갱신(auth/token/refresh/)해도 player_id 는 그대로 유지된다.
+def issue_tokens(player):
+    account, _ = get_user_model().objects.get_or_create(
+        username=player.firebase_uid, defaults={'password': make_password(None)},
+    )
+    refresh = RefreshToken.for_user(account)
+    refresh[PLAYER_CLAIM] = player.user_id
+    return {'access': str(refresh.access_token), 'refresh': str(refresh)}
+
+
+# 요청한 선수: 로그인 토큰의 player_id 클레임으로 찾는다. (player_id 가 없는 토큰이면 None)
+def current_player(request):
+    player_id = request.auth.get(PLAYER_CLAIM) if request.auth is not None else None
+    if player_id is None:
+        return None
+    return User.objects.filter(user_id=player_id).first()
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Mission, User, Game, Level, Points, Favorite, Video, Payment, Apply, Notification, UserMission
+from .models import Mission, User, Game, Level, Points, Favorite, Video, Payment, Apply, Notification, UserMission, NotificationFanout, LevelProgressionRun, PaymentSettlementRun
+from .waitlist import process_waitlist
 
 # 사용자 관리 - 검색, 필터 등 추가
 @admin.register(User)
@@ -18,9 +19,40 @@ class MissionAdmin(admin.ModelAdmin):
 # 게임 관리
 @admin.register(Game)
 class GameAdmin(admin.ModelAdmin):
-    list_display = ('game_name', 'game_date', 'location', 'status')
+    list_display = ('game_name', 'game_date', 'location', 'participant_count', 'max_participants', 'status')
     search_fields = ('game_name',)
     list_filter = ('status', 'game_date')
+    readonly_fields = ('participant_count',)  # participants 변경 시 자동 계산
+    actions = ('process_waitlist',)
+
+    @admin.action(description='대기 신청을 참가자로 처리')
+    def process_waitlist(self, request, queryset):
+        accepted = rejected = 0
+        for game in queryset:
+            result = process_waitlist(game)
+            accepted += result['accepted']
+            rejected += result['rejected']
+        self.message_user(request, f'승인 {accepted}건, 거절 {rejected}건')
+
+# 알림 일괄 발송 작업
+@admin.register(NotificationFanout)
+class NotificationFanoutAdmin(admin.ModelAdmin):
+    list_display = ('fanout_id', 'game', 'region', 'audience', 'status', 'sent_count', 'creation_date')
+    list_filter = ('status', 'audience')
+
+# 레벨 승급 일괄 처리 작업
+@admin.register(LevelProgressionRun)
+class LevelProgressionRunAdmin(admin.ModelAdmin):
+    list_display = ('run_id', 'status', 'processed_count', 'promoted_count', 'creation_date', 'completion_date')
+    list_filter = ('status',)
+
+@admin.register(PaymentSettlementRun)
+class PaymentSettlementRunAdmin(admin.ModelAdmin):
+    list_display = (
+        'run_id', 'status', 'processed_count', 'completed_count', 'failed_count', 'error_count',
+        'creation_date', 'completion_date',
+    )
+    list_filter = ('status',)
 
 # 다른 모델들 기본 등록
 admin.site.register(Level)
@@ -0,0 +1,184 @@
+import asyncio
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from firebase_admin.exceptions import FirebaseError
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import firebase_auth
+from .accounts import issue_tokens
+from .events import broker, format_event
+from .models import User
+
+
+# ASGI 용 비동기 뷰 (views.py 의 phone_login, verify_firebase_token, get_user_profile 과 같은 응답)
+# DRF 함수 뷰는 비동기를 지원하지 않으므로 Django 비동기 뷰로 작성하고,
+# 인증/권한은 DRF 기본 설정(DEFAULT_AUTHENTICATION_CLASSES, DEFAULT_PERMISSION_CLASSES)을 그대로 사용한다.
+
+# 블로킹 SDK 호출(Firebase 토큰 검증 등)을 실행하는 크기가 제한된 스레드 풀
+sdk_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_SDK_MAX_WORKERS', 8),
+    thread_name_prefix='kick_off-sdk',
+)
+
+
+async def run_blocking(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(sdk_executor, func, *args)
+
+
+def _check_permissions(request):
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        for permission in api_settings.DEFAULT_PERMISSION_CLASSES:
+            if not permission().has_permission(drf_request, None):
+                if drf_request.authenticators and not drf_request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied()
+    except exceptions.APIException as e:
+        return JsonResponse({'detail': str(e.detail)}, status=e.status_code)
+    return None
+
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        return json.loads(request.body or b'{}')
+    return request.POST
+
+
+def api_view_async(methods_decorator, public=False):
+    # csrf 면제 + 허용 메서드 + DRF 기본 권한 확인(public 이면 생략) + JSON 파싱 오류 처리
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapped(request, *args, **kwargs):
+            denied = None if public else await sync_to_async(_check_permissions)(request)
+            if denied is not None:
+                return denied
+            try:
+                return await view(request, *args, **kwargs)
+            except json.JSONDecodeError:
+                return JsonResponse({'detail': 'JSON parse error'}, status=400)
+        return csrf_exempt(methods_decorator(wrapped))
+    return decorator
+
+
+# Firebase 전화번호 로그인 처리 (API 토큰 발급)
+@api_view_async(require_POST, public=True)
+async def phone_login(request):
+    id_token = _request_data(request).get('id_token')
+
+    if not id_token:
+        return JsonResponse({'error': 'Missing id_token'}, status=400)
+
+    try:
+        # Firebase ID 토큰 검증 (스레드 풀에서 실행)
+        decoded_token = await run_blocking(firebase_auth.verify_id_token, id_token)
+    except Exception:
+        return JsonResponse({'error': 'Invalid Firebase token'}, status=400)
+
+    firebase_uid = decoded_token['uid']
+    phone_number = decoded_token.get('phone_number', None)
+
+    user, created = await User.objects.aget_or_create(
+        firebase_uid=firebase_uid,
+        defaults={'phone_number': phone_number}
+    )
+
+    message = 'User created' if created else 'Login successful'
+
+    return JsonResponse({
+        'message': message,
+        'user_id': user.user_id,
+        'phone_number': user.phone_number,
+        **await sync_to_async(issue_tokens)(user),
+    })
+
+
+# Firebase 토큰 검증 및 사용자 정보 저장 (API 토큰 발급)
+@api_view_async(require_POST, public=True)
+async def verify_firebase_token(request):
+    id_token = _request_data(request).get('id_token')
+
+    try:
+        decoded_token = await run_blocking(firebase_auth.verify_id_token, id_token)
+        uid = decoded_token['uid']
+        phone_number = decoded_token.get('phone_number', None)
+
+        user, created = await User.objects.aget_or_create(firebase_uid=uid)
+        if created:
+            user.phone_number = phone_number
+            await user.asave()
+
+        tokens = await sync_to_async(issue_tokens)(user)
+        return JsonResponse({"message": "User authenticated", "user_id": user.user_id, **tokens})
+
+    except FirebaseError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+
+# 사용자 조회
+@api_view_async(require_GET)
+async def get_user_profile(request, user_id):
+    try:
+        user = await User.objects.select_related('level').aget(user_id=user_id)
+    except User.DoesNotExist:
+        return JsonResponse({'detail': 'No User matches the given query.'}, status=404)
+
+    data = {
+        'name': user.name,
+        'email': user.email,
+        'phone_number': user.phone_number,
+        'points': user.points,
+        'profile_picture': user.profile_picture,
+        'level': user.level.id if user.level else None,
+        'registration_date': user.registration_date
+    }
+    # DRF 응답과 같은 날짜 형식으로 직렬화
+    return JsonResponse(data, encoder=JSONEncoder)
+
+
+# 실시간 이벤트 스트림 (Server-Sent Events)
+# ?user_id=<id> 로 새 알림, ?game_id=<id> 로 경기 참가자 수/상태 변경을 구독한다. (여러 개 지정 가능)
+EVENT_STREAM_KEEPALIVE = 15  # 초
+
+
+@api_view_async(require_GET)
+async def event_stream(request):
+    try:
+        channels = (
+            [f'user:{int(user_id)}' for user_id in request.GET.getlist('user_id')]
+            + [f'game:{int(game_id)}' for game_id in request.GET.getlist('game_id')]
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Invalid user_id or game_id'}, status=400)
+    if not channels:
+        return JsonResponse({'error': 'Specify user_id or game_id'}, status=400)
+
+    async def stream():
+        # 연결이 끊기면 Django 가 이 제너레이터를 취소하므로 finally 에서 구독 해제
+        subscription = broker.subscribe(channels)
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), EVENT_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield format_event(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # 프록시 버퍼링 방지
+    return response
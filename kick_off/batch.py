@@ -0,0 +1,106 @@
+import io
+import json
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+
+
+# 여러 API 호출을 요청 하나로 묶어서 실행 (batch/)
+# 하위 요청은 kick_off.urls 의 뷰를 같은 프로세스에서 직접 호출한다. 미들웨어는 바깥 요청에서 한 번만 거친다.
+# 인증은 바깥 요청에서 한 번 확인한 사용자를 그대로 넘긴다 (JWT 를 하위 요청마다 다시 검증하지 않음).
+BATCH_MAX_REQUESTS = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+UNBATCHABLE_ROUTES = ('batch', 'event_stream', 'export_user_activity')
+
+
+# 하위 요청 목록 검증 후 (method, path, query, body, 뷰 함수, 인자) 로 변환
+def parse_batch(entries):
+    if not isinstance(entries, list) or not entries:
+        raise ValidationError('requests 는 비어 있지 않은 목록이어야 합니다.')
+    if len(entries) > BATCH_MAX_REQUESTS:
+        raise ValidationError(f'한 번에 최대 {BATCH_MAX_REQUESTS}개의 요청만 보낼 수 있습니다.')
+
+    parsed = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get('path'), str):
+            raise ValidationError(f'{index}번 요청에 path 가 없습니다.')
+        method = str(entry.get('method', 'GET')).upper()
+        url = urlsplit(entry['path'])
+        # 'users/1/' 과 '/api/users/1/' 둘 다 허용
+        path = url.path.lstrip('/')
+        if path.startswith('api/'):
+            path = path[len('api/'):]
+        try:
+            match = resolve('/' + path, urlconf='kick_off.urls')
+        except Resolver404:
+            raise ValidationError(f'{index}번 요청의 경로를 찾을 수 없습니다: {entry["path"]}')
+        # 비동기 뷰(SSE 스트림 등), 스트리밍 응답(내보내기)과 batch 자신은 묶을 수 없다.
+        if iscoroutinefunction(match.func) or match.url_name in UNBATCHABLE_ROUTES:
+            raise ValidationError(f'{index}번 요청은 batch 로 실행할 수 없습니다: {entry["path"]}')
+        parsed.append({
+            'method': method,
+            'path': '/api/' + path,
+            'query': url.query,
+            'body': entry.get('body'),
+            'match': match,
+        })
+    return parsed
+
+
+# 하위 요청 실행
+# 모두 바깥 요청의 스레드와 DB 연결에서 순서대로 하나씩 실행하므로 하위 요청마다 연결을 새로 열지 않고,
+# 앞선 쓰기 요청의 변경이 뒤의 요청에 그대로 보인다.
+def run_batch(request, parsed):
+    return [_run_one(request, entry) for entry in parsed]
+
+
+def _run_one(request, entry):
+    sub_request = _build_request(request, entry)
+    match = entry['match']
+    response = match.func(sub_request, *match.args, **match.kwargs)
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+    return {'status': response.status_code, 'body': _response_body(response)}
+
+
+def _build_request(request, entry):
+    body = b''
+    if entry['body'] is not None:
+        body = json.dumps(entry['body']).encode()
+
+    environ = {
+        key: value for key, value in request.META.items()
+        if key.startswith('HTTP_') or key in ('REMOTE_ADDR', 'SERVER_NAME', 'SERVER_PORT', 'SERVER_PROTOCOL')
+    }
+    environ.update({
+        'REQUEST_METHOD': entry['method'],
+        'SCRIPT_NAME': '',
+        'PATH_INFO': entry['path'],
+        'QUERY_STRING': entry['query'],
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.url_scheme': request.scheme,
+    })
+    # 조건부 요청 헤더는 하위 요청마다 다르므로 바깥 요청의 것을 넘기지 않는다.
+    environ.pop('HTTP_IF_NONE_MATCH', None)
+    environ.pop('HTTP_IF_MODIFIED_SINCE', None)
+
+    sub_request = WSGIRequest(environ)
+    # DRF Request 가 이 사용자로 인증 처리 (ForcedAuthentication)
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def _response_body(response):
+    if hasattr(response, 'data'):
+        return response.data
+    if not response.content:
+        return None
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(response.content)
+    return response.content.decode(response.charset)
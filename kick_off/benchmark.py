@@ -0,0 +1,408 @@
+import datetime
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import urls
+from .accounts import issue_tokens
+from .models import (
+    Apply, Favorite, Game, Level, Mission, Notification, Payment, Points, User, UserMission, Video,
+)
+from .otp import otp_store
+from .throttling import throttle_store
+
+
+GameParticipant = Game.participants.through
+
+# 레벨이 없는 DB 에 만드는 기본 레벨 (name, color, level_number)
+DEFAULT_LEVELS = [
+    ('Novice', '#FF0000', 0),
+    ('Rookie', '#000080', 1),
+    ('Professional', '#FB36FF', 2),
+    ('Elite', '#9F09AC', 3),
+]
+LEVEL_WEIGHTS = [50, 30, 15, 5]  # 낮은 레벨일수록 사용자가 많다.
+
+
+def _max_pk(model):
+    return model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+# bulk_create 후 새로 만들어진 행의 pk (MySQL 은 bulk_create 가 pk 를 채우지 않으므로 다시 읽는다)
+def _new_pks(model, after):
+    return list(model.objects.filter(pk__gt=after).order_by('pk').values_list('pk', flat=True))
+
+
+# 벤치마크용 가상 데이터 생성 (모두 bulk_create)
+# 사용자(레벨별 분포, 포인트 내역과 잔액 일치), 지역별 경기(지난 경기/예정 경기, 참가자 수 일치),
+# 참가/대기 신청, 관심 경기, 알림(읽지 않은 수 일치), 미션/완료 미션, 결제, 영상을 만든다.
+# 이미 데이터가 있는 DB 에도 추가로 만들 수 있도록 전화번호/Firebase UID 는 기존 최대 user_id 뒤부터 붙인다.
+def generate_data(users=1000, games_per_region=200, applies_per_user=5, favorites_per_user=3,
+                  notifications_per_user=10, points_per_user=5, payments_per_user=2, missions=20,
+                  videos_per_game=1, seed=0, batch_size=5000):
+    rng = random.Random(seed)
+    today = timezone.localdate()
+
+    with transaction.atomic():
+        levels = list(Level.objects.order_by('level_number'))
+        if not levels:
+            levels = Level.objects.bulk_create([
+                Level(name=name, color=color, whistle=0, level_number=number)
+                for name, color, number in DEFAULT_LEVELS
+            ])
+            levels = list(Level.objects.order_by('level_number'))
+        weights = (LEVEL_WEIGHTS + [1] * len(levels))[:len(levels)]
+
+        # 사용자: 포인트 내역을 먼저 만들어서 잔액(points)과 읽지 않은 알림 수를 함께 넣는다.
+        user_base = _max_pk(User)
+        user_rows = []
+        for i in range(users):
+            amounts = [rng.randint(10, 500) for _ in range(points_per_user)]
+            unread = [rng.random() < 0.5 for _ in range(notifications_per_user)]
+            user_rows.append((rng.choices(levels, weights)[0], amounts, unread))
+        User.objects.bulk_create([
+            User(
+                name=f'user{user_base + i}', phone_number=f'x{user_base + i:010d}',
+                firebase_uid=f'synthetic-{user_base + i}', level=level, points=sum(amounts),
+                unread_notification_count=sum(unread),
+            )
+            for i, (level, amounts, unread) in enumerate(user_rows)
+        ], batch_size=batch_size)
+        user_ids = _new_pks(User, user_base)
+        users_by_level = {level.level_number: [] for level in levels}
+        for user_id, (level, _, _) in zip(user_ids, user_rows):
+            users_by_level[level.level_number].append(user_id)
+        # 경기 최소 레벨 이상인 사용자
+        eligible = {
+            level.level_number: [
+                user_id for number, level_users in users_by_level.items() if number >= level.level_number
+                for user_id in level_users
+            ]
+            for level in levels
+        }
+
+        points, notifications = [], []
+        for user_id, (_, amounts, unread) in zip(user_ids, user_rows):
+            total = 0
+            for amount in amounts:
+                total += amount
+                points.append(Points(user_id=user_id, points_log='earned', points_amount=amount, total_points=total))
+            notifications.extend(
+                Notification(
+                    user_id=user_id, content='경기 알림', notification_type='game_notification', is_read=not is_unread,
+                )
+                for is_unread in unread
+            )
+        Points.objects.bulk_create(points, batch_size=batch_size)
+        Notification.objects.bulk_create(notifications, batch_size=batch_size)
+
+        # 경기: 지난 30일 ~ 앞으로 60일, 참가자는 최소 레벨을 만족하는 사용자 중에서 고른다.
+        game_base = _max_pk(Game)
+        game_rows = []
+        for region, _ in Game.REGION_CHOICES:
+            for _ in range(games_per_region):
+                level = rng.choices(levels, weights)[0]
+                max_participants = rng.randint(10, 22)
+                candidates = eligible[level.level_number]
+                seats = rng.randint(0, min(max_participants, len(candidates)))
+                game_date = today + datetime.timedelta(days=rng.randint(-30, 60))
+                if game_date < today or seats >= max_participants:
+                    game_status = 'finished'
+                else:
+                    game_status = 'upcoming'
+                game = Game(
+                    game_name=f'{region} match', game_date=game_date, game_time=datetime.time(rng.randint(6, 22)),
+                    location=f'{region} stadium', max_participants=max_participants, participant_count=seats,
+                    region=region, gender=rng.choice(Game.GENDER_CHOICES)[0], level=level, status=game_status,
+                )
+                game_rows.append((game, rng.sample(candidates, seats)))
+        Game.objects.bulk_create([game for game, _ in game_rows], batch_size=batch_size)
+        game_ids = _new_pks(Game, game_base)
+        upcoming_ids = [
+            game_id for game_id, (game, _) in zip(game_ids, game_rows) if game.status == 'upcoming'
+        ] or game_ids
+
+        participants, applies, joined = [], [], set()
+        for game_id, (_, seated) in zip(game_ids, game_rows):
+            for user_id in seated:
+                participants.append(GameParticipant(game_id=game_id, user_id=user_id))
+                applies.append(Apply(user_id=user_id, game_id=game_id, apply_status='Accepted'))
+                joined.add((user_id, game_id))
+        favorites, payments = [], []
+        for user_id in user_ids:
+            for game_id in rng.sample(upcoming_ids, min(applies_per_user, len(upcoming_ids))):
+                if (user_id, game_id) not in joined:
+                    applies.append(Apply(user_id=user_id, game_id=game_id, apply_status='Pending'))
+            favorites.extend(
+                Favorite(user_id=user_id, game_id=game_id)
+                for game_id in rng.sample(game_ids, min(favorites_per_user, len(game_ids)))
+            )
+            payments.extend(
+                Payment(
+                    user_id=user_id, amount=Decimal(rng.choice([5000, 10000, 15000])),
+                    payment_status=rng.choice(Payment.PAYMENT_STATUS_CHOICES)[0], payment_method='Bank Transfer',
+                )
+                for _ in range(payments_per_user)
+            )
+        GameParticipant.objects.bulk_create(participants, batch_size=batch_size)
+        Apply.objects.bulk_create(applies, batch_size=batch_size)
+        Favorite.objects.bulk_create(favorites, batch_size=batch_size)
+        Payment.objects.bulk_create(payments, batch_size=batch_size)
+        Video.objects.bulk_create([
+            Video(game_id=game_id, video_url=f'https://videos.example.com/{game_id}/{i}.mp4')
+            for game_id in game_ids for i in range(videos_per_game)
+        ], batch_size=batch_size)
+
+        mission_base = _max_pk(Mission)
+        Mission.objects.bulk_create([
+            Mission(
+                mission_name=f'mission {mission_base + i}', mission_content='미션 내용', points=rng.randint(10, 100),
+                mission_type=rng.choice(Mission.MISSION_TYPE_CHOICES)[0], is_approved=rng.random() < 0.8,
+            )
+            for i in range(missions)
+        ], batch_size=batch_size)
+        mission_ids = _new_pks(Mission, mission_base)
+        UserMission.objects.bulk_create([
+            UserMission(user_id=user_id, mission_id=mission_id, completed=True)
+            for user_id in user_ids for mission_id in rng.sample(mission_ids, min(rng.randint(0, 3), len(mission_ids)))
+        ], batch_size=batch_size)
+
+    return {
+        'levels': len(levels),
+        'users': len(user_ids),
+        'games': len(game_ids),
+        'participants': len(participants),
+        'applies': len(applies),
+        'favorites': len(favorites),
+        'notifications': len(notifications),
+        'points': len(points),
+        'payments': len(payments),
+        'missions': len(mission_ids),
+        'videos': len(game_ids) * videos_per_game,
+    }
+
+
+# 엔드포인트별 요청 만들기: (method, path, 본문 또는 쿼리 파라미터)
+# kick_off/urls.py 에 경로를 추가하면 여기(ROUTES)나 SKIPPED_ROUTES 에도 추가해야 한다. (run_endpoints 가 확인)
+class _Targets:
+    def __init__(self, rng):
+        self.rng = rng
+        self.user_ids = list(User.objects.values_list('user_id', flat=True))
+        self.game_ids = list(Game.objects.values_list('game_id', flat=True))
+        self.firebase_uids = list(
+            User.objects.filter(firebase_uid__isnull=False).values_list('firebase_uid', flat=True),
+        )
+        self.mission_ids = list(Mission.objects.values_list('mission_id', flat=True))
+        self.notification_ids = list(Notification.objects.values_list('notification_id', flat=True))
+        self.level_ids = list(Level.objects.values_list('id', flat=True))
+        # 취소/삭제 요청은 실제로 있는 신청/관심 경기를 대상으로 한다. (다 쓰면 임의의 조합)
+        self.applies = list(Apply.objects.values_list('user_id', 'game_id'))
+        self.favorites = list(Favorite.objects.values_list('user_id', 'game_id'))
+        rng.shuffle(self.applies)
+        rng.shuffle(self.favorites)
+        self.doomed_user_ids = []  # delete_user 로 삭제할 사용자 (run_endpoints 가 따로 만든다)
+        self.refresh_token = ''  # 로그인한 선수의 갱신 토큰 (run_endpoints 가 정한다)
+
+    def user(self):
+        return self.rng.choice(self.user_ids)
+
+    def game(self):
+        return self.rng.choice(self.game_ids)
+
+    # 대역 토큰 검증 함수가 uid 로 쓰는 값 (기존 사용자의 firebase_uid)
+    def id_token(self):
+        return self.rng.choice(self.firebase_uids)
+
+    def phone_number(self):
+        return f'010{self.rng.randrange(10 ** 8):08d}'
+
+    # 미리 발급한 인증 코드로 검증 요청 (번호마다 한 번)
+    def verification(self):
+        phone_number = self.phone_number()
+        return {'phone_number': phone_number, 'verification_code': otp_store.issue(phone_number)}
+
+    def existing(self, pairs):
+        user_id, game_id = pairs.pop() if pairs else (self.user(), self.game())
+        return {'user_id': user_id, 'game_id': game_id}
+
+
+def _path(name, **kwargs):
+    return reverse(name, kwargs=kwargs)
+
+
+ROUTES = {
+    'phone_login': lambda t: ('post', _path('phone_login'), {'id_token': t.id_token()}),
+    'verify_firebase_token': lambda t: ('post', _path('verify_firebase_token'), {'id_token': t.id_token()}),
+    'token_refresh': lambda t: ('post', _path('token_refresh'), {'refresh': t.refresh_token}),
+    'send_code': lambda t: ('post', _path('send_code'), {'phone_number': t.phone_number()}),
+    'verify_code': lambda t: ('post', _path('verify_code'), t.verification()),
+    'async_phone_login': lambda t: ('post', _path('async_phone_login'), {'id_token': t.id_token()}),
+    'async_verify_firebase_token': lambda t: ('post', _path('async_verify_firebase_token'), {'id_token': t.id_token()}),
+    'async_get_user_profile': lambda t: ('get', _path('async_get_user_profile', user_id=t.user()), None),
+    'batch': lambda t: ('post', _path('batch'), {'requests': [
+        {'path': f'users/{t.user()}/'},
+        {'path': f'points/{t.user()}/'},
+        {'path': 'missions/'},
+        {'path': f'notifications/{t.user()}/unread-count/'},
+    ]}),
+    'get_user_profile': lambda t: ('get', _path('get_user_profile', user_id=t.user()), None),
+    'get_user_dashboard': lambda t: ('get', _path('get_user_dashboard', user_id=t.user()), None),
+    'get_game_recommendations': lambda t: ('get', _path('get_game_recommendations', user_id=t.user()), None),
+    'export_user_activity': lambda t: ('get', _path('export_user_activity', user_id=t.user()), None),
+    'update_user_profile': lambda t: (
+        'post', _path('update_user_profile', user_id=t.user()),
+        {'profile_picture': 'https://images.example.com/profile.png'},
+    ),
+    'delete_user': lambda t: (
+        'delete', _path('delete_user', user_id=t.doomed_user_ids.pop() if t.doomed_user_ids else t.user()), None,
+    ),
+    'list_games': lambda t: ('get', _path('list_games'), {'region': t.rng.choice(Game.REGION_CHOICES)[0]}),
+    'get_game_info': lambda t: ('get', _path('get_game_info', game_id=t.game()), None),
+    'join_game': lambda t: ('post', _path('join_game', game_id=t.game()), None),
+    'get_user_points': lambda t: ('get', _path('get_user_points', user_id=t.user()), None),
+    'add_points': lambda t: ('post', _path('add_points', user_id=t.user()), {'points': t.rng.randint(1, 100)}),
+    'get_leaderboard': lambda t: ('get', _path('get_leaderboard'), {'level_id': t.rng.choice(t.level_ids)}),
+    'get_user_rank': lambda t: ('get', _path('get_user_rank', user_id=t.user()), None),
+    'get_missions': lambda t: ('get', _path('get_missions'), None),
+    'get_mission_detail': lambda t: ('get', _path('get_mission_detail', mission_id=t.rng.choice(t.mission_ids)), None),
+    'get_user_mission_status': lambda t: ('get', _path('get_user_mission_status', user_id=t.user()), None),
+    'get_favorite_games': lambda t: ('get', _path('get_favorite_games', user_id=t.user()), None),
+    'add_favorite_game': lambda t: ('post', _path('add_favorite_game', user_id=t.user(), game_id=t.game()), None),
+    'remove_favorite_game': lambda t: ('post', _path('remove_favorite_game', **t.existing(t.favorites)), None),
+    'get_user_videos': lambda t: ('get', _path('get_user_videos', user_id=t.user()), None),
+    'get_game_videos': lambda t: ('get', _path('get_game_videos', game_id=t.game()), None),
+    'get_user_payments': lambda t: ('get', _path('get_user_payments', user_id=t.user()), None),
+    'make_payment': lambda t: ('post', _path('make_payment', user_id=t.user()), {'amount': '10000'}),
+    'get_user_applies': lambda t: ('get', _path('get_user_applies', user_id=t.user()), None),
+    'apply_for_game': lambda t: ('post', _path('apply_for_game', user_id=t.user(), game_id=t.game()), None),
+    'cancel_application': lambda t: ('post', _path('cancel_application', **t.existing(t.applies)), None),
+    'get_user_notifications': lambda t: ('get', _path('get_user_notifications', user_id=t.user()), None),
+    'mark_notification_read': lambda t: (
+        'post', _path('mark_notification_read', notification_id=t.rng.choice(t.notification_ids)), None,
+    ),
+    'fanout_notifications': lambda t: ('post', _path('fanout_notifications'), {'content': '공지', 'game_id': t.game()}),
+    'get_notification_inbox': lambda t: ('get', _path('get_notification_inbox', user_id=t.user()), {'limit': 20}),
+    'get_unread_notification_count': lambda t: (
+        'get', _path('get_unread_notification_count', user_id=t.user()), None,
+    ),
+    'mark_notifications_read_bulk': lambda t: ('post', _path('mark_notifications_read_bulk', user_id=t.user()), {}),
+}
+
+SKIPPED_ROUTES = {
+    'event_stream': 'SSE 스트림은 응답이 끝나지 않으므로 bench_event_stream 으로 측정한다.',
+}
+
+
+def _percentile(latencies, percent):
+    # 최근접 순위 방식 (표본이 적어도 계산 가능)
+    index = max(0, min(len(latencies) - 1, round(percent / 100 * len(latencies)) - 1))
+    return latencies[index]
+
+
+def _send(headers, spec):
+    method, path, data = spec
+    client = Client(raise_request_exception=False)
+    queries = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        started = time.perf_counter()
+        if method == 'get':
+            response = client.get(path, data, headers=headers)
+        else:
+            response = getattr(client, method)(path, data, content_type='application/json', headers=headers)
+        if response.streaming:
+            # 스트리밍 응답은 본문을 끝까지 받는 시간과 그동안의 쿼리까지 측정
+            b''.join(response.streaming_content)
+        elapsed = time.perf_counter() - started
+    return elapsed, response.status_code, queries
+
+
+# 요청들을 concurrency 개의 스레드에 나눠서 보낸다. 스레드마다 자기 DB 연결을 쓰고 끝나면 닫는다.
+def _drive(headers, specs, concurrency):
+    if concurrency <= 1:
+        return [_send(headers, spec) for spec in specs]
+
+    def run_slice(offset):
+        try:
+            return [_send(headers, spec) for spec in specs[offset::concurrency]]
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='kick_off-bench') as pool:
+        return [sample for samples in pool.map(run_slice, range(concurrency)) for sample in samples]
+
+
+# kick_off/urls.py 의 모든 경로에 동시 요청을 보내고 엔드포인트별 지연 시간/처리량/쿼리 수를 반환
+# 요청 목록은 시작 전에 seed 로 미리 만들어 두므로 같은 데이터에서는 실행마다 같은 요청을 보낸다.
+# Firebase 토큰 검증은 호출하는 쪽에서 id_token 을 그대로 uid 로 쓰는 대역으로 바꿔야 한다.
+def run_endpoints(requests=200, concurrency=8, warmup=5, endpoints=None, seed=0):
+    route_names = {pattern.name for pattern in urls.urlpatterns}
+    unknown = route_names - set(ROUTES) - set(SKIPPED_ROUTES)
+    if unknown:
+        raise ValueError(f'벤치마크 요청이 정의되지 않은 경로: {", ".join(sorted(unknown))}')
+    names = [name for name in ROUTES if endpoints is None or name in endpoints]
+
+    rng = random.Random(seed)
+    targets = _Targets(rng)
+    # join_game 처럼 로그인한 선수 기준으로 동작하는 API 를 위해 기존 선수로 로그인 (선수가 없으면 벤치마크 계정)
+    player = User.objects.filter(firebase_uid__isnull=False).order_by('user_id').first()
+    if player is not None:
+        tokens = issue_tokens(player)
+        access, targets.refresh_token = tokens['access'], tokens['refresh']
+    else:
+        access = AccessToken.for_user(get_user_model().objects.get_or_create(username='kick_off-bench')[0])
+    headers = {'Authorization': f'Bearer {access}'}
+    if 'delete_user' in names:
+        level = Level.objects.order_by('level_number').first()
+        base = _max_pk(User)
+        User.objects.bulk_create([
+            User(name=f'doomed{base + i}', phone_number=f'd{base + i:010d}', level=level)
+            for i in range(requests + warmup)
+        ])
+        targets.doomed_user_ids = _new_pks(User, base)
+
+    results = []
+    for name in names:
+        specs = [ROUTES[name](targets) for _ in range(requests + warmup)]
+        # 요청 제한(throttling.py) 없이 뷰 자체의 비용을 측정
+        enabled, throttle_store.enabled = throttle_store.enabled, False
+        try:
+            _drive(headers, specs[:warmup], 1)
+            started = time.perf_counter()
+            samples = _drive(headers, specs[warmup:], concurrency)
+            elapsed = time.perf_counter() - started
+        finally:
+            throttle_store.enabled = enabled
+
+        latencies = sorted(latency for latency, _, _ in samples)
+        query_counts = [queries for _, _, queries in samples]
+        statuses = Counter(str(status_code) for _, status_code, _ in samples)
+        results.append({
+            'endpoint': name,
+            'method': specs[0][0].upper(),
+            'requests': len(samples),
+            'statuses': dict(sorted(statuses.items())),
+            'errors': sum(count for status_code, count in statuses.items() if status_code >= '500'),
+            'requests_per_second': round(len(samples) / elapsed, 1),
+            'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+            'p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+            'queries_mean': round(statistics.mean(query_counts), 1),
+            'queries_max': max(query_counts),
+        })
+    return results
@@ -0,0 +1,83 @@
+import secrets
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Mission
+
+
+# 미션 카탈로그 캐시
+# 카탈로그 버전(무작위 토큰, 변경 시각)은 공유 캐시(CACHES)에 두므로 모든 워커 프로세스가 같은 ETag/Last-Modified 를 쓴다.
+# 직렬화한 미션 목록은 프로세스마다 버전별로 한 번만 만든다.
+# Mission 저장/삭제 시그널(signals.py)이 커밋 후 invalidate_mission_catalog()로 새 버전을 만든다.
+CATALOG_VERSION_KEY = 'kick_off:mission_catalog:version'
+_snapshot = None  # (버전, 데이터)
+
+
+def _new_version():
+    return secrets.token_hex(8), timezone.now()
+
+
+def _current_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # 처음이거나 캐시에서 밀려난 경우: 먼저 만든 워커의 버전을 모두 사용 (add 는 원자적)
+        version = _new_version()
+        if not cache.add(CATALOG_VERSION_KEY, version, timeout=None):
+            version = cache.get(CATALOG_VERSION_KEY) or version
+    return version
+
+
+def serialize_mission(mission):
+    return {
+        'mission_id': mission.mission_id,
+        'mission_name': mission.mission_name,
+        'mission_content': mission.mission_content,
+        'points': mission.points,
+        'video_url': mission.video_url,
+        'mission_type': mission.mission_type,
+    }
+
+
+def _load_snapshot():
+    global _snapshot
+    # 버전을 먼저 읽는다. 조회 도중 바뀌었다면 다음 호출에서 새 버전으로 다시 읽는다.
+    version = _current_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot[0] == version:
+        return snapshot[1]
+
+    missions = list(Mission.objects.order_by('mission_id'))
+    serialized = [serialize_mission(m) for m in missions]
+    data = {
+        'all': serialized,
+        'approved': [data for m, data in zip(missions, serialized) if m.is_approved],
+        'by_id': {data['mission_id']: data for data in serialized},
+    }
+    _snapshot = (version, data)
+    return data
+
+
+# 아래 함수들이 반환하는 데이터는 여러 요청이 공유하므로 호출하는 쪽에서 수정하면 안 된다.
+def get_missions():
+    return _load_snapshot()['all']
+
+
+def get_approved_missions():
+    return _load_snapshot()['approved']
+
+
+def get_mission(mission_id):
+    return _load_snapshot()['by_id'].get(mission_id)
+
+
+def catalog_version():
+    return _current_version()[0]
+
+
+def catalog_last_modified():
+    return _current_version()[1]
+
+
+def invalidate_mission_catalog():
+    cache.set(CATALOG_VERSION_KEY, _new_version(), timeout=None)
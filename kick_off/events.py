@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Game
+
+
+# 프로세스 내 이벤트 발행/구독 (SSE 스트림용)
+# 외부 브로커 없이 단일 노드에서 동작한다. 다른 프로세스(관리 명령 등)에서 생긴 변경은 전달되지 않는다.
+# 채널: 'user:<user_id>' (새 알림), 'game:<game_id>' (참가자 수/상태 변경)
+EVENT_QUEUE_SIZE = 100
+
+
+class Subscription:
+    # 유휴 연결마다 하나씩 생기므로 가볍게 유지
+    __slots__ = ('loop', 'queue', 'channels')
+
+    def __init__(self, loop, channels, queue_size):
+        self.loop = loop
+        self.queue = asyncio.Queue(queue_size)
+        self.channels = channels
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass  # 읽지 못하는 느린 구독자의 이벤트는 버린다.
+
+
+class EventBroker:
+    def __init__(self, queue_size=EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def has_subscribers(self, channel):
+        return channel in self._subscribers
+
+    def subscriber_count(self):
+        with self._lock:
+            return len({s for subscribers in self._subscribers.values() for s in subscribers})
+
+    # 이벤트 루프 안에서 호출
+    def subscribe(self, channels):
+        subscription = Subscription(asyncio.get_running_loop(), tuple(channels), self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    # 어느 스레드에서든 호출 가능 (동기 뷰, 시그널 등)
+    def publish(self, channel, event):
+        if channel not in self._subscribers:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 구독
+                self.unsubscribe(subscription)
+
+
+broker = EventBroker()
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, cls=JSONEncoder)}\n\n"
+
+
+def publish_notification(user_id, content, notification_type, creation_date, notification_id=None):
+    broker.publish(f'user:{user_id}', {
+        'type': 'notification',
+        'notification_id': notification_id,
+        'content': content,
+        'notification_type': notification_type,
+        'creation_date': creation_date,
+    })
+
+
+# 구독자가 있는 경기만 조회해서 현재 참가자 수/상태를 발행
+def publish_game_state(game_ids):
+    game_ids = [game_id for game_id in game_ids if broker.has_subscribers(f'game:{game_id}')]
+    if not game_ids:
+        return
+    games = Game.objects.filter(game_id__in=game_ids).values_list(
+        'game_id', 'participant_count', 'max_participants', 'status',
+    )
+    for game_id, participant_count, max_participants, status in games:
+        broker.publish(f'game:{game_id}', {
+            'type': 'game',
+            'game_id': game_id,
+            'participant_count': participant_count,
+            'max_participants': max_participants,
+            'status': status,
+        })
+
+
+# 트랜잭션이 커밋된 뒤에 발행 (롤백된 변경은 알리지 않음)
+def publish_game_state_on_commit(game_ids):
+    game_ids = list(game_ids)
+    if any(broker.has_subscribers(f'game:{game_id}') for game_id in game_ids):
+        transaction.on_commit(lambda: publish_game_state(game_ids))
@@ -0,0 +1,148 @@
+import csv
+import io
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+
+from .models import Apply, Notification, Payment, Points, User, UserMission
+
+
+# 사용자 활동 내역 내보내기 (포인트, 결제, 신청, 미션, 알림)
+# 내역 종류마다 pk 키셋 배치(EXPORT_CHUNK_SIZE 행)로 읽어서 바로 출력하므로 내역이 많아도 메모리 사용량이 일정하다.
+# (MySQL 드라이버는 QuerySet.iterator() 도 결과 전체를 클라이언트 메모리로 받으므로 키셋 배치를 사용한다.)
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+# (종류, 모델, 내보낼 필드)
+EXPORT_SECTIONS = [
+    ('points', Points, ('points_log', 'points_amount', 'total_points', 'event_date')),
+    ('payments', Payment, ('amount', 'payment_status', 'payment_method', 'payment_date')),
+    ('applies', Apply, ('game_id', 'game__game_name', 'apply_status', 'priority', 'apply_date')),
+    ('missions', UserMission, ('mission_id', 'mission__mission_name', 'completed', 'completion_date')),
+    ('notifications', Notification, ('content', 'notification_type', 'is_read', 'creation_date')),
+]
+
+# CSV 는 모든 종류의 필드를 합친 열을 사용하고 해당하지 않는 열은 비워 둔다.
+CSV_COLUMNS = ['type', 'user_id', 'id'] + list(dict.fromkeys(
+    field for _, _, fields in EXPORT_SECTIONS for field in fields
+))
+
+
+# 내역 행을 배치 단위로 생성: [{'type', 'user_id', 'id', 필드...}, ...]
+# user_range: (시작 user_id, 끝 user_id) 반열린 구간
+def iter_activity(user_id=None, user_range=None, chunk_size=None):
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    for section, model, fields in EXPORT_SECTIONS:
+        pk_name = model._meta.pk.name
+        queryset = model.objects.all()
+        if user_id is not None:
+            queryset = queryset.filter(user_id=user_id)
+        if user_range is not None:
+            queryset = queryset.filter(user_id__gte=user_range[0], user_id__lt=user_range[1])
+        values = ('user_id', pk_name) + fields
+
+        last_pk = 0
+        while True:
+            rows = list(queryset.filter(pk__gt=last_pk).order_by(pk_name).values_list(*values)[:chunk_size])
+            if not rows:
+                break
+            last_pk = rows[-1][1]
+            yield [{'type': section, 'user_id': row[0], 'id': row[1], **dict(zip(fields, row[2:]))} for row in rows]
+            if len(rows) < chunk_size:
+                break
+
+
+def ndjson_chunks(batches):
+    for batch in batches:
+        yield ''.join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in batch).encode()
+
+
+def csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+# 청크 단위로 gzip 압축 (전체를 모으지 않음)
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_chunks(batches, export_format='ndjson', compress=False):
+    chunks = csv_chunks(batches) if export_format == 'csv' else ndjson_chunks(batches)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_filename(name, export_format='ndjson', compress=False):
+    return f'{name}.{export_format}' + ('.gz' if compress else '')
+
+
+# 전체 사용자 내보내기
+# user_id 범위를 shards 개로 나누고 범위마다 파일 하나를 workers 개의 프로세스에서 나눠서 만든다.
+# 반환값: [(파일 경로, 행 수)]
+def export_all(directory, shards=4, workers=4, export_format='ndjson', compress=False, chunk_size=None):
+    bounds = User.objects.order_by('user_id').values_list('user_id', flat=True)
+    first, last = bounds.first(), bounds.last()
+    if first is None:
+        return []
+    os.makedirs(directory, exist_ok=True)
+    width = -(-(last - first + 1) // shards)
+    jobs = [
+        (
+            os.path.join(directory, export_filename(f'activity-{shard:04d}', export_format, compress)),
+            (first + shard * width, first + (shard + 1) * width), export_format, compress, chunk_size,
+        )
+        for shard in range(shards)
+    ]
+
+    if workers <= 1:
+        return [_export_shard(*job) for job in jobs]
+    # 자식 프로세스가 부모의 DB 연결을 함께 쓰지 않도록 먼저 닫는다.
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_export_shard_in_worker, *zip(*jobs)))
+
+
+def _init_worker():
+    # spawn 방식으로 시작한 프로세스는 Django 설정을 다시 읽어야 한다. (fork 면 이미 준비되어 있음)
+    django.setup()
+
+
+def _export_shard_in_worker(*job):
+    try:
+        return _export_shard(*job)
+    finally:
+        connections.close_all()
+
+
+def _export_shard(path, user_range, export_format, compress, chunk_size):
+    count = 0
+
+    def counted(batches):
+        nonlocal count
+        for batch in batches:
+            count += len(batch)
+            yield batch
+
+    batches = counted(iter_activity(user_range=user_range, chunk_size=chunk_size))
+    with open(path, 'wb') as f:
+        for chunk in export_chunks(batches, export_format, compress):
+            f.write(chunk)
+    return path, count
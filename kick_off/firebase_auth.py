@@ -0,0 +1,57 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from firebase_admin import auth
+from firebase_admin.auth import InvalidIdTokenError
+
+
+DEFAULT_CACHE_SIZE = 10000  # 검증된 토큰 캐시 최대 개수
+
+
+# Firebase ID 토큰 검증기
+# 검증은 firebase_admin.auth.verify_id_token 에 맡기고 (서명 인증서는 firebase_admin 이 Cache-Control 동안 보관),
+# 검증된 토큰의 클레임은 토큰 해시를 키로 토큰 만료(exp)까지 LRU 캐시에 보관한다.
+# app 을 지정하지 않으면 settings.py 에서 초기화한 기본 Firebase 앱을 사용한다.
+class FirebaseTokenVerifier:
+    def __init__(self, app=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.app = app
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._claims = OrderedDict()
+
+    def verify(self, id_token):
+        if not isinstance(id_token, str) or not id_token:
+            raise InvalidIdTokenError('ID token must be a non-empty string.')
+
+        key = hashlib.sha256(id_token.encode()).digest()
+        with self._lock:
+            cached = self._claims.get(key)
+            if cached is not None:
+                expires_at, claims = cached
+                if expires_at > time.time():
+                    self._claims.move_to_end(key)
+                    return dict(claims)
+                del self._claims[key]
+
+        claims = auth.verify_id_token(id_token, app=self.app)
+
+        with self._lock:
+            self._claims[key] = (claims['exp'], claims)
+            self._claims.move_to_end(key)
+            while len(self._claims) > self.cache_size:
+                self._claims.popitem(last=False)
+        return dict(claims)
+
+    def clear(self):
+        with self._lock:
+            self._claims.clear()
+
+
+verifier = FirebaseTokenVerifier()
+
+
+# firebase_admin.auth.verify_id_token 과 같은 형태의 클레임을 반환
+def verify_id_token(id_token):
+    return verifier.verify(id_token)
@@ -0,0 +1,124 @@
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .events import publish_game_state_on_commit
+from .models import Game, User
+from .recommendations import recommendation_index
+
+
+GameParticipant = Game.participants.through
+
+# 경기 진행 시간 (경기 종료 시각 = game_date + game_time + GAME_DURATION)
+GAME_DURATION = datetime.timedelta(minutes=getattr(settings, 'GAME_DURATION_MINUTES', 120))
+
+
+# 경기 참가자 수/상태가 바뀌거나 경기가 생성·수정된 경우 (트랜잭션 커밋 후)
+# 스트림 구독자에게 알리고 추천 인덱스를 갱신한다.
+def game_state_changed(game_ids):
+    game_ids = list(game_ids)
+    publish_game_state_on_commit(game_ids)
+    if recommendation_index.loaded:
+        transaction.on_commit(lambda: recommendation_index.refresh_games(game_ids))
+
+
+# 경기 참가자 검증 (정원, 최소 레벨)
+# participants: 검사할 사용자 QuerySet. 생략하면 경기의 현재 참가자 전체를 검사한다.
+# 직접 넘긴 QuerySet 이 비어 있으면 잘못된 사용자를 찾은 것이므로 통과시키지 않는다.
+# 참가자 수와 최저 레벨을 집계 쿼리 한 번으로 구하므로 참가자가 많아도 쿼리 수가 늘지 않는다.
+def validate_participants(game, participants=None):
+    required = participants is not None
+    if participants is None:
+        participants = game.participants.all() if game.pk else User.objects.none()
+
+    roster = participants.aggregate(count=Count('pk'), min_level=Min('level__level_number'))
+    if required and not roster['count']:
+        raise ValidationError('검사할 참가자가 없습니다.')
+    if roster['count'] > game.max_participants:
+        raise ValidationError(f'참가자는 최대 {game.max_participants}명까지 가능합니다.')
+
+    required_level = game.level.level_number
+    if roster['min_level'] is not None and roster['min_level'] < required_level:
+        # 오류 메시지용으로 조건을 만족하지 못한 참가자 한 명만 조회
+        participant = participants.filter(level__level_number__lt=required_level).order_by('pk').first()
+        raise ValidationError(f'{participant.name}님의 레벨이 경기에 필요한 최소 레벨보다 낮습니다.')
+
+
+# 경기 자리 예약
+# 정원이 남아 있을 때만 participant_count 를 1 올리는 조건부 UPDATE 한 번으로 자리를 확보하므로
+# 동시에 많은 요청이 들어와도 max_participants 를 넘지 않는다.
+# user: 참가할 선수(kick_off.User). 로그인 계정(request.user)이 아니다.
+def reserve_seat(game, user):
+    try:
+        with transaction.atomic():
+            updated = Game.objects.filter(
+                game_id=game.game_id,
+                status='upcoming',
+                participant_count__lt=F('max_participants'),
+            ).update(
+                # MySQL은 SET 절을 왼쪽부터 적용하므로 status 를 participant_count 보다 먼저 둔다.
+                # (증가 전 값 기준으로 마지막 자리인지 판단)
+                status=Case(
+                    When(participant_count__gte=F('max_participants') - 1, then=Value('finished')),
+                    default=F('status'),
+                ),
+                participant_count=F('participant_count') + 1,
+            )
+            if not updated:
+                raise ValidationError(f'참가자는 최대 {game.max_participants}명까지 가능합니다.')
+
+            # 같은 트랜잭션에서 참가자 추가. 이미 참가한 경우 유니크 제약으로 전체가 롤백된다.
+            GameParticipant.objects.create(game_id=game.game_id, user_id=user.user_id)
+            game_state_changed([game.game_id])
+    except IntegrityError:
+        raise ValidationError('이미 참가한 경기입니다.')
+
+
+# participants 를 직접 수정한 경우(관리자 화면 등) 참가자 수를 다시 계산
+def sync_participant_count(game_ids):
+    participant_count = GameParticipant.objects.filter(
+        game_id=OuterRef('game_id'),
+    ).order_by().values('game_id').annotate(count=Count('*')).values('count')
+
+    games = Game.objects.filter(game_id__in=game_ids)
+    games.update(participant_count=Coalesce(Subquery(participant_count, output_field=IntegerField()), 0))
+    games.filter(status='upcoming', participant_count__gte=F('max_participants')).update(status='finished')
+    game_state_changed(game_ids)
+
+
+def _starts_at_or_before(moment):
+    return Q(game_date__lt=moment.date()) | Q(game_date=moment.date(), game_time__lte=moment.time())
+
+
+def _starts_after(moment):
+    return Q(game_date__gt=moment.date()) | Q(game_date=moment.date(), game_time__gt=moment.time())
+
+
+# 종료 시각이 지난(치러진) 경기. 상태 변경 작업이 아직 돌지 않았어도 시각으로 판단한다.
+def played_games(now=None):
+    ended_by = timezone.localtime(now) - GAME_DURATION
+    return Game.objects.filter(_starts_at_or_before(ended_by)).exclude(status='cancelled')
+
+
+# 시작/종료 시각이 지난 경기 상태를 일괄 변경
+# - 종료 시각이 지난 신청 가능/진행중 경기 → finished
+# - 시작했지만 아직 끝나지 않은 신청 가능/마감(정원 참) 경기 → in-progress
+# 모델 인스턴스를 불러오지 않고 (status, game_date, game_time) 인덱스 범위에 대한 UPDATE 두 번으로 처리한다.
+# 조건에 현재 상태가 포함되어 있어 여러 노드에서 동시에 실행해도 각 경기는 한 번만 바뀐다.
+def advance_game_statuses(now=None):
+    now = timezone.localtime(now)
+    ended_by = now - GAME_DURATION
+
+    finished = Game.objects.filter(
+        _starts_at_or_before(ended_by), status__in=('upcoming', 'in-progress'),
+    ).update(status='finished')
+    started = Game.objects.filter(
+        _starts_at_or_before(now), _starts_after(ended_by), status__in=('upcoming', 'finished'),
+    ).update(status='in-progress')
+
+    return {'started': started, 'finished': finished}
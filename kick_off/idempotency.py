@@ -0,0 +1,67 @@
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+IDEMPOTENCY_TTL_SECONDS = getattr(settings, 'IDEMPOTENCY_TTL_SECONDS', 24 * 3600)
+# 처리 중 표시 유지 시간: 요청 제한 시간보다 길어야 한다. (워커가 죽어서 complete() 를 못 부르면 이 시간 뒤에 풀린다)
+IDEMPOTENCY_CLAIM_SECONDS = getattr(settings, 'IDEMPOTENCY_CLAIM_SECONDS', 600)
+IDEMPOTENCY_POLL_SECONDS = 0.05
+
+
+# Idempotency-Key 별 첫 응답 저장소 (Django 캐시, 여러 워커 프로세스가 함께 사용)
+# 항목은 (요청 본문 지문, 처리 중 표시, 저장된 응답 (status, headers, content)) 이고 키마다 하나씩 캐시에 둔다.
+# 처음 들어온 요청만 cache.add 로 처리 중 표시를 남기고 실행하며, 다른 워커로 들어온 같은 키 요청은 응답이 저장될 때까지 기다린다.
+# 용량 때문에 항목을 밀어내지 않으므로 처리 중인 키가 먼저 지워지지 않고, 응답은 ttl 초, 처리 중 표시는 claim_ttl 초 뒤 캐시에서 사라진다.
+class IdempotencyStore:
+    EXECUTE = 'execute'  # 처음 들어온 요청: 뷰를 실행한 뒤 complete() 호출
+    REPLAY = 'replay'  # 저장된 응답을 그대로 반환
+    MISMATCH = 'mismatch'  # 같은 키로 다른 요청 본문을 보낸 경우
+    IN_PROGRESS = 'in_progress'  # 기다려도 먼저 들어온 요청이 끝나지 않은 경우
+
+    def __init__(self, ttl=IDEMPOTENCY_TTL_SECONDS, claim_ttl=IDEMPOTENCY_CLAIM_SECONDS,
+                 key_prefix='kick_off:idempotency'):
+        self.ttl = ttl
+        self.claim_ttl = claim_ttl
+        self.key_prefix = key_prefix
+
+    # 반환값: (결과, EXECUTE 면 complete() 에 넘길 처리 중 항목 / REPLAY 면 저장된 응답)
+    def begin(self, key, fingerprint, wait=0):
+        cache_key = self._cache_key(key)
+        deadline = time.monotonic() + wait
+        while True:
+            claim = (fingerprint, secrets.token_hex(8), None)
+            if cache.add(cache_key, claim, timeout=self.claim_ttl):
+                return self.EXECUTE, claim
+            entry = cache.get(cache_key)
+            if entry is None:
+                # 확인하는 사이에 만료되거나 풀린 키: 다시 처리 중 표시를 시도
+                continue
+            stored_fingerprint, _, response = entry
+            if stored_fingerprint != fingerprint:
+                return self.MISMATCH, None
+            if response is not None:
+                return self.REPLAY, response
+            # 먼저 들어온 요청이 끝나면 다시 확인 (실패해서 키가 풀렸으면 이번 요청이 실행)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return self.IN_PROGRESS, None
+            time.sleep(min(IDEMPOTENCY_POLL_SECONDS, remaining))
+
+    # 실행 결과 저장. response 가 None 이면(예외, 서버 오류) 키를 풀어서 재시도할 수 있게 한다.
+    # 키를 풀 때는 이 요청이 남긴 처리 중 표시일 때만 지운다. (만료 뒤 다른 요청이 다시 가져간 키는 두고 간다)
+    def complete(self, key, claim, response):
+        cache_key = self._cache_key(key)
+        fingerprint, token, _ = claim
+        if response is not None:
+            cache.set(cache_key, (fingerprint, token, response), timeout=self.ttl)
+        elif cache.get(cache_key) == claim:
+            cache.delete(cache_key)
+
+    def _cache_key(self, key):
+        return f'{self.key_prefix}:{key}'
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,414 @@
+import bisect
+import heapq
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from .models import Points, User
+
+
+# 포인트 리더보드 (전체 / 레벨별) 프로세스 내 인덱스
+# - 사용자별 포인트/레벨은 user_id 로 인덱싱하는 배열에 저장한다. (사용자 100만 명 기준 약 12MB)
+# - 범위(전체, 레벨)마다 포인트 값별 사용자 수를 펜윅 트리로 유지해서 순위를 O(log V) 에 계산한다.
+#   (V: 사용 중인 서로 다른 포인트 값 개수. 값의 크기와는 관계없다.)
+# - 범위마다 상위 LEADERBOARD_TOP_SIZE ~ 2배 명을 정렬된 목록으로 유지하고, 모자랄 때만 배열에서 다시 채운다.
+# 포인트 변경은 포인트 내역(Points) 테이블을 변경 로그로 사용해서 반영한다.
+# 조회할 때마다 마지막으로 반영한 points_id 이후의 내역과 새로 가입한 사용자만 읽으므로
+# 다른 프로세스(다른 워커, 관리 명령)에서 적립한 포인트도 반영된다.
+# 작은 points_id 가 큰 points_id 보다 늦게 커밋될 수 있으므로 건너뛴 ID(빈 번호)는 LEADERBOARD_GAP_SECONDS 동안
+# 다음 조회에서 다시 찾는다. (롤백된 ID 는 나타나지 않으므로 그 시간이 지나면 잊는다.)
+# 사용자 삭제/레벨 변경은 같은 프로세스에서는 시그널(signals.py)로 바로, 다른 프로세스의 변경은
+# LEADERBOARD_REBUILD_SECONDS 마다 백그라운드 스레드에서 전체를 새로 읽은 스냅샷으로 바꿔서 반영한다.
+# DB 조회는 잠금 밖에서 하고, 잠금 안에서는 메모리의 스냅샷만 읽고 고친다.
+TOP_SIZE = getattr(settings, 'LEADERBOARD_TOP_SIZE', 100)
+REBUILD_SECONDS = getattr(settings, 'LEADERBOARD_REBUILD_SECONDS', 600)
+GAP_SECONDS = getattr(settings, 'LEADERBOARD_GAP_SECONDS', 60)
+MAX_GAPS = 10000  # 빈 번호가 이보다 많으면 스냅샷을 다시 만든다.
+PENDING_VALUES = 1024  # 펜윅 트리에 없는 포인트 값이 이보다 많아지면 트리를 다시 만든다.
+LOAD_CHUNK_SIZE = 10000
+
+
+class _Fenwick:
+    # 0 ~ size-1 인덱스별 개수, 누적 합 조회/갱신 O(log size)
+    def __init__(self, counts):
+        size = len(counts)
+        tree = array('i', [0]) + counts
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self.size = size
+        self.tree = tree
+
+    def add(self, index, delta):
+        tree, size = self.tree, self.size
+        index += 1
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    # index 이하의 개수 합
+    def prefix(self, index):
+        tree = self.tree
+        total = 0
+        index += 1
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+
+# 포인트 값별 사용자 수
+# 펜윅 트리는 만들 때 있던 포인트 값(정렬, 중복 없음)에만 인덱스를 주므로 크기가 값의 개수에 비례한다.
+# 그 뒤에 처음 나온 값은 pending 에 따로 세고, PENDING_VALUES 개를 넘으면 합쳐서 트리를 다시 만든다.
+class _Counts:
+    def __init__(self, counts):
+        self._build(counts)
+
+    def _build(self, counts):
+        self.values = sorted(value for value, count in counts.items() if count)
+        self.index = {value: index for index, value in enumerate(self.values)}
+        self.counts = array('i', [counts[value] for value in self.values])
+        self.fenwick = _Fenwick(self.counts)
+        self.indexed_total = sum(self.counts)
+        self.pending = {}
+        self.pending_values = []  # pending 의 키 (오름차순)
+
+    def add(self, points, delta):
+        index = self.index.get(points)
+        if index is not None:
+            self.counts[index] += delta
+            self.fenwick.add(index, delta)
+            self.indexed_total += delta
+            return
+        if points not in self.pending:
+            if len(self.pending) >= PENDING_VALUES:
+                counts = dict(zip(self.values, self.counts))
+                counts.update(self.pending)
+                self._build(counts)
+                self.add(points, delta)
+                return
+            bisect.insort(self.pending_values, points)
+            self.pending[points] = 0
+        self.pending[points] += delta
+
+    # points 보다 많은 사용자 수
+    def above(self, points):
+        count = self.indexed_total - self.fenwick.prefix(bisect.bisect_right(self.values, points) - 1)
+        pending_values = self.pending_values
+        for index in range(bisect.bisect_right(pending_values, points), len(pending_values)):
+            count += self.pending[pending_values[index]]
+        return count
+
+    # 위에서 count 번째 사용자의 포인트 (사용자가 count 명보다 적으면 None)
+    def cutoff(self, count):
+        values = self.values
+        # 펜윅 트리의 값 중 (그 값 이상인 사용자 수 >= count) 를 만족하는 가장 큰 값
+        low, high = -1, len(values) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.above(values[middle] - 1) >= count:
+                low = middle
+            else:
+                high = middle - 1
+        best = values[low] if low >= 0 else None
+        # pending 의 값은 큰 값부터 확인
+        for value in reversed(self.pending_values):
+            if best is not None and value <= best:
+                break
+            if self.pending[value] and self.above(value - 1) >= count:
+                best = value
+                break
+        return best
+
+
+class _Scope:
+    def __init__(self, counts, total, top):
+        self.counts = counts
+        self.total = total
+        self.top = top  # (-points, user_id) 오름차순 = 순위 순
+        self.complete = len(top) == total  # 범위의 모든 사용자가 top 에 들어 있는지
+
+    def offer(self, key):
+        top = self.top
+        if self.complete or (top and key < top[-1]):
+            bisect.insort(top, key)
+            if len(top) > TOP_SIZE * 2:
+                top.pop()
+                self.complete = False
+
+    def discard(self, key):
+        top = self.top
+        index = bisect.bisect_left(top, key)
+        if index < len(top) and top[index] == key:
+            del top[index]
+
+
+# 리더보드 스냅샷: load() 로 DB 에서 한 번 읽고, 그 뒤로는 메모리에서만 고친다. (잠금은 Leaderboard 가 담당)
+class _Board:
+    def __init__(self, last_points_id, gaps):
+        self.last_points_id = last_points_id
+        self.gaps = gaps  # 빈 번호 points_id → 처음 본 시각
+        self.points = array('q')
+        self.levels = array('i')  # 0: 없는 사용자
+        self.max_user_id = 0
+        self.scopes = {}
+        self.loaded_at = None
+        self.stale = False  # True 면 다음 조회에서 새 스냅샷을 만든다.
+
+    @classmethod
+    def load(cls):
+        # 사용자를 읽기 전에 변경 로그 위치를 정해 두면 그 사이의 변경은 다음 sync 에서 다시 반영된다.
+        # (내역의 total_points 는 절대값이므로 두 번 반영되어도 결과가 같다.)
+        last_points_id = Points.objects.order_by('-points_id').values_list('points_id', flat=True).first() or 0
+        # 마지막 위치 바로 아래의 빈 번호는 아직 커밋되지 않은 내역일 수 있다.
+        window_start = max(last_points_id - MAX_GAPS, 0)
+        recent = set(Points.objects.filter(points_id__gt=window_start).values_list('points_id', flat=True))
+        now = time.monotonic()
+        board = cls(last_points_id, {
+            points_id: now for points_id in range(window_start + 1, last_points_id) if points_id not in recent
+        })
+        for user_id, points, level_id in User.objects.order_by('user_id').values_list(
+            'user_id', 'points', 'level_id',
+        ).iterator(chunk_size=LOAD_CHUNK_SIZE):
+            board._grow(user_id)
+            board.points[user_id] = points
+            board.levels[user_id] = level_id
+            board.max_user_id = user_id
+        board._build_scopes()
+        board.loaded_at = time.monotonic()
+        return board
+
+    # 마지막 조회 이후 새로 가입한 사용자와 포인트 내역 조회 (DB, 잠금 밖에서 호출)
+    def fetch_changes(self):
+        users = list(User.objects.filter(user_id__gt=self.max_user_id).order_by('user_id').values_list(
+            'user_id', 'points', 'level_id',
+        ))
+        now = time.monotonic()
+        self.gaps = {points_id: seen for points_id, seen in self.gaps.items() if now - seen < GAP_SECONDS}
+        changes = Q(points_id__gt=self.last_points_id)
+        if self.gaps:
+            changes |= Q(points_id__in=list(self.gaps))
+        entries = list(Points.objects.filter(changes).order_by('points_id').values_list(
+            'points_id', 'user_id', 'total_points',
+        ))
+        return users, entries, now
+
+    def apply_changes(self, users, entries, now):
+        for user_id, points, level_id in users:
+            self.update_user(user_id, points, level_id)
+        # 같은 사용자의 내역은 사용자 행 잠금(ledger.record_points) 때문에 ID 순서대로 커밋되므로
+        # 늦게 커밋된 내역을 반영해도 그 사용자의 더 최근 내역을 덮어쓰지 않는다.
+        gaps = self.gaps
+        for points_id, user_id, total_points in entries:
+            if points_id in gaps:
+                del gaps[points_id]
+            elif points_id > self.last_points_id:
+                gaps.update(dict.fromkeys(range(self.last_points_id + 1, points_id), now))
+                self.last_points_id = points_id
+            if user_id < len(self.levels) and self.levels[user_id]:
+                self.update_user(user_id, total_points, self.levels[user_id])
+        if len(gaps) > MAX_GAPS:
+            self.stale = True
+
+    # 사용자 추가/포인트·레벨 변경 (level_id 가 None 이면 삭제)
+    def update_user(self, user_id, points, level_id):
+        self._grow(user_id)
+        old_level = self.levels[user_id]
+        if old_level:
+            self._remove(self.points[user_id], user_id, old_level)
+        if level_id:
+            self.points[user_id] = points
+            self.levels[user_id] = level_id
+            self._add(points, user_id, level_id)
+        else:
+            self.levels[user_id] = 0
+        self.max_user_id = max(self.max_user_id, user_id)
+
+    def top(self, limit, level_id):
+        scope = self.scopes.get(level_id)
+        if scope is None:
+            return []
+        limit = min(limit, TOP_SIZE)
+        if len(scope.top) < limit and not scope.complete:
+            self._refill({level_id: scope})
+        return [(scope.counts.above(-key[0]) + 1, key[1], -key[0]) for key in scope.top[:limit]]
+
+    def rank(self, user_id):
+        if user_id >= len(self.levels) or not self.levels[user_id]:
+            return None
+        points, level_id = self.points[user_id], self.levels[user_id]
+        scope, level_scope = self.scopes[None], self.scopes[level_id]
+        return {
+            'points': points,
+            'rank': scope.counts.above(points) + 1,
+            'total': scope.total,
+            'level_id': level_id,
+            'level_rank': level_scope.counts.above(points) + 1,
+            'level_total': level_scope.total,
+        }
+
+    def _grow(self, user_id):
+        if user_id >= len(self.points):
+            extra = max(user_id + 1 - len(self.points), len(self.points) // 2, 1024)
+            self.points.extend(array('q', bytes(8 * extra)))
+            self.levels.extend(array('i', bytes(4 * extra)))
+
+    def _members(self):
+        points, levels = self.points, self.levels
+        for user_id in range(1, min(len(levels), self.max_user_id + 1)):
+            if levels[user_id]:
+                yield user_id, points[user_id]
+
+    def _build_scopes(self):
+        counts = {None: {}}
+        levels = self.levels
+        for user_id, points in self._members():
+            level_counts = counts.get(levels[user_id])
+            if level_counts is None:
+                level_counts = counts[levels[user_id]] = {}
+            counts[None][points] = counts[None].get(points, 0) + 1
+            level_counts[points] = level_counts.get(points, 0) + 1
+
+        self.scopes = {
+            level_id: _Scope(_Counts(level_counts), sum(level_counts.values()), [])
+            for level_id, level_counts in counts.items()
+        }
+        self._refill(self.scopes)
+
+    # 상위 목록 다시 채우기
+    # 범위별 TOP_SIZE * 2 번째 포인트를 먼저 구하고, 그 이상인 사용자만 모으므로 배열을 한 번만 훑는다.
+    def _refill(self, scopes):
+        cutoffs = {level_id: scope.counts.cutoff(TOP_SIZE * 2) for level_id, scope in scopes.items()}
+        candidates = {level_id: [] for level_id in scopes}
+        levels = self.levels
+        for user_id, points in self._members():
+            if None in cutoffs and (cutoffs[None] is None or points >= cutoffs[None]):
+                candidates[None].append((-points, user_id))
+            level_id = levels[user_id]
+            if level_id in cutoffs and (cutoffs[level_id] is None or points >= cutoffs[level_id]):
+                candidates[level_id].append((-points, user_id))
+        for level_id, scope in scopes.items():
+            scope.top = heapq.nsmallest(TOP_SIZE * 2, candidates[level_id])
+            scope.complete = len(scope.top) == scope.total
+
+    def _scope(self, level_id):
+        scope = self.scopes.get(level_id)
+        if scope is None:
+            scope = self.scopes[level_id] = _Scope(_Counts({}), 0, [])
+        return scope
+
+    def _add(self, points, user_id, level_id):
+        for scope in (self.scopes[None], self._scope(level_id)):
+            scope.counts.add(points, 1)
+            scope.total += 1
+            scope.offer((-points, user_id))
+
+    def _remove(self, points, user_id, level_id):
+        for scope in (self.scopes[None], self.scopes[level_id]):
+            scope.counts.add(points, -1)
+            scope.total -= 1
+            scope.discard((-points, user_id))
+            scope.complete = scope.complete or scope.total == len(scope.top)
+
+
+class Leaderboard:
+    def __init__(self):
+        self._lock = threading.Lock()  # 현재 스냅샷 읽기/변경
+        self._load_lock = threading.Lock()  # 처음 읽기는 한 요청만 (나머지는 기다린다)
+        self._sync_lock = threading.Lock()  # 변경 로그 반영은 한 번에 하나만
+        self._rebuilding = False
+        self._board = None
+
+    # 새 스냅샷을 만들어서 바꿔 넣는다. (잠금 없이 DB 에서 읽은 뒤 참조만 바꾼다)
+    def rebuild(self):
+        board = _Board.load()
+        with self._lock:
+            self._board = board
+        return board
+
+    # 요청 처리 중에는 다시 만들지 않고, 백그라운드 스레드를 띄운 뒤 지금 스냅샷으로 응답한다.
+    def _rebuild_in_background(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        def run():
+            try:
+                self.rebuild()
+            finally:
+                self._rebuilding = False
+                connection.close()
+
+        threading.Thread(target=run, name='kick_off-leaderboard', daemon=True).start()
+
+    # 조회용 현재 스냅샷 (마지막 조회 이후의 변경 반영)
+    def _current(self):
+        board = self._board
+        if board is None:
+            # 워커가 처음 조회할 때는 응답할 스냅샷이 없으므로 기다린다.
+            with self._load_lock:
+                board = self._board or self.rebuild()
+        elif board.stale or time.monotonic() - board.loaded_at > REBUILD_SECONDS:
+            self._rebuild_in_background()
+        self.sync(board)
+        return board
+
+    # 마지막 조회 이후 새로 가입한 사용자와 포인트 내역 반영
+    # 다른 요청이 반영하는 중이면 기다리지 않고 지금 스냅샷으로 응답한다.
+    def sync(self, board=None):
+        board = board or self._board
+        if board is None or not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            changes = board.fetch_changes()
+            with self._lock:
+                board.apply_changes(*changes)
+        finally:
+            self._sync_lock.release()
+
+    def update_user(self, user_id, points, level_id):
+        with self._lock:
+            if self._board is not None:
+                self._board.update_user(user_id, points, level_id)
+
+    # 레벨만 변경 (포인트는 이미 반영된 값을 유지)
+    def change_level(self, user_id, level_id):
+        with self._lock:
+            board = self._board
+            if board is None or user_id >= len(board.levels) or not board.levels[user_id]:
+                return
+            board.update_user(user_id, board.points[user_id], level_id)
+
+    def remove_user(self, user_id):
+        self.update_user(user_id, 0, None)
+
+    # 사용자 행을 다시 읽어서 반영 (프로필 수정, 레벨 변경, 삭제 등)
+    def refresh_user(self, user_id):
+        if self._board is None:
+            return
+        row = User.objects.filter(user_id=user_id).values_list('points', 'level_id').first()
+        if row is None:
+            self.remove_user(user_id)
+        else:
+            self.update_user(user_id, *row)
+
+    # 상위 limit 명: [(rank, user_id, points)]  (동점은 같은 순위, user_id 순)
+    def top(self, limit=10, level_id=None):
+        board = self._current()
+        with self._lock:
+            return board.top(limit, level_id)
+
+    # 사용자 순위: {'points', 'rank', 'total', 'level_id', 'level_rank', 'level_total'}
+    def rank(self, user_id):
+        board = self._current()
+        with self._lock:
+            return board.rank(user_id)
+
+
+leaderboard = Leaderboard()
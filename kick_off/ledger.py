@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import Points, User
+
+
+POINTS_MAX_AMOUNT = getattr(settings, 'POINTS_MAX_AMOUNT', 100000)  # 한 번에 적립/차감할 수 있는 최대 포인트
+
+
+# 포인트 적립/차감
+# 사용자 잔액을 F() 로 원자적으로 변경하고, 같은 트랜잭션에서 포인트 내역(Points)을 남긴다.
+# UPDATE 가 사용자 행을 잠그므로 뒤이어 읽은 잔액이 곧 이 내역의 total_points 가 된다.
+def record_points(user_id, amount):
+    with transaction.atomic():
+        updated = User.objects.filter(user_id=user_id).update(points=F('points') + amount)
+        if not updated:
+            raise User.DoesNotExist(f'User {user_id} does not exist.')
+
+        balance = User.objects.filter(user_id=user_id).values_list('points', flat=True).get()
+        return Points.objects.create(
+            user_id=user_id,
+            points_log='earned' if amount >= 0 else 'deducted',
+            points_amount=amount,
+            total_points=balance,
+        )
+
+
+# 특정 시점의 포인트 잔액
+# 각 내역의 total_points 가 그 시점의 잔액이므로 전체 내역을 합산하지 않고
+# (user, event_date) 인덱스로 마지막 내역 한 건만 조회한다.
+def balance_as_of(user_id, when):
+    balance = Points.objects.filter(
+        user_id=user_id, event_date__lte=when,
+    ).order_by('-event_date', '-points_id').values_list('total_points', flat=True).first()
+    return balance or 0
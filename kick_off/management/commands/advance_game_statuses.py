@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from kick_off.games import advance_game_statuses
+
+
+# 경기 시작/종료 시각에 따라 상태 일괄 변경 (cron 으로 주기 실행하거나 --interval 로 계속 실행)
+class Command(BaseCommand):
+    help = 'Move games to in-progress/finished based on game_date and game_time. Safe to run on several nodes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0, metavar='SECONDS',
+            help='Keep running, advancing statuses every SECONDS. Runs once when omitted.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            result = advance_game_statuses()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{timezone.now().isoformat(timespec='seconds')} started={result['started']} "
+                f"finished={result['finished']} elapsed={elapsed:.3f}s"
+            )
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import AccessToken
+
+from kick_off import firebase_auth
+from kick_off.models import Level, User
+
+
+# 동기(WSGI) 뷰와 비동기(ASGI) 뷰의 처리량 비교
+# 임시 테스트 DB를 만들어 같은 요청을 같은 프로세스에서 두 방식으로 보내고, 끝나면 DB를 삭제한다.
+# Firebase 토큰 검증은 --sdk-latency-ms 만큼 블로킹되는 대역으로 바꿔서 측정한다.
+class Command(BaseCommand):
+    help = 'Compare sync (WSGI) and async (ASGI) login/profile views under concurrency.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=200, help='In-flight requests.')
+        parser.add_argument('--sync-workers', type=int, default=8, help='WSGI worker threads.')
+        parser.add_argument('--sdk-latency-ms', type=float, default=20.0)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _run(self, options):
+        level = Level.objects.create(name='Novice', color='#FF0000', whistle=0, level_number=0)
+        user = User.objects.create(name='bench', level=level, phone_number='bench', firebase_uid='bench-uid')
+        auth_user = get_user_model().objects.create(username='bench')
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(auth_user)}'}
+
+        latency = options['sdk_latency_ms'] / 1000
+
+        def verify(id_token):
+            time.sleep(latency)
+            return {'uid': 'bench-uid', 'phone_number': 'bench'}
+
+        endpoints = [
+            ('phone_login', 'post', '/api/auth/phone-login/', '/api/async/auth/phone-login/', {'id_token': 'token'}),
+            ('get_user_profile', 'get', f'/api/users/{user.user_id}/', f'/api/async/users/{user.user_id}/', None),
+        ]
+        results = []
+        with mock.patch.object(firebase_auth.verifier, 'verify', verify):
+            for name, method, sync_path, async_path, body in endpoints:
+                results.append(self._bench_sync(name, method, sync_path, body, headers, options))
+                results.append(self._bench_async(name, method, async_path, body, headers, options))
+        return results
+
+    def _bench_sync(self, name, method, path, body, headers, options):
+        def call(_):
+            client = Client()
+            started = time.perf_counter()
+            if method == 'post':
+                response = client.post(path, body, content_type='application/json', headers=headers)
+            else:
+                response = client.get(path, headers=headers)
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['sync_workers']) as pool:
+            samples = list(pool.map(call, range(options['requests'])))
+        return self._summary(name, 'sync-wsgi', samples, time.perf_counter() - started)
+
+    def _bench_async(self, name, method, path, body, headers, options):
+        async def run():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(options['concurrency'])
+
+            async def call():
+                async with semaphore:
+                    started = time.perf_counter()
+                    if method == 'post':
+                        response = await client.post(path, body, content_type='application/json', headers=headers)
+                    else:
+                        response = await client.get(path, headers=headers)
+                    return time.perf_counter() - started, response.status_code
+
+            return await asyncio.gather(*(call() for _ in range(options['requests'])))
+
+        started = time.perf_counter()
+        samples = asyncio.run(run())
+        return self._summary(name, 'async-asgi', samples, time.perf_counter() - started)
+
+    def _summary(self, name, mode, samples, elapsed):
+        latencies = sorted(latency for latency, _ in samples)
+        quantiles = statistics.quantiles(latencies, n=100)
+        return {
+            'endpoint': name,
+            'mode': mode,
+            'requests': len(samples),
+            'errors': sum(1 for _, status in samples if status >= 400),
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(samples) / elapsed, 1),
+            'p50_ms': round(quantiles[49] * 1000, 2),
+            'p99_ms': round(quantiles[98] * 1000, 2),
+        }
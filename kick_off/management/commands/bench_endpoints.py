@@ -0,0 +1,81 @@
+import json
+import logging
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from kick_off import firebase_auth
+from kick_off.benchmark import generate_data, run_endpoints
+
+from .generate_bench_data import add_data_arguments, data_options
+
+
+# kick_off/urls.py 의 모든 엔드포인트 부하 테스트
+# 임시 테스트 DB에 가상 데이터를 만들고 엔드포인트마다 동시 요청을 보내서
+# p50/p95/p99 지연 시간, 처리량, 요청당 쿼리 수를 JSON 으로 출력한다. (--output 으로 파일 저장, 실행 결과 비교용)
+# --existing 이면 현재 DB(generate_bench_data 로 만든 데이터)에 바로 요청을 보낸다. 쓰기 요청도 실행되므로 로컬 DB 에서만 사용한다.
+# Firebase 토큰 검증은 네트워크 없이 id_token 을 uid 로 쓰는 대역으로 바꾼다.
+class Command(BaseCommand):
+    help = 'Load-test every kick_off endpoint with concurrent clients and report latency/throughput/query counts.'
+
+    def add_arguments(self, parser):
+        add_data_arguments(parser)
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads.')
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per endpoint.')
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help='Only this URL name (repeatable).')
+        parser.add_argument('--existing', action='store_true', help='Use the configured database as-is.')
+        parser.add_argument('--output', help='Also write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        if options['existing']:
+            report = self._run(options, None)
+        else:
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                started = time.perf_counter()
+                data = generate_data(**data_options(options))
+                data['seconds'] = round(time.perf_counter() - started, 1)
+                report = self._run(options, data)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
+
+    def _run(self, options, data):
+        def verify(id_token):
+            return {'uid': id_token, 'phone_number': None}
+
+        # 4xx 응답은 결과의 statuses 에 집계되므로 요청마다 경고 로그를 남기지 않는다.
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        started_at = timezone.now()
+        try:
+            with mock.patch.object(firebase_auth.verifier, 'verify', verify):
+                endpoints = run_endpoints(
+                    requests=options['requests'], concurrency=options['concurrency'], warmup=options['warmup'],
+                    endpoints=options['endpoints'], seed=options['seed'],
+                )
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            request_logger.setLevel(level)
+        return {
+            'started_at': started_at.isoformat(),
+            'database': connection.vendor,
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'data': data,
+            'endpoints': endpoints,
+        }
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import AccessToken
+
+from kick_off.events import broker, publish_notification
+
+
+# 이벤트 스트림(events/) 부하 테스트
+# 임시 테스트 DB를 만들고 ASGI 애플리케이션에 유휴 SSE 연결 N개를 직접 연결한 뒤
+# 연결당 메모리와 전체 구독자에게 이벤트 하나를 전달하는 시간을 측정한다.
+class Command(BaseCommand):
+    help = 'Open N idle SSE subscribers in-process and measure memory per connection and fan-out latency.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            auth_user = get_user_model().objects.create(username='bench')
+            token = str(AccessToken.for_user(auth_user))
+            result = asyncio.run(self._run(options['subscribers'], token))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(result, indent=2))
+
+    async def _run(self, count, token):
+        application = get_asgi_application()
+        disconnect = asyncio.Event()
+        connected = asyncio.Semaphore(0)
+        received = asyncio.Semaphore(0)
+        failed = []
+
+        async def subscriber(user_id):
+            chunks = 0
+            request_sent = False
+
+            async def receive():
+                nonlocal request_sent
+                if not request_sent:
+                    request_sent = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                nonlocal chunks
+                if message['type'] == 'http.response.start' and message['status'] != 200:
+                    failed.append(message['status'])
+                    connected.release()
+                    return
+                if message['type'] != 'http.response.body' or not message.get('body'):
+                    return
+                chunks += 1
+                (connected if chunks == 1 else received).release()
+
+            await application({
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'root_path': '',
+                'path': '/api/events/', 'raw_path': b'/api/events/',
+                'query_string': f'user_id={user_id}'.encode(),
+                'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode())],
+                'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+            }, receive, send)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(subscriber(user_id)) for user_id in range(1, count + 1)]
+        for _ in range(count):
+            await connected.acquire()
+        connect_seconds = time.perf_counter() - started
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        if failed:
+            disconnect.set()
+            await asyncio.gather(*tasks)
+            return {'subscribers': count, 'errors': len(failed), 'statuses': sorted(set(failed))}
+
+        started = time.perf_counter()
+        for user_id in range(1, count + 1):
+            publish_notification(user_id, 'bench', 'other', None)
+        for _ in range(count):
+            await received.acquire()
+        fanout_seconds = time.perf_counter() - started
+
+        disconnect.set()
+        await asyncio.gather(*tasks)
+
+        return {
+            'subscribers': count,
+            'connect_seconds': round(connect_seconds, 2),
+            'bytes_per_idle_connection': memory // count,
+            'fanout_seconds': round(fanout_seconds, 3),
+            'subscribers_left_after_disconnect': broker.subscriber_count(),
+        }
@@ -0,0 +1,99 @@
+import json
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from kick_off.leaderboard import Leaderboard
+from kick_off.ledger import record_points
+from kick_off.models import Level, User
+
+
+# 리더보드 성능 측정
+# 임시 테스트 DB에 사용자 N명을 만들고 리더보드 순위 조회/상위 목록 조회/포인트 반영 시간을
+# ORDER BY / COUNT(*) 쿼리와 비교한다.
+class Command(BaseCommand):
+    help = 'Benchmark leaderboard rank/top-N lookups against ORDER BY / COUNT(*) queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000000)
+        parser.add_argument('--samples', type=int, default=2000)
+        parser.add_argument('--max-points', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _run(self, options):
+        rng = random.Random(0)
+        levels = [
+            Level.objects.create(name=name, color='#FF0000', whistle=0, level_number=number)
+            for number, name in enumerate(['Novice', 'Rookie', 'Professional', 'Elite'])
+        ]
+        started = time.perf_counter()
+        batch = []
+        for i in range(options['users']):
+            batch.append(User(
+                name=f'u{i}', phone_number=f'p{i}', level=rng.choice(levels),
+                points=rng.randrange(options['max_points']),
+            ))
+            if len(batch) == 10000:
+                User.objects.bulk_create(batch)
+                batch = []
+        User.objects.bulk_create(batch)
+        seed_seconds = time.perf_counter() - started
+        user_ids = list(User.objects.values_list('user_id', flat=True))
+
+        board = Leaderboard()
+        started = time.perf_counter()
+        board.rebuild()
+        load_seconds = time.perf_counter() - started
+
+        samples = [rng.choice(user_ids) for _ in range(options['samples'])]
+        results = {
+            'users': options['users'],
+            'seed_seconds': round(seed_seconds, 1),
+            'load_seconds': round(load_seconds, 2),
+            # 조회마다 실행되는 변경 로그 반영(새 사용자/포인트 내역 조회 쿼리 2개)만의 비용
+            'sync_us': self._time(lambda _: board.sync(), samples),
+            'rank_us': self._time(lambda user_id: board.rank(user_id), samples),
+            'top10_us': self._time(lambda _: board.top(10), samples),
+            'top10_level_us': self._time(lambda _: board.top(10, levels[1].id), samples),
+            'record_points_and_rank_us': self._time(
+                lambda user_id: (record_points(user_id, rng.randrange(-50, 100)), board.rank(user_id)), samples,
+            ),
+        }
+
+        # 비교: 매 요청마다 DB 에서 계산하는 경우 (표본 수를 줄여서 측정)
+        db_samples = samples[:20]
+        results['db_count_rank_us'] = self._time(
+            lambda user_id: User.objects.filter(
+                points__gt=User.objects.filter(user_id=user_id).values('points')[:1],
+            ).count(),
+            db_samples,
+        )
+        results['db_order_by_top10_us'] = self._time(
+            lambda _: list(User.objects.order_by('-points', 'user_id').values_list('user_id', 'points')[:10]),
+            db_samples,
+        )
+        return results
+
+    def _time(self, func, samples):
+        timings = []
+        for sample in samples:
+            started = time.perf_counter()
+            func(sample)
+            timings.append(time.perf_counter() - started)
+        return {
+            'p50': round(statistics.median(timings) * 1e6, 1),
+            'p99': round(statistics.quantiles(timings, n=100)[98] * 1e6, 1),
+        }
@@ -0,0 +1,66 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from kick_off.otp import OTPStore, otp_store
+from kick_off.views import verify_code_view
+
+
+# 인증 코드 검증 성능 측정
+# 1. 저장소만: 번호 N개에 코드를 발급해 두고 검증 처리량 측정 (threads 개 스레드, settings.CACHES 의 캐시 사용)
+# 2. 검증 API 뷰(DRF 요청 처리 포함, urls.py 의 요청 제한은 제외): 초당 검증 수
+class Command(BaseCommand):
+    help = 'Benchmark verification-code store and verify endpoint throughput.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--codes', type=int, default=100000)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        store = OTPStore(key_prefix='kick_off:otp-bench')
+        phone_numbers = [f'010{i:08d}' for i in range(options['codes'])]
+        started = time.perf_counter()
+        codes = [store.issue(phone_number) for phone_number in phone_numbers]
+        issue_seconds = time.perf_counter() - started
+
+        chunks = [
+            list(zip(phone_numbers, codes))[i::options['threads']] for i in range(options['threads'])
+        ]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['threads']) as pool:
+            verified = sum(pool.map(
+                lambda chunk: sum(store.verify(*pair) == OTPStore.VERIFIED for pair in chunk), chunks,
+            ))
+        verify_seconds = time.perf_counter() - started
+
+        self.stdout.write(json.dumps({
+            'codes': options['codes'],
+            'issue_per_second': round(options['codes'] / issue_seconds),
+            'verify_per_second': round(options['codes'] / verify_seconds),
+            'verified': verified,
+            'endpoint_verify_per_second': self._endpoint(options['requests']),
+        }, indent=2))
+
+    def _endpoint(self, count):
+        request_factory = APIRequestFactory()
+        user = get_user_model()(pk=1, username='bench')
+        requests = []
+        for i in range(count):
+            phone_number = f'011{i:08d}'
+            request = request_factory.post('/api/auth/verify-code/', {
+                'phone_number': phone_number, 'verification_code': otp_store.issue(phone_number),
+            }, format='json')
+            force_authenticate(request, user)
+            requests.append(request)
+
+        started = time.perf_counter()
+        statuses = {verify_code_view(request).status_code for request in requests}
+        seconds = time.perf_counter() - started
+        if statuses != {200}:
+            raise RuntimeError(f'unexpected statuses: {statuses}')
+        return round(count / seconds)
@@ -0,0 +1,106 @@
+import datetime
+import json
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from kick_off import recommendations
+from kick_off.models import Apply, Favorite, Game, Level, User
+from kick_off.recommendations import RecommendationIndex, recommend_games
+
+
+# 경기 추천 성능 측정
+# 임시 테스트 DB에 신청 가능한 경기 N개와 신청/관심 기록이 있는 사용자를 만들고
+# 인덱스 로드 시간과 추천 요청 지연 시간(p50/p99)을 측정한다.
+class Command(BaseCommand):
+    help = 'Benchmark game recommendation latency over the in-process recommendation index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--history', type=int, default=20)
+        parser.add_argument('--samples', type=int, default=2000)
+        parser.add_argument('--limit', type=int, default=10)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _run(self, options):
+        rng = random.Random(0)
+        levels = [
+            Level.objects.create(name=name, color='#FF0000', whistle=0, level_number=number)
+            for number, name in enumerate(['Novice', 'Rookie', 'Professional', 'Elite'])
+        ]
+        regions = [region for region, _ in Game.REGION_CHOICES]
+        genders = [gender for gender, _ in Game.GENDER_CHOICES]
+        today = datetime.date.today()
+
+        started = time.perf_counter()
+        batch = []
+        for i in range(options['games']):
+            max_participants = rng.randint(10, 22)
+            batch.append(Game(
+                game_name=f'g{i}', game_date=today + datetime.timedelta(days=rng.randint(1, 60)),
+                game_time=datetime.time(rng.randint(6, 22)), location='stadium',
+                max_participants=max_participants, participant_count=rng.randrange(max_participants),
+                region=rng.choice(regions), gender=rng.choice(genders), level=rng.choice(levels),
+            ))
+            if len(batch) == 10000:
+                Game.objects.bulk_create(batch)
+                batch = []
+        Game.objects.bulk_create(batch)
+
+        users = User.objects.bulk_create([
+            User(name=f'u{i}', phone_number=f'p{i}', level=rng.choice(levels)) for i in range(options['users'])
+        ])
+        game_ids = list(Game.objects.values_list('game_id', flat=True))
+        applies, favorites = [], []
+        for user in users:
+            for game_id in rng.sample(game_ids, options['history']):
+                if rng.random() < 0.5:
+                    applies.append(Apply(user=user, game_id=game_id, apply_status='Pending'))
+                else:
+                    favorites.append(Favorite(user=user, game_id=game_id))
+        Apply.objects.bulk_create(applies, batch_size=10000)
+        Favorite.objects.bulk_create(favorites, batch_size=10000)
+        seed_seconds = time.perf_counter() - started
+
+        index = RecommendationIndex()
+        started = time.perf_counter()
+        index.load()
+        load_seconds = time.perf_counter() - started
+
+        users = list(User.objects.select_related('level'))
+        samples = [rng.choice(users) for _ in range(options['samples'])]
+        # recommend_games 가 측정용 인덱스를 사용하도록 교체
+        recommendations.recommendation_index = index
+        return {
+            'games': options['games'],
+            'users': options['users'],
+            'seed_seconds': round(seed_seconds, 1),
+            'load_seconds': round(load_seconds, 2),
+            'buckets': len(index.buckets()),
+            'recommend_us': self._time(lambda user: recommend_games(user, options['limit']), samples),
+        }
+
+    def _time(self, func, samples):
+        timings = []
+        for sample in samples:
+            started = time.perf_counter()
+            func(sample)
+            timings.append(time.perf_counter() - started)
+        return {
+            'p50': round(statistics.median(timings) * 1e6, 1),
+            'p99': round(statistics.quantiles(timings, n=100)[98] * 1e6, 1),
+        }
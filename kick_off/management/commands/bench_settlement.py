@@ -0,0 +1,83 @@
+import json
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from kick_off.models import Level, Payment, User
+from kick_off.payments import SETTLEMENT_BATCH_SIZE, LocalTransferBackend, create_settlement_run
+
+
+# 이체 한 번(배치)마다 latency 초 지연, failure_rate 비율의 배치는 이체 요청 실패
+class _SimulatedBankBackend(LocalTransferBackend):
+    def __init__(self, latency, failure_rate, rng):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = rng
+
+    def transfer(self, payments):
+        time.sleep(self.latency)
+        if self.rng.random() < self.failure_rate:
+            raise ConnectionError('simulated bank outage')
+        return super().transfer(payments)
+
+
+# 결제 정산 성능 측정
+# 임시 테스트 DB에 결제 N개(일부는 이미 처리됨)를 만들고 정산 작업 한 번의 처리량과 오류 수를 측정한다.
+class Command(BaseCommand):
+    help = 'Benchmark batch payment settlement throughput.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--payments', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--batch-size', type=int, default=SETTLEMENT_BATCH_SIZE)
+        parser.add_argument('--latency-ms', type=float, default=50.0, help='Simulated bank round trip per batch.')
+        parser.add_argument('--failure-rate', type=float, default=0.01, help='Share of batches whose transfer fails.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self._run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def _run(self, options):
+        rng = random.Random(0)
+        level = Level.objects.create(name='Novice', color='#FF0000', whistle=0, level_number=0)
+        users = User.objects.bulk_create([
+            User(name=f'u{i}', phone_number=f'p{i}', level=level) for i in range(options['users'])
+        ])
+
+        started = time.perf_counter()
+        statuses = ['Pending'] * 8 + ['Completed', 'Refunded']
+        Payment.objects.bulk_create((
+            Payment(
+                user=rng.choice(users), amount=Decimal(rng.choice([0, 5000, 10000, 20000])),
+                payment_status=rng.choice(statuses), payment_method='Bank Transfer',
+            )
+            for _ in range(options['payments'])
+        ), batch_size=10000)
+        seed_seconds = time.perf_counter() - started
+        pending = Payment.objects.filter(payment_status='Pending').count()
+
+        backend = _SimulatedBankBackend(options['latency_ms'] / 1000, options['failure_rate'], rng)
+        # 백엔드 지연을 뺀 DB 쪽 처리 시간도 함께 보고
+        run, report = create_settlement_run(options['batch_size'], backend)
+        bank_seconds = report['batches'] * options['latency_ms'] / 1000
+        return {
+            'payments': options['payments'],
+            'pending': pending,
+            'batch_size': options['batch_size'],
+            'latency_ms': options['latency_ms'],
+            'seed_seconds': round(seed_seconds, 1),
+            'run_status': run.status,
+            **report,
+            'db_seconds': round(report['seconds'] - bank_seconds, 3),
+            'left_pending': Payment.objects.filter(payment_status='Pending').count(),
+        }
@@ -0,0 +1,78 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from kick_off.throttling import THROTTLE_MAX_KEYS, PhoneNumberThrottle, TokenBucketStore, parse_rate
+
+
+# 요청 제한 성능 측정
+# 서로 다른 키 N개(전화번호)로 토큰 버킷을 갱신하면서 판정 지연 시간(p50/p99)과 저장소 메모리 사용량을 측정한다.
+# 키 수가 max_keys 를 넘어도 저장소 크기와 메모리가 일정한지 확인한다.
+class Command(BaseCommand):
+    help = 'Benchmark token-bucket throttle decision latency and memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keys', type=int, default=2000000)
+        parser.add_argument('--max-keys', type=int, default=THROTTLE_MAX_KEYS)
+        parser.add_argument('--rate', default='5/hour')
+        parser.add_argument('--samples', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        capacity, refill_rate = parse_rate(options['rate'])
+        store = TokenBucketStore(max_keys=options['max_keys'])
+
+        tracemalloc.start()
+        for i in range(options['keys']):
+            store.consume(f'send_code:phone:010{i:08d}', capacity, refill_rate)
+        memory_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # 최근 키(저장소에 남아 있는 키)와 새 키를 섞어서 판정
+        keys = [f'send_code:phone:010{rng.randrange(options["keys"] + options["samples"]):08d}'
+                for _ in range(options['samples'])]
+        consume_timings = []
+        for key in keys:
+            started = time.perf_counter()
+            store.consume(key, capacity, refill_rate)
+            consume_timings.append(time.perf_counter() - started)
+
+        # DRF throttle 클래스 전체 경로 (요청 본문에서 전화번호를 읽고 정규화)
+        throttle_class = type('BenchPhoneNumberThrottle', (PhoneNumberThrottle,), {
+            'scope': 'bench', 'capacity': capacity, 'refill_rate': refill_rate,
+        })
+        request_factory = APIRequestFactory()
+        requests = []
+        for i in range(min(options['samples'], 10000)):
+            request = Request(
+                request_factory.post('/', {'phone_number': f'010-{i:04d}-0000'}, format='json'), parsers=[JSONParser()],
+            )
+            request.data  # 본문 파싱은 뷰에서도 하므로 측정에서 제외
+            requests.append(request)
+        throttle_timings = []
+        for request in requests:
+            started = time.perf_counter()
+            throttle_class().allow_request(request, None)
+            throttle_timings.append(time.perf_counter() - started)
+
+        self.stdout.write(json.dumps({
+            'keys': options['keys'],
+            'max_keys': options['max_keys'],
+            'stored_keys': len(store),
+            'store_mb': round(memory_bytes / 2 ** 20, 1),
+            'consume_us': self._percentiles(consume_timings),
+            'throttle_us': self._percentiles(throttle_timings),
+        }, indent=2))
+
+    def _percentiles(self, timings):
+        return {
+            'p50': round(statistics.median(timings) * 1e6, 2),
+            'p99': round(statistics.quantiles(timings, n=100)[98] * 1e6, 2),
+        }
@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kick_off.exports import EXPORT_FORMATS, export_all, export_chunks, export_filename, iter_activity
+from kick_off.models import User
+
+
+# 사용자 활동 내역 내보내기
+# --user: 한 사용자의 내역을 표준 출력(또는 --output 파일)으로 스트리밍
+# --all: 전체 사용자를 user_id 범위별 파일(--shards 개)로 나눠서 --workers 개의 프로세스에서 동시에 내보내기
+class Command(BaseCommand):
+    help = "Stream a user's activity history (points, payments, applies, missions, notifications) as NDJSON/CSV."
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--user', type=int, metavar='USER_ID')
+        target.add_argument('--all', action='store_true')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--output', help='File (--user) or directory (--all). Defaults to stdout / ./exports.')
+        parser.add_argument('--shards', type=int, default=4)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        export_format, compress = options['format'], options['gzip']
+
+        if options['all']:
+            started = time.perf_counter()
+            files = export_all(
+                options['output'] or 'exports', shards=options['shards'], workers=options['workers'],
+                export_format=export_format, compress=compress, chunk_size=options['chunk_size'],
+            )
+            for path, count in files:
+                self.stdout.write(f'{path}: {count} rows')
+            self.stdout.write(
+                f'exported {sum(count for _, count in files)} rows to {len(files)} files '
+                f'in {time.perf_counter() - started:.2f}s'
+            )
+            return
+
+        if not User.objects.filter(user_id=options['user']).exists():
+            raise CommandError(f'User {options["user"]} does not exist.')
+        chunks = export_chunks(
+            iter_activity(user_id=options['user'], chunk_size=options['chunk_size']), export_format, compress,
+        )
+        path = options['output']
+        if path and os.path.isdir(path):
+            path = os.path.join(path, export_filename(f'user-{options["user"]}-activity', export_format, compress))
+        with open(path, 'wb') if path else nullcontext(sys.stdout.buffer) as f:
+            for chunk in chunks:
+                f.write(chunk)
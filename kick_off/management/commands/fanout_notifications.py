@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kick_off.models import Game, Notification, NotificationFanout
+from kick_off.notifications import FANOUT_BATCH_SIZE, create_fanout, run_fanout
+
+
+# 경기/지역 참가자·신청자에게 알림 일괄 발송, 또는 중단된 발송 작업 재개
+class Command(BaseCommand):
+    help = 'Fan out a notification to the participants/applicants of a game or region, or resume fan-outs.'
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--game', type=int, help='game_id')
+        target.add_argument('--region', choices=[value for value, _ in Game.REGION_CHOICES])
+        target.add_argument(
+            '--resume', nargs='?', type=int, const=0, metavar='FANOUT_ID',
+            help='Resume the given fan-out, or every unfinished fan-out when no ID is given.',
+        )
+        parser.add_argument('--content')
+        parser.add_argument(
+            '--type', dest='notification_type', default='game_notification',
+            choices=[value for value, _ in Notification.NOTIFICATION_TYPE_CHOICES],
+        )
+        parser.add_argument(
+            '--audience', default='all', choices=[value for value, _ in NotificationFanout.AUDIENCE_CHOICES],
+        )
+        parser.add_argument('--batch-size', type=int, default=FANOUT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['resume'] is not None:
+            fanouts = NotificationFanout.objects.filter(status='running').order_by('fanout_id')
+            if options['resume']:
+                fanouts = fanouts.filter(fanout_id=options['resume'])
+            for fanout in fanouts:
+                self._report(lambda: run_fanout(fanout, batch_size))
+            return
+
+        if not options['content']:
+            raise CommandError('--content is required.')
+        game = None
+        if options['game']:
+            game = Game.objects.filter(game_id=options['game']).first()
+            if game is None:
+                raise CommandError(f"Game {options['game']} does not exist.")
+
+        self._report(lambda: create_fanout(
+            options['content'], options['notification_type'],
+            game=game, region=options['region'], audience=options['audience'], batch_size=batch_size,
+        ))
+
+    def _report(self, run):
+        started = time.perf_counter()
+        fanout = run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'fanout {fanout.fanout_id}: status={fanout.status} sent={fanout.sent_count} '
+            f'elapsed={elapsed:.2f}s'
+        )
@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from kick_off.benchmark import generate_data
+
+
+# 벤치마크/부하 테스트용 가상 데이터를 현재 DB 에 추가
+# 임시 DB 에서 바로 측정하려면 bench_endpoints 를 사용한다.
+class Command(BaseCommand):
+    help = 'Generate synthetic users, games, applies, favorites, notifications, points, payments and missions.'
+
+    def add_arguments(self, parser):
+        add_data_arguments(parser)
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(generate_data(**data_options(options)), indent=2))
+
+
+def add_data_arguments(parser):
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--games-per-region', type=int, default=200)
+    parser.add_argument('--applies-per-user', type=int, default=5)
+    parser.add_argument('--favorites-per-user', type=int, default=3)
+    parser.add_argument('--notifications-per-user', type=int, default=10)
+    parser.add_argument('--points-per-user', type=int, default=5)
+    parser.add_argument('--payments-per-user', type=int, default=2)
+    parser.add_argument('--missions', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def data_options(options):
+    return {
+        key: options[key] for key in (
+            'users', 'games_per_region', 'applies_per_user', 'favorites_per_user', 'notifications_per_user',
+            'points_per_user', 'payments_per_user', 'missions', 'seed',
+        )
+    }
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kick_off.models import Apply, Game
+from kick_off.waitlist import WAITLIST_BATCH_SIZE, process_waitlist
+
+
+# 경기 대기열 처리 (대기 신청을 참가자로 추가, 레벨 미달 신청 거절)
+class Command(BaseCommand):
+    help = 'Accept pending applications into game rosters in priority/FIFO order.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--game', type=int, help='game_id. Every upcoming game with pending applications when omitted.')
+        parser.add_argument('--batch-size', type=int, default=WAITLIST_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['game']:
+            games = Game.objects.filter(game_id=options['game'])
+            if not games.exists():
+                raise CommandError(f"Game {options['game']} does not exist.")
+        else:
+            games = Game.objects.filter(
+                status='upcoming',
+                game_id__in=Apply.objects.filter(apply_status='Pending').values('game_id'),
+            ).order_by('game_date', 'game_time', 'game_id')
+
+        for game in games:
+            started = time.perf_counter()
+            result = process_waitlist(game, options['batch_size'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"game {game.game_id}: accepted={result['accepted']} seated={result['seated']} "
+                f"rejected={result['rejected']} elapsed={elapsed:.3f}s"
+            )
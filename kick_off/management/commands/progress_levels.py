@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kick_off.models import LevelProgressionRun
+from kick_off.progression import PROGRESSION_BATCH_SIZE, create_progression_run, run_progression
+
+
+# 포인트/승급전 결과에 따라 전체 사용자 레벨 승급, 또는 중단된 승급 작업 재개
+class Command(BaseCommand):
+    help = 'Promote users whose points and promotion matches qualify them for a higher level.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resume', nargs='?', type=int, const=0, metavar='RUN_ID',
+            help='Resume the given run, or every unfinished run when no ID is given.',
+        )
+        parser.add_argument('--batch-size', type=int, default=PROGRESSION_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['resume'] is not None:
+            runs = LevelProgressionRun.objects.filter(status='running').order_by('run_id')
+            if options['resume']:
+                runs = runs.filter(run_id=options['resume'])
+            for run in runs:
+                self._report(lambda: run_progression(run, batch_size))
+            return
+
+        self._report(lambda: create_progression_run(batch_size))
+
+    def _report(self, run):
+        started = time.perf_counter()
+        progression = run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'progression {progression.run_id}: status={progression.status} '
+            f'processed={progression.processed_count} promoted={progression.promoted_count} elapsed={elapsed:.2f}s'
+        )
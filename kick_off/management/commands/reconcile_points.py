@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+
+from kick_off.models import Points, User
+
+
+# User.points 와 포인트 내역(Points) 합계를 사용자 묶음 단위로 대조
+class Command(BaseCommand):
+    help = 'Verify User.points against the Points ledger in chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--fix', action='store_true',
+            help='Append an adjustment entry so the ledger matches User.points.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        checked = mismatched = fixed = 0
+        last_user_id = 0
+
+        while True:
+            users = list(
+                User.objects.filter(user_id__gt=last_user_id)
+                .order_by('user_id').values_list('user_id', 'points')[:chunk_size]
+            )
+            if not users:
+                break
+            last_user_id = users[-1][0]
+
+            ledger = dict(
+                Points.objects.filter(user_id__in=[user_id for user_id, _ in users])
+                .order_by().values('user_id').annotate(total=Sum('points_amount'))
+                .values_list('user_id', 'total')
+            )
+            for user_id, points in users:
+                checked += 1
+                ledger_points = ledger.get(user_id) or 0
+                if points == ledger_points:
+                    continue
+
+                mismatched += 1
+                self.stdout.write(f'user {user_id}: User.points={points} ledger={ledger_points}')
+                if options['fix'] and self._fix(user_id):
+                    fixed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'checked={checked} mismatched={mismatched} fixed={fixed}'
+        ))
+
+    def _fix(self, user_id):
+        # 대조 이후 포인트가 바뀌었을 수 있으므로 사용자 행을 잠그고 다시 계산
+        with transaction.atomic():
+            points = User.objects.select_for_update().filter(user_id=user_id).values_list('points', flat=True).first()
+            if points is None:
+                return False
+            ledger_points = Points.objects.filter(user_id=user_id).aggregate(total=Sum('points_amount'))['total'] or 0
+            difference = points - ledger_points
+            if not difference:
+                return False
+            Points.objects.create(
+                user_id=user_id,
+                points_log='earned' if difference > 0 else 'deducted',
+                points_amount=difference,
+                total_points=points,
+            )
+        return True
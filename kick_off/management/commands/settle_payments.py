@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from kick_off.models import PaymentSettlementRun
+from kick_off.payments import SETTLEMENT_BATCH_SIZE, create_settlement_run, run_settlement
+
+
+# Pending 결제 정산, 또는 중단된 정산 작업 재개 (일 마감 배치)
+class Command(BaseCommand):
+    help = 'Settle pending payments against the bank-transfer backend.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resume', nargs='?', type=int, const=0, metavar='RUN_ID',
+            help='Resume the given run, or every unfinished run when no ID is given.',
+        )
+        parser.add_argument('--batch-size', type=int, default=SETTLEMENT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['resume'] is not None:
+            runs = PaymentSettlementRun.objects.filter(status='running').order_by('run_id')
+            if options['resume']:
+                runs = runs.filter(run_id=options['resume'])
+            for run in runs:
+                self._report(*run_settlement(run, batch_size))
+            return
+
+        self._report(*create_settlement_run(batch_size))
+
+    def _report(self, run, report):
+        self.stdout.write(
+            f'settlement {run.run_id}: status={run.status} processed={report["processed"]} '
+            f'completed={report["completed"]} failed={report["failed"]} errors={report["errors"]} '
+            f'batches={report["batches"]} elapsed={report["seconds"]:.2f}s rate={report["per_second"]}/s'
+        )
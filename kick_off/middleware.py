@@ -0,0 +1,218 @@
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+
+from .idempotency import IdempotencyStore, idempotency_store
+
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+_WHITESPACE = re.compile(r'\s+')
+REPORT_LIMIT = 10  # 로그에 남기는 반복 쿼리 지문 수
+# 요청 내용이 아니라 시점에 따라 달라지는 응답 (충돌, 요청 수 제한): 저장하면 나중 재시도도 계속 같은 응답을 받는다.
+UNSTORED_STATUSES = (409, 429)
+
+
+# 같은 모양의 쿼리를 묶기 위한 지문: 값(문자열/숫자, IN 목록 길이)을 지운 SQL
+def fingerprint(sql):
+    sql = _PLACEHOLDER_LIST.sub('%s', sql)
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql).replace('%s', '?')
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class _QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()  # SQL 문자열(자리표시자 포함) → 실행 횟수
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    # 지문별 실행 횟수를 합친 뒤, threshold 번 이상 반복된 SELECT 를 N+1 의심으로 표시
+    def summary(self, threshold):
+        fingerprints = Counter()
+        for sql, count in self.statements.items():
+            fingerprints[fingerprint(sql)] += count
+        repeated = [(sql, count) for sql, count in fingerprints.most_common() if count > 1]
+        return {
+            'queries': self.count,
+            'db_ms': round(self.seconds * 1000, 2),
+            'repeated_count': len(repeated),
+            'repeated': [{'sql': sql, 'count': count} for sql, count in repeated[:REPORT_LIMIT]],
+            'n_plus_one': [
+                {'sql': sql, 'count': count} for sql, count in repeated
+                if count >= threshold and sql.upper().startswith('SELECT')
+            ],
+        }
+
+
+# 요청별 SQL 계측
+# 요청마다 DB 연결에 execute_wrapper 를 걸어서 쿼리 수, DB 시간, 반복 쿼리 지문을 모으고
+# 같은 모양의 SELECT 가 SQL_INSTRUMENTATION_N_PLUS_ONE_THRESHOLD 번 이상 실행되면 N+1 로 표시한다.
+# - DEBUG: 모든 요청에 X-DB-* 응답 헤더를 붙인다.
+# - 운영: SQL_INSTRUMENTATION_SAMPLE_RATE 비율의 요청만 계측해서 JSON 한 줄로 로그를 남긴다. (N+1 은 WARNING)
+# 꺼져 있으면(SQL_INSTRUMENTATION_ENABLED, 기본값 DEBUG) MiddlewareNotUsed 로 미들웨어 체인에서 빠지므로 비용이 없다.
+# 같은 스레드의 연결만 계측한다. (batch 의 작업 스레드, 스트리밍 응답을 보내는 동안의 쿼리는 포함되지 않음)
+class SQLInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_INSTRUMENTATION_ENABLED', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.debug = settings.DEBUG
+        self.sample_rate = getattr(settings, 'SQL_INSTRUMENTATION_SAMPLE_RATE', 0.01)
+        self.threshold = getattr(settings, 'SQL_INSTRUMENTATION_N_PLUS_ONE_THRESHOLD', 5)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        # ASGI 로 실행하면 뷰가 다른 스레드(sync_to_async)의 DB 연결을 사용하므로 계측하지 않는다.
+        if self.async_mode:
+            return self.get_response(request)
+        if not self.debug and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = _QueryRecorder()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        summary = recorder.summary(self.threshold)
+        if self.debug:
+            response['X-DB-Query-Count'] = str(summary['queries'])
+            response['X-DB-Time-Ms'] = str(summary['db_ms'])
+            response['X-DB-Repeated-Queries'] = str(summary['repeated_count'])
+            if summary['n_plus_one']:
+                worst = summary['n_plus_one'][0]
+                response['X-DB-N-Plus-One'] = f"{worst['count']}x {worst['sql'][:200]}"
+        else:
+            line = json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                **summary,
+            }, ensure_ascii=False)
+            logger.log(logging.WARNING if summary['n_plus_one'] else logging.INFO, line)
+        return response
+
+
+IDEMPOTENT_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+# Idempotency-Key 헤더 처리 (쓰기 요청)
+# 같은 사용자(Authorization 헤더)가 같은 경로에 같은 키로 다시 보낸 요청은 뷰를 실행하지 않고 처음 응답을 그대로 돌려준다.
+# - 같은 키로 동시에 들어온 요청은 먼저 들어온 요청만 실행하고 나머지는 끝날 때까지(IDEMPOTENCY_WAIT_SECONDS) 기다린다.
+# - 같은 키로 본문이 다른 요청을 보내면 422, 기다려도 처음 요청이 끝나지 않으면 409.
+# - 서버 오류(5xx), 409/429 응답과 스트리밍 응답은 저장하지 않으므로 같은 키로 다시 시도할 수 있다.
+# 키와 응답은 공유 캐시(idempotency.py)에 보관하므로 재시도가 다른 워커 프로세스로 가도 뷰를 다시 실행하지 않는다.
+class IdempotencyMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.wait = getattr(settings, 'IDEMPOTENCY_WAIT_SECONDS', 10)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        key, fingerprint, error = self._identify(request)
+        if key is None:
+            return error or self.get_response(request)
+
+        outcome, value = idempotency_store.begin(key, fingerprint, self.wait)
+        if outcome != IdempotencyStore.EXECUTE:
+            return self._reply(outcome, value)
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            idempotency_store.complete(key, value, self._snapshot(response))
+        return response
+
+    async def __acall__(self, request):
+        key, fingerprint, error = self._identify(request)
+        if key is None:
+            return error or await self.get_response(request)
+
+        # 다른 요청을 기다리는 동안 이벤트 루프를 막지 않도록 스레드에서 확인
+        outcome, value = await sync_to_async(idempotency_store.begin, thread_sensitive=False)(
+            key, fingerprint, self.wait,
+        )
+        if outcome != IdempotencyStore.EXECUTE:
+            return self._reply(outcome, value)
+        response = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(idempotency_store.complete, thread_sensitive=False)(
+                key, value, self._snapshot(response),
+            )
+        return response
+
+    # (저장소 키, 요청 본문 지문, 오류 응답)
+    @staticmethod
+    def _identify(request):
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if not idempotency_key or request.method not in IDEMPOTENT_METHODS:
+            return None, None, None
+        if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return None, None, JsonResponse(
+                {'error': f'Idempotency-Key must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters'}, status=400,
+            )
+        scope = '\n'.join((
+            request.headers.get('Authorization', ''), request.method, request.get_full_path(), idempotency_key,
+        ))
+        return hashlib.sha256(scope.encode()).hexdigest(), hashlib.sha256(request.body).digest(), None
+
+    @staticmethod
+    def _snapshot(response):
+        if response is None or response.streaming or response.status_code >= 500 \
+                or response.status_code in UNSTORED_STATUSES:
+            return None
+        return response.status_code, list(response.items()), response.content
+
+    @staticmethod
+    def _reply(outcome, stored):
+        if outcome == IdempotencyStore.MISMATCH:
+            return JsonResponse(
+                {'error': 'Idempotency-Key was already used with a different request body'}, status=422,
+            )
+        if outcome == IdempotencyStore.IN_PROGRESS:
+            return JsonResponse({'error': 'A request with this Idempotency-Key is still in progress'}, status=409)
+        status_code, headers, content = stored
+        response = HttpResponse(content, status=status_code)
+        for header, value in headers:
+            response[header] = value
+        response['Idempotent-Replayed'] = 'true'
+        return response
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# models.py 에는 이미 반영되어 있지만 마이그레이션이 없던 변경 사항
+# - User.social_login_id / social_login_provider 삭제 (Firebase 로그인으로 대체, 데이터 삭제됨)
+# - User.phone_number UNIQUE: 적용 전에 중복 번호가 없는지 확인해야 한다.
+# - User.firebase_uid, Notification.is_read 추가
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0011_remove_mission_game'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='social_login_id',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='social_login_provider',
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='is_read',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='firebase_uid',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='level',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='kick_off.level'),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='status',
+            field=models.CharField(choices=[('upcoming', '신청하기'), ('in-progress', '진행중'), ('finished', '마감'), ('cancelled', '취소하기')], default='upcoming', max_length=15),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(blank=True, max_length=254, null=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='level',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='kick_off.level'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='name',
+            field=models.CharField(max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='phone_number',
+            field=models.CharField(max_length=15, unique=True),
+        ),
+    ]
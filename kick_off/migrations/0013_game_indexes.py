@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0012_model_state_sync'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['region', 'status', 'game_date', 'game_time', 'game_id'], name='game_region_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['region', 'gender', 'status', 'game_date', 'game_time', 'game_id'], name='game_region_gender_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['game_date', 'game_time', 'game_id'], name='game_date_time_idx'),
+        ),
+    ]
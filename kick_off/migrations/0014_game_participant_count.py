@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:31
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_participant_count(apps, schema_editor):
+    Game = apps.get_model('kick_off', 'Game')
+    GameParticipant = Game.participants.through
+    participant_count = GameParticipant.objects.filter(
+        game_id=OuterRef('game_id'),
+    ).order_by().values('game_id').annotate(count=Count('*')).values('count')
+    Game.objects.update(participant_count=Coalesce(Subquery(participant_count, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0013_game_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_participant_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0014_game_participant_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='points',
+            index=models.Index(fields=['user', 'event_date'], name='points_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0015_points_user_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationFanout',
+            fields=[
+                ('fanout_id', models.AutoField(primary_key=True, serialize=False)),
+                ('region', models.CharField(blank=True, choices=[('seoul', '서울'), ('gyeonggi', '경기')], max_length=20, null=True)),
+                ('audience', models.CharField(choices=[('participants', 'Participants'), ('applicants', 'Applicants'), ('all', 'Participants and Applicants')], default='all', max_length=15)),
+                ('content', models.TextField()),
+                ('notification_type', models.CharField(choices=[('game_notification', 'Game Notification'), ('system_notification', 'System Notification'), ('other', 'Other')], max_length=20)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed')], default='running', max_length=10)),
+                ('last_user_id', models.IntegerField(default=0)),
+                ('sent_count', models.IntegerField(default=0)),
+                ('creation_date', models.DateTimeField(auto_now_add=True)),
+                ('completion_date', models.DateTimeField(blank=True, null=True)),
+                ('game', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='kick_off.game')),
+            ],
+        ),
+    ]
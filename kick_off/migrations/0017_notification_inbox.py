@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:32
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_notification_count(apps, schema_editor):
+    User = apps.get_model('kick_off', 'User')
+    Notification = apps.get_model('kick_off', 'Notification')
+    unread = Notification.objects.filter(
+        user_id=OuterRef('user_id'), is_read=False,
+    ).order_by().values('user_id').annotate(count=Count('*')).values('count')
+    User.objects.update(unread_notification_count=Coalesce(Subquery(unread, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0016_notificationfanout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_notification_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'creation_date', 'notification_id'], name='notification_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', 'creation_date', 'notification_id'], name='notification_user_unread_idx'),
+        ),
+        migrations.RunPython(backfill_unread_notification_count, migrations.RunPython.noop),
+    ]
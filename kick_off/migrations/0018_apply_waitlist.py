@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0017_notification_inbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apply',
+            name='priority',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='apply',
+            index=models.Index(fields=['game', 'apply_status', '-priority', 'apply_date', 'apply_id'], name='apply_waitlist_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0018_apply_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['status', 'game_date', 'game_time'], name='game_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0019_game_status_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LevelProgressionRun',
+            fields=[
+                ('run_id', models.AutoField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed')], default='running', max_length=10)),
+                ('last_user_id', models.IntegerField(default=0)),
+                ('processed_count', models.IntegerField(default=0)),
+                ('promoted_count', models.IntegerField(default=0)),
+                ('creation_date', models.DateTimeField(auto_now_add=True)),
+                ('completion_date', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='level',
+            name='min_points',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='level',
+            name='requires_promotion_match',
+            field=models.BooleanField(default=False),
+        ),
+    ]
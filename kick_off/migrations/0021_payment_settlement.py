@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kick_off', '0020_level_progression'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentSettlementRun',
+            fields=[
+                ('run_id', models.AutoField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed')], default='running', max_length=10)),
+                ('cutoff_date', models.DateTimeField()),
+                ('last_payment_date', models.DateTimeField(blank=True, null=True)),
+                ('last_payment_id', models.IntegerField(default=0)),
+                ('processed_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('failed_count', models.IntegerField(default=0)),
+                ('error_count', models.IntegerField(default=0)),
+                ('creation_date', models.DateTimeField(auto_now_add=True)),
+                ('completion_date', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['payment_status', 'payment_date', 'payment_id'], name='payment_status_date_idx'),
+        ),
+    ]
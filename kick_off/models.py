@@ -36,6 +36,9 @@ class Level(models.Model):
             MinValueValidator(0),   # 최소 0
             MaxValueValidator(3)    # 최대 3
         ])  # 레벨 번호
+    # 레벨 승급 조건 (progression.py). min_points 가 없으면 자동 승급 대상이 아니다.
+    min_points = models.IntegerField(blank=True, null=True)  # 이 레벨로 승급하는 데 필요한 포인트
+    requires_promotion_match = models.BooleanField(default=False)  # 바로 아래 레벨의 승급전 참가 필요 (승패 무관)
 
     def clean(self):
         super().clean()
@@ -58,6 +61,7 @@ class User(models.Model):
     points = models.IntegerField(default=0)
     registration_date = models.DateTimeField(auto_now_add=True)
     profile_picture = models.URLField(max_length=255, blank=True, null=True)
+    unread_notification_count = models.IntegerField(default=0)  # 읽지 않은 알림 수 (notifications.py 에서 관리)
 
     def __str__(self):
         return self.name
@@ -74,6 +78,8 @@ class Game(models.Model):
 
     # 참가자 관리: User 모델과 Many-to-Many 관계 설정
     participants = models.ManyToManyField(User, blank=True)
+    # 참가자 수 (games.reserve_seat 에서 원자적으로 증가, COUNT 쿼리 없이 정원 확인)
+    participant_count = models.PositiveIntegerField(default=0)
 
     REGION_CHOICES = [
         ('seoul', '서울'),
@@ -101,20 +107,34 @@ class Game(models.Model):
     ]
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='upcoming')  # 기본값 설정
 
-    def clean(self):
-        # 참가자 수가 max_participants를 초과하지 않는지 확인
-        if self.participants.count() > self.max_participants:
-            raise ValidationError(f'참가자는 최대 {self.max_participants}명까지 가능합니다.')
+    class Meta:
+        # 경기 목록 조회(games/)의 필터 + 키셋 정렬 순서와 일치하는 복합 인덱스
+        indexes = [
+            models.Index(fields=['region', 'status', 'game_date', 'game_time', 'game_id'],
+                         name='game_region_status_date_idx'),
+            models.Index(fields=['region', 'gender', 'status', 'game_date', 'game_time', 'game_id'],
+                         name='game_region_gender_date_idx'),
+            models.Index(fields=['game_date', 'game_time', 'game_id'], name='game_date_time_idx'),
+            # 시간에 따른 상태 일괄 변경(games.advance_game_statuses)용
+            models.Index(fields=['status', 'game_date', 'game_time'], name='game_status_date_idx'),
+        ]
 
+    def clean(self):
+        # 참가자 수가 max_participants를 초과하지 않는지,
         # 참가자의 레벨이 경기에 필요한 최소 레벨을 충족하는지 확인
-        for participant in self.participants.all():
-            if participant.level.level_number < self.level.level_number:
-                raise ValidationError(f'{participant.name}님의 레벨이 경기에 필요한 최소 레벨보다 낮습니다.')
+        from .games import validate_participants
+        validate_participants(self)
 
     def save(self, *args, **kwargs):
         # 참가자 수가 가득 찼을 때 상태를 자동으로 'finished'로 변경
-        if self.participants.count() >= self.max_participants:
+        if self.participant_count >= self.max_participants:
             self.status = 'finished'
+        # participant_count 는 reserve_seat 가 원자적으로 관리하므로 기존 경기 수정 시 덮어쓰지 않는다.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'participant_count'
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -130,9 +150,16 @@ class Points(models.Model):
         ('deducted', 'Deducted'),
     ]
     points_log = models.CharField(max_length=10, choices=POINTS_LOG_CHOICES)
-    total_points = models.IntegerField()
+    points_amount = models.IntegerField()  # 포인트 변동량 (차감이면 음수)
+    total_points = models.IntegerField()  # 이 내역 반영 후 사용자 포인트 잔액
     event_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # 사용자별 내역 조회 및 특정 시점 잔액 조회용
+        indexes = [
+            models.Index(fields=['user', 'event_date'], name='points_user_date_idx'),
+        ]
+
     def __str__(self):
         return f"Points for {self.user.name}"
 
@@ -207,6 +234,12 @@ class Payment(models.Model):
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES)
     payment_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # 정산 대상(Pending) 결제를 결제 순으로 조회 (payments.py)
+        indexes = [
+            models.Index(fields=['payment_status', 'payment_date', 'payment_id'], name='payment_status_date_idx'),
+        ]
+
     def __str__(self):
         return f"Payment {self.payment_id} for {self.user.name}"
 
@@ -224,6 +257,14 @@ class Apply(models.Model):
         ('Cancelled', 'Cancelled'),
     ]
     apply_status = models.CharField(max_length=10, choices=APPLY_STATUS_CHOICES)
+    priority = models.IntegerField(default=0)  # 대기열 우선순위 (높을수록 먼저, 같으면 신청 순)
+
+    class Meta:
+        # 경기별 대기열 조회 순서 (waitlist.py)
+        indexes = [
+            models.Index(fields=['game', 'apply_status', '-priority', 'apply_date', 'apply_id'],
+                         name='apply_waitlist_idx'),
+        ]
 
     def __str__(self):
         return f"Apply {self.apply_id} for {self.user.name}"
@@ -243,5 +284,82 @@ class Notification(models.Model):
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPE_CHOICES)
     creation_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # 알림함 키셋 페이지네이션용 (전체 / 읽지 않은 알림)
+        indexes = [
+            models.Index(fields=['user', 'creation_date', 'notification_id'], name='notification_user_date_idx'),
+            models.Index(fields=['user', 'is_read', 'creation_date', 'notification_id'],
+                         name='notification_user_unread_idx'),
+        ]
+
     def __str__(self):
         return f"Notification {self.notification_id} for {self.user.name}"
+
+
+# 알림 일괄 발송 작업 테이블 (NotificationFanout)
+class NotificationFanout(models.Model):
+    fanout_id = models.AutoField(primary_key=True)
+    # 대상: 특정 경기(game) 또는 지역(region)의 참가자/신청자
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, blank=True, null=True)
+    region = models.CharField(max_length=20, choices=Game.REGION_CHOICES, blank=True, null=True)
+    AUDIENCE_CHOICES = [
+        ('participants', 'Participants'),
+        ('applicants', 'Applicants'),
+        ('all', 'Participants and Applicants'),
+    ]
+    audience = models.CharField(max_length=15, choices=AUDIENCE_CHOICES, default='all')
+    content = models.TextField()
+    notification_type = models.CharField(max_length=20, choices=Notification.NOTIFICATION_TYPE_CHOICES)
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+    ]
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
+    last_user_id = models.IntegerField(default=0)  # 체크포인트: 이 user_id 까지 발송 완료
+    sent_count = models.IntegerField(default=0)
+    creation_date = models.DateTimeField(auto_now_add=True)
+    completion_date = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Fanout {self.fanout_id} ({self.status}, {self.sent_count} sent)"
+
+
+# 레벨 승급 일괄 처리 작업 테이블 (LevelProgressionRun)
+class LevelProgressionRun(models.Model):
+    run_id = models.AutoField(primary_key=True)
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+    ]
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
+    last_user_id = models.IntegerField(default=0)  # 체크포인트: 이 user_id 까지 처리 완료
+    processed_count = models.IntegerField(default=0)
+    promoted_count = models.IntegerField(default=0)
+    creation_date = models.DateTimeField(auto_now_add=True)
+    completion_date = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Progression {self.run_id} ({self.status}, {self.promoted_count} promoted)"
+
+
+# 결제 정산 작업 테이블 (PaymentSettlementRun)
+class PaymentSettlementRun(models.Model):
+    run_id = models.AutoField(primary_key=True)
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+    ]
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
+    cutoff_date = models.DateTimeField()  # 이 시각까지 생성된 Pending 결제가 정산 대상
+    # 체크포인트: 이 (payment_date, payment_id) 까지 이체 요청 완료
+    last_payment_date = models.DateTimeField(blank=True, null=True)
+    last_payment_id = models.IntegerField(default=0)
+    processed_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)  # 이체 요청 자체가 실패해서 Pending 으로 남은 결제 수
+    creation_date = models.DateTimeField(auto_now_add=True)
+    completion_date = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Settlement {self.run_id} ({self.status}, {self.processed_count} processed)"
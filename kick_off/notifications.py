@@ -0,0 +1,151 @@
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .events import broker, publish_notification
+from .models import Apply, Game, Notification, NotificationFanout, User
+
+
+GameParticipant = Game.participants.through
+
+FANOUT_BATCH_SIZE = 5000
+ACTIVE_APPLY_STATUSES = ('Pending', 'Accepted')
+
+
+class FanoutConflict(Exception):
+    # 다른 작업자가 같은 발송 작업의 체크포인트를 먼저 옮긴 경우
+    pass
+
+
+# 알림 읽음 처리
+# notification_ids 를 생략하면 사용자의 읽지 않은 알림 전체를 UPDATE 한 번으로 읽음 처리한다.
+# 실제로 바뀐 행 수만큼 읽지 않은 알림 수를 줄인다.
+def mark_notifications_read(user_id, notification_ids=None):
+    with transaction.atomic():
+        notifications = Notification.objects.filter(user_id=user_id, is_read=False)
+        if notification_ids is not None:
+            notifications = notifications.filter(notification_id__in=notification_ids)
+        updated = notifications.update(is_read=True)
+        if updated:
+            User.objects.filter(user_id=user_id).update(
+                unread_notification_count=F('unread_notification_count') - updated,
+            )
+    return updated
+
+
+# 발송 대상 user_id (체크포인트 이후, user_id 순)
+# 참가자/신청자 user_id 를 UNION 한 쿼리 하나로 가져온다.
+def fanout_recipient_ids(fanout):
+    if fanout.game_id:
+        participants = GameParticipant.objects.filter(game_id=fanout.game_id)
+        applicants = Apply.objects.filter(game_id=fanout.game_id)
+    else:
+        participants = GameParticipant.objects.filter(game__region=fanout.region)
+        applicants = Apply.objects.filter(game__region=fanout.region)
+    applicants = applicants.filter(apply_status__in=ACTIVE_APPLY_STATUSES)
+
+    parts = []
+    if fanout.audience in ('participants', 'all'):
+        parts.append(participants)
+    if fanout.audience in ('applicants', 'all'):
+        parts.append(applicants)
+    parts = [
+        part.filter(user_id__gt=fanout.last_user_id).order_by().values_list('user_id', flat=True)
+        for part in parts
+    ]
+
+    recipient_ids = parts[0].distinct() if len(parts) == 1 else parts[0].union(*parts[1:])
+    return recipient_ids.order_by('user_id')
+
+
+# 알림 일괄 발송 작업 생성 후 실행
+def create_fanout(content, notification_type, game=None, region=None, audience='all', batch_size=FANOUT_BATCH_SIZE):
+    fanout = NotificationFanout.objects.create(
+        game=game, region=region, audience=audience, content=content, notification_type=notification_type,
+    )
+    return run_fanout(fanout, batch_size)
+
+
+# 알림 일괄 발송 (중단된 작업은 체크포인트부터 이어서 발송)
+# 배치마다 알림 bulk_create 와 체크포인트 갱신을 한 트랜잭션으로 처리하므로
+# 중간에 중단되어도 다시 실행하면 중복 없이 이어진다.
+def run_fanout(fanout, batch_size=FANOUT_BATCH_SIZE):
+    if fanout.status == 'completed':
+        return fanout
+
+    batch = []
+    try:
+        for user_id in fanout_recipient_ids(fanout).iterator(chunk_size=batch_size):
+            batch.append(user_id)
+            if len(batch) >= batch_size:
+                _send_batch(fanout, batch)
+                batch = []
+        if batch:
+            _send_batch(fanout, batch)
+    except FanoutConflict:
+        fanout.refresh_from_db()
+        return fanout
+
+    fanout.status = 'completed'
+    fanout.completion_date = timezone.now()
+    NotificationFanout.objects.filter(pk=fanout.pk).update(
+        status=fanout.status, completion_date=fanout.completion_date,
+    )
+    return fanout
+
+
+def _send_batch(fanout, user_ids):
+    with transaction.atomic():
+        # 체크포인트가 그대로일 때만 진행 (같은 작업을 동시에 실행해도 중복 발송하지 않음)
+        advanced = NotificationFanout.objects.filter(
+            pk=fanout.pk, last_user_id=fanout.last_user_id,
+        ).update(last_user_id=user_ids[-1], sent_count=F('sent_count') + len(user_ids))
+        if not advanced:
+            raise FanoutConflict()
+
+        notify_users(user_ids, fanout.content, fanout.notification_type)
+
+    fanout.last_user_id = user_ids[-1]
+    fanout.sent_count += len(user_ids)
+
+
+# 같은 내용의 알림을 여러 사용자에게 저장하고 읽지 않은 알림 수 증가 (호출하는 쪽의 트랜잭션 안에서 실행)
+# 스트림을 구독 중인 사용자에게는 커밋 후 전달한다.
+def notify_users(user_ids, content, notification_type):
+    notifications = _insert_notifications(user_ids, content, notification_type)
+    User.objects.filter(user_id__in=user_ids).update(
+        unread_notification_count=F('unread_notification_count') + 1,
+    )
+
+    subscribed = [
+        notification for notification in notifications if broker.has_subscribers(f'user:{notification.user_id}')
+    ]
+    if subscribed:
+        _fill_notification_ids(subscribed)
+
+        def publish():
+            for notification in subscribed:
+                publish_notification(
+                    notification.user_id, content, notification_type, notification.creation_date,
+                    notification_id=notification.notification_id,
+                )
+        transaction.on_commit(publish)
+
+
+def _insert_notifications(user_ids, content, notification_type):
+    return Notification.objects.bulk_create([
+        Notification(user_id=user_id, content=content, notification_type=notification_type) for user_id in user_ids
+    ], batch_size=FANOUT_BATCH_SIZE)
+
+
+# MySQL 은 bulk_create 후 ID 를 돌려주지 않으므로 방금 넣은 알림(사용자별 가장 최근 행)의 ID 를 다시 조회한다.
+def _fill_notification_ids(notifications):
+    missing = {notification.user_id: notification for notification in notifications if notification.pk is None}
+    if not missing:
+        return
+    first = next(iter(missing.values()))
+    for user_id, notification_id in Notification.objects.filter(
+        user_id__in=missing, content=first.content, notification_type=first.notification_type,
+        creation_date__gte=min(notification.creation_date for notification in missing.values()),
+    ).order_by().values('user_id').annotate(last_id=Max('notification_id')).values_list('user_id', 'last_id'):
+        missing[user_id].notification_id = notification_id
@@ -0,0 +1,85 @@
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+OTP_LENGTH = getattr(settings, 'OTP_LENGTH', 6)
+OTP_TTL_SECONDS = getattr(settings, 'OTP_TTL_SECONDS', 300)
+OTP_MAX_ATTEMPTS = getattr(settings, 'OTP_MAX_ATTEMPTS', 5)
+
+
+# 공백/하이픈만 다른 번호를 같은 번호로 취급
+def normalize_phone_number(phone_number):
+    return ''.join(char for char in str(phone_number) if char.isalnum() or char == '+')
+
+
+# 전화번호별 인증 코드 저장소 (Django 캐시, 여러 워커 프로세스가 함께 사용)
+# 코드는 SECRET_KEY 로 만든 HMAC 과 만료 시각으로만 저장하고, 틀린 횟수는 별도 키에서 incr 로 센다.
+# 두 키 모두 ttl 초 뒤 캐시에서 사라지므로 따로 지울 필요가 없고, 코드가 많아져도 유효한 코드를 먼저 버리지 않는다.
+# 검증에 성공하거나 max_attempts 번 틀리면 바로 지운다. 성공은 코드 키를 지운 요청 하나만 인정한다.
+class OTPStore:
+    VERIFIED = 'verified'
+    INVALID = 'invalid'  # 틀린 코드 (남은 시도 횟수 있음)
+    EXPIRED = 'expired'  # 발급한 코드가 없거나 만료됨
+    LOCKED = 'locked'  # 시도 횟수 초과: 코드를 새로 받아야 한다.
+
+    def __init__(self, ttl=OTP_TTL_SECONDS, max_attempts=OTP_MAX_ATTEMPTS, key_prefix='kick_off:otp'):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.key_prefix = key_prefix
+
+    # 새 코드 발급 (이전 코드와 틀린 횟수는 무효)
+    def issue(self, phone_number):
+        phone_number = normalize_phone_number(phone_number)
+        code = f'{secrets.randbelow(10 ** OTP_LENGTH):0{OTP_LENGTH}d}'
+        code_key, attempts_key = self._keys(phone_number)
+        cache.set_many({
+            code_key: (_hash_code(phone_number, code), time.time() + self.ttl),
+            attempts_key: 0,
+        }, timeout=self.ttl)
+        return code
+
+    def verify(self, phone_number, code):
+        phone_number = normalize_phone_number(phone_number)
+        code_key, attempts_key = self._keys(phone_number)
+        entry = cache.get(code_key)
+        if entry is None or entry[1] <= time.time():
+            return self.EXPIRED
+        if hmac.compare_digest(entry[0], _hash_code(phone_number, str(code))):
+            # 같은 코드로 동시에 들어온 요청 중 키를 지운 요청만 성공
+            if not cache.delete(code_key):
+                return self.EXPIRED
+            cache.delete(attempts_key)
+            return self.VERIFIED
+        try:
+            attempts = cache.incr(attempts_key)
+        except ValueError:  # 그 사이 만료되거나 다른 요청이 지움
+            return self.EXPIRED
+        if attempts >= self.max_attempts:
+            cache.delete_many([code_key, attempts_key])
+            return self.LOCKED
+        return self.INVALID
+
+    def _keys(self, phone_number):
+        return f'{self.key_prefix}:{phone_number}', f'{self.key_prefix}:attempts:{phone_number}'
+
+
+def _hash_code(phone_number, code):
+    return hmac.new(settings.SECRET_KEY.encode(), f'{phone_number}:{code}'.encode(), hashlib.sha256).digest()
+
+
+otp_store = OTPStore()
+
+
+# 인증 코드 전송
+# SMS 발송(Twilio 등)은 아직 연동 전이므로 개발 환경(DEBUG)에서만 로그로 코드를 확인할 수 있다.
+def deliver_code(phone_number, code):
+    if settings.DEBUG:
+        logger.info('Verification code for %s: %s', phone_number, code)
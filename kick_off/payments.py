@@ -0,0 +1,142 @@
+import logging
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Payment, PaymentSettlementRun
+
+
+logger = logging.getLogger(__name__)
+
+SETTLEMENT_BATCH_SIZE = getattr(settings, 'PAYMENT_SETTLEMENT_BATCH_SIZE', 1000)
+SETTLEMENT_BACKEND = getattr(settings, 'PAYMENT_SETTLEMENT_BACKEND', 'kick_off.payments.LocalTransferBackend')
+
+
+class SettlementConflict(Exception):
+    # 다른 작업자가 같은 정산 작업의 체크포인트를 먼저 옮긴 경우
+    pass
+
+
+# 계좌 이체 백엔드 (PAYMENT_SETTLEMENT_BACKEND 로 교체)
+# transfer(payments) 는 [{'payment_id', 'user_id', 'amount', 'payment_method'}] 를 받아
+# {payment_id: 'Completed' | 'Failed'} 를 반환한다. 결과가 없는 결제는 Pending 으로 남는다.
+# 같은 결제를 다시 요청할 수 있으므로(중단 후 재시도) 실제 백엔드는 payment_id 로 중복 이체를 막아야 한다.
+class LocalTransferBackend:
+    # 개발/테스트용: 실제 이체 없이 금액이 0보다 크면 완료, 아니면 실패
+    def transfer(self, payments):
+        return {
+            payment['payment_id']: 'Completed' if payment['amount'] > Decimal(0) else 'Failed'
+            for payment in payments
+        }
+
+
+def get_settlement_backend():
+    return import_string(SETTLEMENT_BACKEND)()
+
+
+def pending_payments(run):
+    payments = Payment.objects.filter(payment_status='Pending', payment_date__lte=run.cutoff_date)
+    if run.last_payment_date is not None:
+        payments = payments.filter(
+            Q(payment_date__gt=run.last_payment_date)
+            | Q(payment_date=run.last_payment_date, payment_id__gt=run.last_payment_id)
+        )
+    # payment_status_date_idx (payment_status, payment_date, payment_id) 순서
+    return payments.order_by('payment_date', 'payment_id')
+
+
+# 정산 작업 생성 후 실행 (지금까지 생성된 Pending 결제가 대상)
+def create_settlement_run(batch_size=SETTLEMENT_BATCH_SIZE, backend=None):
+    run = PaymentSettlementRun.objects.create(cutoff_date=timezone.now())
+    return run_settlement(run, batch_size, backend)
+
+
+# Pending 결제 정산 (중단된 작업은 체크포인트부터 이어서 실행)
+# 배치마다
+# 1. 체크포인트를 먼저 옮겨서 배치를 맡고 (짧은 트랜잭션, 같은 작업을 동시에 실행해도 한 작업자만 이체 요청)
+# 2. 트랜잭션 밖에서 이체 백엔드를 호출한 뒤
+# 3. 결과별 UPDATE 두 번과 집계를 한 트랜잭션으로 반영한다. (그 사이에 상태가 바뀐 결제는 덮어쓰지 않음)
+# 이체 요청이 실패한 배치는 Pending 으로 남으므로 다음 정산 작업에서 다시 시도된다.
+# 반환값: 작업과 이번 실행의 보고 {'processed', 'completed', 'failed', 'errors', 'batches', 'seconds', 'per_second'}
+def run_settlement(run, batch_size=SETTLEMENT_BATCH_SIZE, backend=None):
+    backend = backend or get_settlement_backend()
+    report = {'processed': 0, 'completed': 0, 'failed': 0, 'errors': 0, 'batches': 0}
+    started = time.perf_counter()
+
+    try:
+        while run.status != 'completed':
+            rows = list(pending_payments(run).values(
+                'payment_id', 'user_id', 'amount', 'payment_method', 'payment_date',
+            )[:batch_size])
+            if not rows:
+                run.status = 'completed'
+                run.completion_date = timezone.now()
+                PaymentSettlementRun.objects.filter(pk=run.pk).update(
+                    status=run.status, completion_date=run.completion_date,
+                )
+                break
+            _claim_batch(run, rows)
+            _settle_batch(run, rows, backend, report)
+    except SettlementConflict:
+        run.refresh_from_db()
+
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    report['per_second'] = round(report['processed'] / report['seconds'], 1) if report['seconds'] else None
+    return run, report
+
+
+def _claim_batch(run, rows):
+    last = rows[-1]
+    claimed = PaymentSettlementRun.objects.filter(
+        pk=run.pk, last_payment_date=run.last_payment_date, last_payment_id=run.last_payment_id,
+    ).update(last_payment_date=last['payment_date'], last_payment_id=last['payment_id'])
+    if not claimed:
+        raise SettlementConflict()
+    run.last_payment_date, run.last_payment_id = last['payment_date'], last['payment_id']
+
+
+def _settle_batch(run, rows, backend, report):
+    payments = [{key: row[key] for key in ('payment_id', 'user_id', 'amount', 'payment_method')} for row in rows]
+    try:
+        results = backend.transfer(payments)
+    except Exception:
+        # 이체 요청 자체가 실패하면 배치 전체가 Pending 으로 남는다.
+        logger.exception('Settlement run %s: transfer of %d payments failed', run.run_id, len(rows))
+        results = {}
+
+    by_status = {'Completed': [], 'Failed': []}
+    for payment in payments:
+        payment_status = results.get(payment['payment_id'])
+        if payment_status in by_status:
+            by_status[payment_status].append(payment['payment_id'])
+
+    with transaction.atomic():
+        # 이체 중에 관리자가 상태를 바꾼 결제는 그대로 둔다.
+        completed = Payment.objects.filter(
+            payment_id__in=by_status['Completed'], payment_status='Pending',
+        ).update(payment_status='Completed') if by_status['Completed'] else 0
+        failed = Payment.objects.filter(
+            payment_id__in=by_status['Failed'], payment_status='Pending',
+        ).update(payment_status='Failed') if by_status['Failed'] else 0
+        errors = len(rows) - len(by_status['Completed']) - len(by_status['Failed'])
+        PaymentSettlementRun.objects.filter(pk=run.pk).update(
+            processed_count=F('processed_count') + len(rows),
+            completed_count=F('completed_count') + completed,
+            failed_count=F('failed_count') + failed,
+            error_count=F('error_count') + errors,
+        )
+
+    run.processed_count += len(rows)
+    run.completed_count += completed
+    run.failed_count += failed
+    run.error_count += errors
+    report['processed'] += len(rows)
+    report['completed'] += completed
+    report['failed'] += failed
+    report['errors'] += errors
+    report['batches'] += 1
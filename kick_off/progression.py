@@ -0,0 +1,145 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .games import played_games
+from .leaderboard import leaderboard
+from .models import Game, Level, LevelProgressionRun, User
+from .notifications import notify_users
+
+
+GameParticipant = Game.participants.through
+
+PROGRESSION_BATCH_SIZE = 5000
+
+
+class ProgressionConflict(Exception):
+    # 다른 작업자가 같은 승급 작업의 체크포인트를 먼저 옮긴 경우
+    pass
+
+
+# 승급 단계: min_points 가 설정된 레벨을 min_points 순으로 나열
+# 현재 레벨이 단계에 없는 사용자(관리자가 직접 지정한 레벨 등)는 자동 승급하지 않는다.
+def level_ladder():
+    return list(Level.objects.filter(min_points__isnull=False).order_by('min_points', 'level_number', 'id'))
+
+
+# 사용자가 오를 수 있는 가장 높은 레벨
+# 한 단계씩 올라가며 포인트 조건과, 필요한 경우 바로 아래 레벨의 승급전 참가 여부를 확인한다.
+# 경기 결과(승패)는 저장하지 않으므로 승급전은 이기지 않아도 치르기만 하면 조건을 만족한다.
+# 포인트가 줄어도 강등하지 않는다.
+def promoted_level(ladder, position, level_id, points, promotion_levels):
+    index = position.get(level_id)
+    if index is None:
+        return level_id
+    while index + 1 < len(ladder):
+        target = ladder[index + 1]
+        if points < target.min_points:
+            break
+        if target.requires_promotion_match and ladder[index].id not in promotion_levels:
+            break
+        index += 1
+    return ladder[index].id
+
+
+# 레벨 승급 작업 생성 후 실행
+def create_progression_run(batch_size=PROGRESSION_BATCH_SIZE):
+    return run_progression(LevelProgressionRun.objects.create(), batch_size)
+
+
+# 전체 사용자 레벨 승급 (중단된 작업은 체크포인트부터 이어서 실행)
+# user_id 순으로 batch_size 명씩 읽으므로 사용자 수와 관계없이 메모리 사용량이 일정하다.
+# 배치마다 레벨 변경, 승급 알림, 체크포인트 갱신을 한 트랜잭션으로 처리한다.
+def run_progression(run, batch_size=PROGRESSION_BATCH_SIZE):
+    if run.status == 'completed':
+        return run
+
+    ladder = level_ladder()
+    position = {level.id: index for index, level in enumerate(ladder)}
+    # 치러진 승급전 (경기 ID → 경기 레벨). 결과와 관계없이 참가만 확인한다.
+    promotion_games = dict(played_games().filter(promotion_match=True).values_list('game_id', 'level_id'))
+
+    try:
+        while True:
+            rows = list(User.objects.filter(user_id__gt=run.last_user_id).order_by('user_id').values_list(
+                'user_id', 'points', 'level_id',
+            )[:batch_size])
+            if not rows:
+                break
+            _progress_batch(run, rows, ladder, position, promotion_games)
+    except ProgressionConflict:
+        run.refresh_from_db()
+        return run
+
+    run.status = 'completed'
+    run.completion_date = timezone.now()
+    LevelProgressionRun.objects.filter(pk=run.pk).update(status=run.status, completion_date=run.completion_date)
+    return run
+
+
+def _progress_batch(run, rows, ladder, position, promotion_games):
+    # 다음 단계의 포인트 조건을 만족하는 사용자만 승급 후보
+    candidates = [
+        (user_id, points, level_id) for user_id, points, level_id in rows
+        if level_id in position and position[level_id] + 1 < len(ladder)
+        and points >= ladder[position[level_id] + 1].min_points
+    ]
+
+    # 후보들이 참가한 승급전 레벨을 한 번에 조회
+    promotion_levels = defaultdict(set)
+    if promotion_games and candidates:
+        for user_id, game_id in GameParticipant.objects.filter(
+            game_id__in=promotion_games, user_id__in=[user_id for user_id, _, _ in candidates],
+        ).values_list('user_id', 'game_id'):
+            promotion_levels[user_id].add(promotion_games[game_id])
+
+    promotions = defaultdict(list)  # (이전 레벨, 새 레벨) → [user_id]
+    for user_id, points, level_id in candidates:
+        new_level_id = promoted_level(ladder, position, level_id, points, promotion_levels[user_id])
+        if new_level_id != level_id:
+            promotions[level_id, new_level_id].append(user_id)
+
+    levels = {level.id: level for level in ladder}
+    with transaction.atomic():
+        # 체크포인트가 그대로일 때만 진행 (같은 작업을 동시에 실행해도 중복 승급/알림하지 않음)
+        advanced = LevelProgressionRun.objects.filter(pk=run.pk, last_user_id=run.last_user_id).update(
+            last_user_id=rows[-1][0],
+            processed_count=F('processed_count') + len(rows),
+        )
+        if not advanced:
+            raise ProgressionConflict()
+
+        # 읽은 뒤 레벨이 바뀐 사용자(관리자 변경 등)는 건너뛴다.
+        # 아직 이전 레벨인 사용자를 잠가 두고 그 사용자만 바꾸고, 세고, 알린다.
+        promoted = {}
+        for (old_level_id, new_level_id), user_ids in promotions.items():
+            user_ids = list(User.objects.select_for_update().filter(
+                user_id__in=user_ids, level_id=old_level_id,
+            ).values_list('user_id', flat=True))
+            if user_ids:
+                User.objects.filter(user_id__in=user_ids).update(level_id=new_level_id)
+                promoted[old_level_id, new_level_id] = user_ids
+        promotions = promoted
+        promoted_count = sum(len(users) for users in promotions.values())
+        if promoted_count:
+            LevelProgressionRun.objects.filter(pk=run.pk).update(promoted_count=F('promoted_count') + promoted_count)
+
+        notified = defaultdict(list)
+        for (_, new_level_id), user_ids in promotions.items():
+            notified[new_level_id] += user_ids
+        for new_level_id, user_ids in notified.items():
+            level = levels[new_level_id]
+            notify_users(user_ids, f'{level.get_name_display()} 레벨로 승급했습니다.', 'system_notification')
+
+        if promotions:
+            def update_leaderboard():
+                for (_, new_level_id), user_ids in promotions.items():
+                    for user_id in user_ids:
+                        leaderboard.change_level(user_id, new_level_id)
+            transaction.on_commit(update_leaderboard)
+
+    run.last_user_id = rows[-1][0]
+    run.processed_count += len(rows)
+    run.promoted_count += promoted_count
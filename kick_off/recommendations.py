@@ -0,0 +1,209 @@
+import bisect
+import datetime
+import heapq
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Apply, Favorite, Game
+
+
+GameParticipant = Game.participants.through
+
+# 경기 추천 후보 프로세스 내 인덱스
+# 신청 가능한 경기(upcoming, 자리 남음, 시작 전)를 (지역, 성별, 최소 레벨 번호) 버킷으로 나누고,
+# 버킷마다 사용자와 무관한 점수(인기도 + 날짜) 순으로 정렬해 둔다.
+# 사용자별 점수는 버킷 단위 선호도(지역/성별/레벨 차이) + 경기 점수이므로
+# 요청마다 참가 가능한 버킷들의 앞부분만 병합해서 상위 N개를 구한다. (전체 경기를 점수 계산하지 않음)
+# 참가자 수/상태 변경과 경기 생성은 games.game_state_changed() 로 커밋 후 바로 반영하고,
+# 다른 프로세스의 변경은 RECOMMENDATION_REBUILD_SECONDS 마다 전체를 다시 읽어 반영한다.
+# 추천 결과는 응답 직전에 DB 에서 다시 확인하므로 인덱스가 조금 늦어도 마감된 경기는 추천하지 않는다.
+REBUILD_SECONDS = getattr(settings, 'RECOMMENDATION_REBUILD_SECONDS', 300)
+HORIZON_DAYS = 14  # 경기일이 이만큼 늦으면 인기도 1 만큼의 차이
+REGION_WEIGHT = 2.0
+GENDER_WEIGHT = 1.0
+LEVEL_GAP_WEIGHT = 0.25
+HISTORY_LIMIT = 200
+
+_EPOCH = datetime.datetime(2000, 1, 1)
+
+
+def _static_score(game_date, game_time, participant_count, max_participants):
+    # 시간이 지나도 경기 사이의 순서가 바뀌지 않도록 날짜는 고정 기준일로부터의 선형 값으로 반영한다.
+    start_days = (datetime.datetime.combine(game_date, game_time) - _EPOCH).total_seconds() / 86400
+    return participant_count / max_participants - start_days / HORIZON_DAYS
+
+
+class RecommendationIndex:
+    FIELDS = (
+        'game_id', 'region', 'gender', 'level__level_number', 'game_date', 'game_time',
+        'participant_count', 'max_participants',
+    )
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._rebuilding = False
+        # 버킷 목록은 바꿀 때마다 새 목록으로 교체하므로(copy-on-write) 읽는 쪽은 잠금 없이 순회할 수 있다.
+        self._games = {}  # game_id → (버킷, 정렬 키, 시작 시각)
+        self._buckets = {}  # (region, gender, level_number) → [(-점수, game_id)]
+
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    @staticmethod
+    def _open_games():
+        return Game.objects.filter(
+            status='upcoming', game_date__gte=timezone.localdate(), participant_count__lt=F('max_participants'),
+        )
+
+    def load(self):
+        games, buckets = {}, {}
+        for row in self._open_games().values_list(*self.FIELDS).iterator(chunk_size=10000):
+            bucket, key, start = self._entry(*row)
+            games[key[1]] = (bucket, key, start)
+            buckets.setdefault(bucket, []).append(key)
+        for keys in buckets.values():
+            keys.sort()
+        with self._lock:
+            self._games, self._buckets = games, buckets
+            self._loaded_at = time.monotonic()
+
+    # 처음에는 바로 읽고, 오래된 인덱스는 요청을 막지 않도록 백그라운드 스레드에서 다시 읽어 교체한다.
+    def ensure_loaded(self):
+        if self._loaded_at is None:
+            with self._lock:
+                if self._loaded_at is None:
+                    self.load()
+            return
+        if time.monotonic() - self._loaded_at > REBUILD_SECONDS and not self._rebuilding:
+            with self._lock:
+                if self._rebuilding:
+                    return
+                self._rebuilding = True
+            threading.Thread(target=self._rebuild, name='kick_off-recommendations', daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            self.load()
+        finally:
+            self._rebuilding = False
+            connection.close()
+
+    # 변경된 경기만 다시 읽어서 반영 (쿼리 1번)
+    def refresh_games(self, game_ids):
+        if self._loaded_at is None:
+            return
+        game_ids = set(game_ids)
+        rows = list(self._open_games().filter(game_id__in=game_ids).values_list(*self.FIELDS))
+        with self._lock:
+            for game_id in game_ids:
+                entry = self._games.pop(game_id, None)
+                if entry is not None:
+                    keys = list(self._buckets[entry[0]])
+                    index = bisect.bisect_left(keys, entry[1])
+                    if index < len(keys) and keys[index] == entry[1]:
+                        del keys[index]
+                    self._buckets[entry[0]] = keys
+            for row in rows:
+                bucket, key, start = self._entry(*row)
+                self._games[key[1]] = (bucket, key, start)
+                keys = list(self._buckets.get(bucket, ()))
+                bisect.insort(keys, key)
+                self._buckets[bucket] = keys
+
+    @staticmethod
+    def _entry(game_id, region, gender, level_number, game_date, game_time, participant_count, max_participants):
+        key = (-_static_score(game_date, game_time, participant_count, max_participants), game_id)
+        return (region, gender, level_number), key, datetime.datetime.combine(game_date, game_time)
+
+    def buckets(self):
+        return list(self._buckets)
+
+    # 사용자 점수 순 후보 (game_id, 점수) 를 필요한 만큼만 생성. bucket_scores: 버킷 → 선호도 점수
+    def candidates(self, bucket_scores, exclude, now):
+        buckets, games = self._buckets, self._games
+        streams = [_shifted(buckets.get(bucket, ()), bonus) for bucket, bonus in bucket_scores.items()]
+        for negative_score, game_id in heapq.merge(*streams):
+            entry = games.get(game_id)
+            if game_id in exclude or entry is None or entry[2] <= now:
+                continue
+            yield game_id, -negative_score
+
+
+def _shifted(keys, bonus):
+    for negative_score, game_id in keys:
+        yield negative_score - bonus, game_id
+
+
+recommendation_index = RecommendationIndex()
+
+
+# 사용자 선호도: 신청/관심/참가한 경기의 지역·성별 비율 (라플라스 평활화, 기록이 없으면 균등)
+# 이미 신청했거나 참가 중인 경기는 추천에서 제외한다.
+def user_preferences(user_id):
+    applied = list(Apply.objects.filter(user_id=user_id).order_by('-apply_id').values_list(
+        'game_id', 'game__region', 'game__gender',
+    )[:HISTORY_LIMIT])
+    favorites = list(Favorite.objects.filter(user_id=user_id, liked=True).order_by('-id').values_list(
+        'game_id', 'game__region', 'game__gender',
+    )[:HISTORY_LIMIT])
+    joined = list(GameParticipant.objects.filter(user_id=user_id).order_by('-id').values_list(
+        'game_id', 'game__region', 'game__gender',
+    )[:HISTORY_LIMIT])
+
+    history = applied + favorites + joined
+    regions = Counter(region for _, region, _ in history)
+    genders = Counter(gender for _, _, gender in history)
+    region_count, gender_count = len(Game.REGION_CHOICES), len(Game.GENDER_CHOICES)
+    return {
+        'region': {
+            region: (regions[region] + 1) / (len(history) + region_count) for region, _ in Game.REGION_CHOICES
+        },
+        'gender': {
+            gender: (genders[gender] + 1) / (len(history) + gender_count) for gender, _ in Game.GENDER_CHOICES
+        },
+        'exclude': {game_id for game_id, _, _ in applied + joined},
+    }
+
+
+# 사용자에게 추천할 경기 (점수 높은 순)
+# 후보를 limit 개씩 가져와 DB 에서 아직 신청 가능한지 확인하고, 모자라면 다음 후보를 이어서 확인한다.
+def recommend_games(user, limit=10):
+    recommendation_index.ensure_loaded()
+    preferences = user_preferences(user.user_id)
+    user_level = user.level.level_number
+    bucket_scores = {
+        (region, gender, level_number): (
+            REGION_WEIGHT * preferences['region'].get(region, 0)
+            + GENDER_WEIGHT * preferences['gender'].get(gender, 0)
+            - LEVEL_GAP_WEIGHT * (user_level - level_number)
+        )
+        for region, gender, level_number in recommendation_index.buckets()
+        if level_number <= user_level
+    }
+
+    now = timezone.localtime().replace(tzinfo=None)
+    candidates = recommendation_index.candidates(bucket_scores, preferences['exclude'], now)
+    results = []
+    while len(results) < limit:
+        chunk = [candidate for _, candidate in zip(range(limit), candidates)]
+        if not chunk:
+            break
+        games = Game.objects.in_bulk([game_id for game_id, _ in chunk])
+        stale = []
+        for game_id, _ in chunk:
+            game = games.get(game_id)
+            if game is None or game.status != 'upcoming' or game.participant_count >= game.max_participants:
+                stale.append(game_id)
+                continue
+            results.append(game)
+        if stale:
+            recommendation_index.refresh_games(stale)
+    return results[:limit]
@@ -0,0 +1,75 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db import transaction
+from django.db.models import F
+from django.dispatch import receiver
+
+from .catalog import invalidate_mission_catalog
+from .events import publish_notification
+from .games import game_state_changed, sync_participant_count
+from .leaderboard import leaderboard
+from .models import Game, Mission, Notification, User
+
+
+# 미션이 저장/삭제되면 미션 카탈로그 캐시 무효화
+# 커밋 전에 버전을 바꾸면 다른 워커가 이전 데이터를 새 버전으로 캐시할 수 있으므로 커밋 후에 바꾼다.
+@receiver(post_save, sender=Mission)
+@receiver(post_delete, sender=Mission)
+def mission_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_mission_catalog)
+
+
+# 관리자 화면 등에서 participants 를 직접 수정하면 참가자 수 재계산
+@receiver(m2m_changed, sender=Game.participants.through)
+def game_participants_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_participant_count([instance.pk])
+    elif pk_set:
+        sync_participant_count(pk_set)
+
+
+# 읽지 않은 알림 수 관리 (일괄 발송과 읽음 처리는 notifications.py 에서 직접 반영)
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        User.objects.filter(user_id=instance.user_id).update(
+            unread_notification_count=F('unread_notification_count') + 1,
+        )
+    if created:
+        transaction.on_commit(lambda: publish_notification(
+            instance.user_id, instance.content, instance.notification_type, instance.creation_date,
+            notification_id=instance.notification_id,
+        ))
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, origin=None, **kwargs):
+    # 사용자 삭제로 함께 지워지는 알림은 갱신할 필요가 없다.
+    if isinstance(origin, User) and origin.pk == instance.user_id:
+        return
+    if not instance.is_read:
+        User.objects.filter(user_id=instance.user_id).update(
+            unread_notification_count=F('unread_notification_count') - 1,
+        )
+
+
+# 경기 생성/수정을 구독 중인 클라이언트와 추천 인덱스에 반영
+@receiver(post_save, sender=Game)
+def game_saved(sender, instance, **kwargs):
+    game_state_changed([instance.pk])
+
+
+# 같은 프로세스의 리더보드에 사용자 추가/레벨 변경/삭제 반영 (포인트 적립은 포인트 내역으로 반영)
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'points', 'level', 'level_id'} & set(update_fields):
+        return
+    user_id = instance.user_id
+    transaction.on_commit(lambda: leaderboard.refresh_user(user_id))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    user_id = instance.user_id  # 삭제 후에는 instance.user_id 가 None 이 된다.
+    transaction.on_commit(lambda: leaderboard.remove_user(user_id))
@@ -1,3 +1,1760 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import gzip
+import io
+import json
+import random
+import tempfile
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import firebase_admin
+import jwt
+from asgiref.sync import sync_to_async
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed, ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from firebase_admin import credentials
+from firebase_admin.auth import InvalidIdTokenError
+from google.auth.credentials import AnonymousCredentials
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import (
+    batch, benchmark, firebase_auth, leaderboard as leaderboard_module, notifications, payments, progression,
+)
+from .events import broker
+from .exports import export_all, iter_activity
+from .firebase_auth import FirebaseTokenVerifier
+from .games import advance_game_statuses, reserve_seat, validate_participants
+from .leaderboard import Leaderboard
+from .ledger import balance_as_of, record_points
+from .idempotency import IdempotencyStore
+from .middleware import IdempotencyMiddleware, SQLInstrumentationMiddleware, fingerprint
+from .catalog import get_approved_missions, invalidate_mission_catalog
+from .models import (
+    Apply, Favorite, Game, Level, LevelProgressionRun, Mission, Notification, NotificationFanout, Payment,
+    PaymentSettlementRun, Points, User, UserMission, Video,
+)
+from .notifications import create_fanout, run_fanout
+from .otp import OTP_MAX_ATTEMPTS, OTPStore
+from .payments import LocalTransferBackend, create_settlement_run, run_settlement
+from .progression import create_progression_run, run_progression
+from .recommendations import RecommendationIndex, recommend_games
+from .throttling import TokenBucketStore, parse_rate, throttle_store, throttled
+from .waitlist import cancel_participation, process_waitlist
+
+
+def create_level(level_number=0, name='Novice'):
+    return Level.objects.create(name=name, color='#FF0000', whistle=0, level_number=level_number)
+
+
+def create_game(level, max_participants=10, **kwargs):
+    return Game.objects.create(**{
+        'game_name': 'game',
+        'game_date': datetime.date(2030, 1, 1),
+        'game_time': datetime.time(10, 0),
+        'location': 'stadium',
+        'max_participants': max_participants,
+        'region': 'seoul',
+        'gender': 'mixed',
+        'level': level,
+        **kwargs,
+    })
+
+
+def create_users(level, count, prefix='user'):
+    return User.objects.bulk_create(
+        User(name=f'{prefix}{i}', level=level, phone_number=f'{prefix}-{i}') for i in range(count)
+    )
+
+
+class GameListTests(TestCase):
+    def setUp(self):
+        self.novice = create_level()
+        self.pro = create_level(level_number=2, name='Professional')
+        self.games = [
+            create_game(self.novice, game_date=datetime.date(2030, 1, 1 + i // 2), game_time=datetime.time(10 + i % 2))
+            for i in range(5)
+        ]
+        create_game(self.novice, region='busan')
+        create_game(self.pro)
+
+    def test_pages_with_keyset_cursor(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            params = {'region': 'seoul', 'level': 0, 'limit': 2, **({'cursor': cursor} if cursor else {})}
+            response = self.client.get('/api/games/', params)
+            self.assertEqual(response.status_code, 200)
+            seen += [game['game_id'] for game in response.data['results']]
+            pages += 1
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, [game.game_id for game in self.games])
+
+    def test_rejects_invalid_cursor(self):
+        response = self.client.get('/api/games/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ReserveSeatTests(TestCase):
+    def setUp(self):
+        self.level = create_level()
+        self.game = create_game(self.level, max_participants=2)
+        self.users = create_users(self.level, 3)
+
+    def test_last_seat_finishes_game(self):
+        reserve_seat(self.game, self.users[0])
+        reserve_seat(self.game, self.users[1])
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.participant_count, 2)
+        self.assertEqual(self.game.status, 'finished')
+        with self.assertRaises(ValidationError):
+            reserve_seat(self.game, self.users[2])
+        self.assertEqual(self.game.participants.count(), 2)
+
+    def test_duplicate_join_is_rejected(self):
+        reserve_seat(self.game, self.users[0])
+        with self.assertRaises(ValidationError):
+            reserve_seat(self.game, self.users[0])
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.participant_count, 1)
+
+    def test_admin_style_changes_resync_count(self):
+        self.game.participants.add(*self.users[:2])
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.participant_count, 2)
+        self.assertEqual(self.game.status, 'finished')
+
+
+class ValidateParticipantsTests(TestCase):
+    def setUp(self):
+        self.low = create_level(0, 'Novice')
+        self.high = create_level(2, 'Elite')
+        self.game = Game.objects.select_related('level').get(pk=create_game(self.high, max_participants=100).pk)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.game.clean()
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_roster(self):
+        self.game.participants.add(*create_users(self.high, 5, 'small'))
+        small_roster_queries = self.count_queries()
+        self.game.participants.add(*create_users(self.high, 60, 'large'))
+        self.assertEqual(self.count_queries(), small_roster_queries)
+        self.assertEqual(small_roster_queries, 1)
+
+    def test_low_level_participant_is_rejected(self):
+        self.game.participants.add(*create_users(self.high, 3))
+        self.game.participants.add(*create_users(self.low, 1, 'newbie'))
+        with self.assertRaisesMessage(ValidationError, 'newbie0님의 레벨'):
+            self.game.clean()
+
+    def test_over_capacity_is_rejected(self):
+        self.game.max_participants = 2
+        self.game.participants.add(*create_users(self.high, 3))
+        with self.assertRaises(ValidationError):
+            self.game.clean()
+
+    def test_single_joining_user(self):
+        newbie = create_users(self.low, 1, 'newbie')[0]
+        with self.assertRaises(ValidationError):
+            validate_participants(self.game, User.objects.filter(pk=newbie.pk))
+
+    def test_empty_participant_set_is_rejected(self):
+        with self.assertRaisesMessage(ValidationError, '검사할 참가자가 없습니다.'):
+            validate_participants(self.game, User.objects.none())
+
+
+class JoinGameTests(TestCase):
+    def setUp(self):
+        self.novice = create_level(0, 'Novice')
+        self.pro = create_level(2, 'Professional')
+        self.game = create_game(self.pro, max_participants=2)
+        self.client = APIClient()
+
+    # Firebase 로그인 API 로 받은 토큰으로 요청
+    def login(self, firebase_uid):
+        claims = {'uid': firebase_uid, 'phone_number': firebase_uid}
+        with mock.patch('kick_off.views.verify_id_token', return_value=claims):
+            response = self.client.post('/api/auth/phone-login/', {'id_token': 'token'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.data["access"]}')
+        return response.data
+
+    def player(self, level, firebase_uid):
+        return User.objects.create(name=firebase_uid, level=level, phone_number=firebase_uid, firebase_uid=firebase_uid)
+
+    def join(self):
+        return self.client.post(f'/api/games/{self.game.game_id}/join/')
+
+    def test_account_without_player_is_rejected(self):
+        # 선수 정보(player_id)가 없는 토큰은 로그인 계정 pk, 사용자 이름이 같은 선수가 있어도 그 선수로 참가하지 않는다.
+        self.player(self.pro, 'someone-else')
+        account = get_user_model().objects.create(username='someone-else')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(account)}')
+
+        self.assertEqual(self.join().status_code, 404)
+        self.assertFalse(self.game.participants.exists())
+
+    def test_low_level_player_is_rejected(self):
+        self.player(self.novice, 'newbie')
+        self.login('newbie')
+
+        response = self.join()
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('newbie님의 레벨', response.data['error'])
+        self.assertFalse(self.game.participants.exists())
+
+    def test_seats_the_logged_in_player(self):
+        bystander = self.player(self.pro, 'bystander')  # 로그인 계정과 pk 가 같을 수 있는 다른 선수
+        players = [self.player(self.pro, f'player{i}') for i in range(3)]
+
+        self.login('player0')
+        self.assertEqual(self.join().status_code, 200)
+        self.assertEqual(self.join().status_code, 409)  # 중복 참가
+        self.login('player1')
+        self.assertEqual(self.join().status_code, 200)
+        self.login('player2')
+        self.assertEqual(self.join().status_code, 409)  # 정원 초과
+
+        self.game.refresh_from_db()
+        self.assertEqual(list(self.game.participants.order_by('user_id')), players[:2])
+        self.assertNotIn(bystander, self.game.participants.all())
+        self.assertEqual((self.game.participant_count, self.game.status), (2, 'finished'))
+
+    def test_refreshed_token_keeps_player(self):
+        player = self.player(self.pro, 'player0')
+        tokens = self.login('player0')
+
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.data["access"]}')
+        self.assertEqual(self.join().status_code, 200)
+        self.assertEqual(list(self.game.participants.all()), [player])
+
+
+class ConcurrentReserveSeatTests(TransactionTestCase):
+    max_participants = 10
+    concurrent_joins = 200
+
+    def test_concurrent_joins_never_overbook(self):
+        level = create_level()
+        game = create_game(level, max_participants=self.max_participants)
+        users = create_users(level, self.concurrent_joins)
+
+        barrier = threading.Barrier(self.concurrent_joins)
+        results = []
+
+        def join(user):
+            try:
+                barrier.wait()
+                reserve_seat(game, user)
+                results.append(True)
+            except ValidationError:
+                results.append(False)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=join, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        game.refresh_from_db()
+        self.assertEqual(len(results), self.concurrent_joins)
+        self.assertEqual(results.count(True), self.max_participants)
+        self.assertEqual(game.participant_count, self.max_participants)
+        self.assertEqual(game.participants.count(), self.max_participants)
+        self.assertEqual(game.status, 'finished')
+
+
+class PointsLedgerTests(TestCase):
+    def setUp(self):
+        self.user = create_users(create_level(), 1)[0]
+
+    def test_record_points_appends_entry_with_balance(self):
+        record_points(self.user.user_id, 30)
+        entry = record_points(self.user.user_id, -10)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.points, 20)
+        self.assertEqual((entry.points_log, entry.points_amount, entry.total_points), ('deducted', -10, 20))
+
+    def test_balance_as_of(self):
+        before = timezone.now()
+        record_points(self.user.user_id, 30)
+        self.assertEqual(balance_as_of(self.user.user_id, before), 0)
+        self.assertEqual(balance_as_of(self.user.user_id, timezone.now()), 30)
+
+    def test_reconcile_fixes_drift(self):
+        record_points(self.user.user_id, 30)
+        User.objects.filter(pk=self.user.pk).update(points=50)
+
+        out = io.StringIO()
+        call_command('reconcile_points', '--fix', '--chunk-size', '1', stdout=out)
+        self.assertIn('mismatched=1 fixed=1', out.getvalue())
+        self.assertEqual(Points.objects.filter(user=self.user).latest('points_id').points_amount, 20)
+
+        out = io.StringIO()
+        call_command('reconcile_points', stdout=out)
+        self.assertIn('mismatched=0', out.getvalue())
+
+
+class ConcurrentPointsTests(TransactionTestCase):
+    def test_concurrent_awards_are_not_lost(self):
+        user = create_users(create_level(), 1)[0]
+        awards = 50
+        barrier = threading.Barrier(awards)
+
+        def award():
+            try:
+                barrier.wait()
+                record_points(user.user_id, 1)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=award) for _ in range(awards)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        user.refresh_from_db()
+        self.assertEqual(user.points, awards)
+        self.assertEqual(
+            sorted(Points.objects.filter(user=user).values_list('total_points', flat=True)),
+            list(range(1, awards + 1)),
+        )
+
+
+def create_signing_key():
+    # 테스트용 RSA 키와 자체 서명 인증서 (Google 인증서 대신 사용)
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'test')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+    return private_key, certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.levels = [create_level(level_number=i, name=name) for i, name in enumerate(['Novice', 'Rookie'])]
+        self.board = Leaderboard()
+
+    def expected_rank(self, user, level=None):
+        users = User.objects.filter(level=level) if level else User.objects.all()
+        return users.filter(points__gt=user.points).count() + 1
+
+    def expected_top(self, limit, level=None):
+        users = User.objects.filter(level=level) if level else User.objects.all()
+        return [
+            (self.expected_rank(user, level), user.user_id, user.points)
+            for user in users.order_by('-points', 'user_id')[:limit]
+        ]
+
+    def test_ranks_and_top_match_database(self):
+        users = create_users(self.levels[0], 4) + create_users(self.levels[1], 3, prefix='rookie')
+        for user, points in zip(users, [50, 10, 50, 0, 70, 10, 30]):
+            record_points(user.user_id, points) if points else None
+
+        self.assertEqual(self.board.top(5), self.expected_top(5))
+        self.assertEqual(self.board.top(5, self.levels[1].id), self.expected_top(5, self.levels[1]))
+        for user in User.objects.all():
+            rank = self.board.rank(user.user_id)
+            self.assertEqual(rank['rank'], self.expected_rank(user))
+            self.assertEqual(rank['level_rank'], self.expected_rank(user, user.level))
+            self.assertEqual((rank['total'], rank['level_total']), (7, 4 if user.level == self.levels[0] else 3))
+
+    def test_follows_ledger_new_users_and_deletions(self):
+        first, second = create_users(self.levels[0], 2)
+        self.assertEqual(self.board.rank(second.user_id)['rank'], 1)
+
+        record_points(second.user_id, 20)
+        newcomer = User.objects.create(name='new', level=self.levels[1], phone_number='new', points=5)
+        self.assertEqual(self.board.top(3), [(1, second.user_id, 20), (2, newcomer.user_id, 5), (3, first.user_id, 0)])
+
+        # 다른 프로세스에서 적립해도 포인트 내역으로 반영된다.
+        Points.objects.create(user=first, points_log='earned', points_amount=100, total_points=100)
+        self.assertEqual(self.board.rank(first.user_id)['rank'], 1)
+
+        second_id = second.user_id
+        second.delete()
+        self.board.remove_user(second_id)
+        self.assertIsNone(self.board.rank(second_id))
+        self.assertEqual(self.board.rank(newcomer.user_id)['total'], 2)
+
+    def test_late_committed_lower_points_id_is_picked_up(self):
+        first, second = create_users(self.levels[0], 2)
+        self.board.rank(first.user_id)
+        last_id = Points.objects.order_by('-points_id').values_list('points_id', flat=True).first() or 0
+
+        # 두 트랜잭션이 ID 를 차례로 받았지만 큰 ID 가 먼저 커밋된 경우
+        Points.objects.create(
+            points_id=last_id + 2, user=first, points_log='earned', points_amount=10, total_points=10,
+        )
+        self.assertEqual(self.board.top(2), [(1, first.user_id, 10), (2, second.user_id, 0)])
+        Points.objects.create(
+            points_id=last_id + 1, user=second, points_log='earned', points_amount=30, total_points=30,
+        )
+        self.assertEqual(self.board.top(2), [(1, second.user_id, 30), (2, first.user_id, 10)])
+
+        # 끝내 나타나지 않는 빈 번호(롤백)는 일정 시간 뒤 더 찾지 않는다.
+        Points.objects.create(points_id=last_id + 4, user=first, points_log='earned', points_amount=5, total_points=15)
+        self.board.rank(first.user_id)
+        self.assertIn(last_id + 3, self.board._board.gaps)
+        with mock.patch.object(leaderboard_module, 'GAP_SECONDS', 0):
+            self.board.rank(first.user_id)
+        self.assertEqual(self.board._board.gaps, {})
+
+    def test_random_updates_with_small_top_list(self):
+        rng = random.Random(0)
+        users = create_users(self.levels[0], 30) + create_users(self.levels[1], 30, prefix='rookie')
+        for user in users:
+            record_points(user.user_id, rng.randrange(1, 50))
+
+        # PENDING_VALUES 가 작으면 새 포인트 값이 나올 때 펜윅 트리를 자주 다시 만든다.
+        with mock.patch.object(leaderboard_module, 'TOP_SIZE', 3), \
+                mock.patch.object(leaderboard_module, 'PENDING_VALUES', 4):
+            self.board.rebuild()
+            for _ in range(200):
+                record_points(rng.choice(users).user_id, rng.randrange(-60, 80))
+                if rng.random() < 0.2:
+                    self.assertEqual(self.board.top(3), self.expected_top(3))
+                    self.assertEqual(self.board.top(3, self.levels[1].id), self.expected_top(3, self.levels[1]))
+            for user in User.objects.all():
+                self.assertEqual(self.board.rank(user.user_id)['rank'], self.expected_rank(user))
+
+    def test_index_size_follows_distinct_values_not_their_range(self):
+        low, high = create_users(self.levels[0], 2)
+        record_points(low.user_id, 1)
+        self.board.rank(low.user_id)
+        Points.objects.create(user=high, points_log='earned', points_amount=2 ** 31 - 2, total_points=2 ** 31 - 1)
+
+        self.assertEqual(self.board.rank(high.user_id)['rank'], 1)
+        self.assertEqual(self.board.rank(low.user_id)['rank'], 2)
+        for scope in self.board._board.scopes.values():
+            self.assertLessEqual(scope.counts.fenwick.size + len(scope.counts.pending), 3)
+
+    def test_rebuild_runs_off_the_request_path(self):
+        user = create_users(self.levels[0], 1)[0]
+        self.board.rank(user.user_id)
+        old_board = self.board._board
+        old_board.stale = True
+
+        with mock.patch.object(leaderboard_module.threading, 'Thread') as thread:
+            # 새 스냅샷은 백그라운드 스레드가 만들고, 이 요청은 변경 로그만 읽어서 지금 스냅샷으로 응답한다.
+            with self.assertNumQueries(2):
+                self.assertEqual(self.board.rank(user.user_id)['rank'], 1)
+            self.assertIs(self.board._board, old_board)
+            # 다른 요청이 변경 로그를 반영하는 중이면 DB 를 읽지 않고 바로 응답한다.
+            with self.board._sync_lock, self.assertNumQueries(0):
+                self.assertEqual(self.board.top(1), [(1, user.user_id, 0)])
+        thread.assert_called_once()
+
+        with mock.patch.object(leaderboard_module.connection, 'close'):
+            thread.call_args.kwargs['target']()
+        self.assertIsNot(self.board._board, old_board)
+        self.assertFalse(self.board._rebuilding)
+
+    def test_add_points_is_bounded(self):
+        user = create_users(self.levels[0], 1)[0]
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+        response = client.post(f'/api/points/{user.user_id}/add/', {'points': 5000000}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Points.objects.filter(user=user).exists())
+
+    def test_leaderboard_api(self):
+        user = create_users(self.levels[0], 1)[0]
+        record_points(user.user_id, 10)
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+        with mock.patch('kick_off.views.leaderboard', self.board):
+            top = client.get('/api/leaderboard/', {'level_id': self.levels[0].id})
+            rank = client.get(f'/api/leaderboard/users/{user.user_id}/')
+            missing = client.get('/api/leaderboard/users/999999/')
+
+        self.assertEqual(top.data, [{'rank': 1, 'user_id': user.user_id, 'name': user.name, 'points': 10}])
+        self.assertEqual((rank.data['rank'], rank.data['points']), (1, 10))
+        self.assertEqual(missing.status_code, 404)
+
+
+class _TestCredential(credentials.Base):
+    def get_credential(self):
+        return AnonymousCredentials()
+
+
+class FirebaseTokenVerifierTests(SimpleTestCase):
+    project_id = 'kickoff-test'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key, cls.certificate = create_signing_key()
+
+    def setUp(self):
+        # Google 인증서 대신 로컬 키로 서명한 토큰을 firebase_admin 으로 검증 (네트워크 없음)
+        app = firebase_admin.initialize_app(_TestCredential(), {'projectId': self.project_id}, name='kick_off-test')
+        self.addCleanup(firebase_admin.delete_app, app)
+        patcher = mock.patch('google.oauth2.id_token._fetch_certs', return_value={'test-kid': self.certificate})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.verifier = FirebaseTokenVerifier(app=app, cache_size=2)
+
+    def create_token(self, uid='uid-1', expires_in=3600, issued_in=0):
+        now = int(time.time())
+        return jwt.encode({
+            'iss': f'https://securetoken.google.com/{self.project_id}',
+            'aud': self.project_id,
+            'sub': uid,
+            'iat': now + issued_in,
+            'exp': now + expires_in,
+            'phone_number': '+821012345678',
+        }, self.private_key, algorithm='RS256', headers={'kid': 'test-kid'})
+
+    def test_verified_claims_are_cached(self):
+        token = self.create_token()
+        self.assertEqual(self.verifier.verify(token)['uid'], 'uid-1')
+
+        with mock.patch('kick_off.firebase_auth.auth.verify_id_token') as verify_id_token:
+            claims = self.verifier.verify(token)
+        verify_id_token.assert_not_called()
+        self.assertEqual(claims['phone_number'], '+821012345678')
+
+    def test_cache_is_bounded(self):
+        for i in range(5):
+            self.verifier.verify(self.create_token(uid=f'uid-{i}'))
+        self.assertEqual(len(self.verifier._claims), 2)
+
+    def test_invalid_tokens_are_rejected(self):
+        with self.assertRaises(InvalidIdTokenError):
+            self.verifier.verify(self.create_token(expires_in=-10))
+        with self.assertRaises(InvalidIdTokenError):
+            self.verifier.verify(self.create_token(issued_in=600))  # 미래에 발급된 토큰
+        with self.assertRaises(InvalidIdTokenError):
+            self.verifier.verify(self.create_token() + 'x')
+        other_key, _ = create_signing_key()
+        forged = jwt.encode({'sub': 'uid-1'}, other_key, algorithm='RS256', headers={'kid': 'unknown'})
+        with self.assertRaises(InvalidIdTokenError):
+            self.verifier.verify(forged)
+        with self.assertRaises(InvalidIdTokenError):
+            self.verifier.verify('')
+
+
+class AsyncViewsTests(TestCase):
+    def setUp(self):
+        self.user = create_users(create_level(), 1)[0]
+        auth_user = get_user_model().objects.create(username='tester')
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(auth_user)}'}
+
+    async def test_profile_matches_sync_view(self):
+        path = f'users/{self.user.user_id}/'
+        expected = (await self.async_client.get(f'/api/{path}', headers=self.headers)).json()
+
+        response = await self.async_client.get(f'/api/async/{path}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(f'/api/async/users/{self.user.user_id}/')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_phone_login_runs_verification_in_executor(self):
+        claims = {'uid': 'uid-1', 'phone_number': self.user.phone_number}
+        await User.objects.filter(pk=self.user.pk).aupdate(firebase_uid='uid-1')
+        with mock.patch('kick_off.firebase_auth.verify_id_token', return_value=claims):
+            response = await self.async_client.post(
+                '/api/async/auth/phone-login/', {'id_token': 'token'},
+                content_type='application/json',
+            )
+        self.assertEqual(response.json()['message'], 'Login successful')
+        self.assertEqual(AccessToken(response.json()['access'])['player_id'], self.user.user_id)
+
+
+class NotificationFanoutTests(TestCase):
+    def setUp(self):
+        level = create_level()
+        self.game = create_game(level, max_participants=100)
+        self.users = create_users(level, 10)
+        self.game.participants.add(*self.users[:6])
+        # 참가자이면서 신청자인 사용자(4, 5)는 한 번만 받아야 한다.
+        Apply.objects.bulk_create(
+            Apply(user=user, game=self.game, apply_status='Pending') for user in self.users[4:9]
+        )
+        Apply.objects.create(user=self.users[9], game=self.game, apply_status='Rejected')
+
+    def test_game_fanout_deduplicates_recipients(self):
+        fanout = create_fanout('cancelled', 'game_notification', game=self.game, batch_size=3)
+
+        self.assertEqual((fanout.status, fanout.sent_count), ('completed', 9))
+        self.assertEqual(
+            sorted(Notification.objects.values_list('user_id', flat=True)),
+            [user.user_id for user in self.users[:9]],
+        )
+
+    def test_interrupted_fanout_resumes_without_duplicates(self):
+        fanout = NotificationFanout.objects.create(
+            game=self.game, audience='participants', content='hi', notification_type='game_notification',
+        )
+        insert_notifications = notifications._insert_notifications
+
+        def interrupt_second_batch(*args):
+            if flaky.call_count == 2:
+                raise RuntimeError('interrupted')
+            return insert_notifications(*args)
+
+        with mock.patch.object(notifications, '_insert_notifications', side_effect=interrupt_second_batch) as flaky:
+            with self.assertRaises(RuntimeError):
+                run_fanout(fanout, batch_size=2)
+
+        fanout = NotificationFanout.objects.get(pk=fanout.pk)
+        self.assertEqual(fanout.sent_count, 2)
+        self.assertEqual(Notification.objects.count(), 2)
+
+        out = io.StringIO()
+        call_command('fanout_notifications', '--resume', stdout=out)
+        self.assertIn('status=completed sent=6', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 6)
+        self.assertEqual(Notification.objects.values('user').distinct().count(), 6)
+
+    def test_subscribers_receive_notification_ids(self):
+        subscribed = {f'user:{user.user_id}' for user in self.users[:2]}
+        # 두 번째 실행: bulk_create 가 ID 를 돌려주지 않는 데이터베이스(MySQL)
+        for returns_ids in (True, False):
+            with self.subTest(returns_ids=returns_ids), \
+                    mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', returns_ids), \
+                    mock.patch.object(notifications.broker, 'has_subscribers', side_effect=subscribed.__contains__), \
+                    mock.patch.object(notifications, 'publish_notification') as publish:
+                with self.captureOnCommitCallbacks(execute=True):
+                    create_fanout(f'hi {returns_ids}', 'game_notification', game=self.game, batch_size=4)
+
+                published = {call.args[0]: call.kwargs['notification_id'] for call in publish.call_args_list}
+                stored = dict(Notification.objects.filter(content=f'hi {returns_ids}').values_list(
+                    'user_id', 'notification_id',
+                ))
+                self.assertEqual(published, {user.user_id: stored[user.user_id] for user in self.users[:2]})
+
+
+class NotificationInboxTests(TestCase):
+    def setUp(self):
+        self.user, self.other = create_users(create_level(), 2)
+        for i in range(7):
+            Notification.objects.create(user=self.user, content=f'n{i}', notification_type='other')
+        Notification.objects.create(user=self.other, content='other', notification_type='other')
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+    def unread_count(self):
+        response = self.client.get(f'/api/notifications/{self.user.user_id}/unread-count/')
+        return response.data['unread_count']
+
+    def test_inbox_pages_newest_first(self):
+        contents, cursor = [], None
+        while True:
+            response = self.client.get(
+                f'/api/notifications/{self.user.user_id}/inbox/', {'limit': 3, **({'cursor': cursor} if cursor else {})},
+            )
+            contents += [n['content'] for n in response.data['results']]
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(contents, [f'n{i}' for i in reversed(range(7))])
+
+    def test_unread_count_follows_mark_read(self):
+        self.assertEqual(self.unread_count(), 7)
+        ids = list(Notification.objects.filter(user=self.user).values_list('notification_id', flat=True)[:2])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                f'/api/notifications/{self.user.user_id}/mark-read/', {'notification_ids': ids}, format='json',
+            )
+        self.assertEqual(response.data['updated'], 2)
+        notification_queries = [q['sql'] for q in queries if 'kick_off_notification' in q['sql']]
+        self.assertEqual(len(notification_queries), 1)
+        self.assertTrue(notification_queries[0].startswith('UPDATE'))
+        self.assertEqual(self.unread_count(), 5)
+
+        self.client.post(f'/api/notifications/{ids[0]}/read/')
+        self.assertEqual(self.unread_count(), 5)
+
+        self.client.post(f'/api/notifications/{self.user.user_id}/mark-read/', format='json')
+        self.assertEqual(self.unread_count(), 0)
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.unread_notification_count, 1)
+
+    def test_unread_filter_and_fanout_update_counter(self):
+        game = create_game(self.user.level)
+        game.participants.add(self.user)
+        create_fanout('game update', 'game_notification', game=game)
+        self.assertEqual(self.unread_count(), 8)
+
+        response = self.client.get(f'/api/notifications/{self.user.user_id}/inbox/', {'unread': 1, 'limit': 100})
+        self.assertEqual(len(response.data['results']), 8)
+
+
+class EventStreamTests(TransactionTestCase):
+    def setUp(self):
+        level = create_level()
+        self.user = create_users(level, 1)[0]
+        self.game = create_game(level, max_participants=5)
+        auth_user = get_user_model().objects.create(username='tester')
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(auth_user)}'}
+
+    async def open_stream(self, **params):
+        response = await self.async_client.get('/api/events/', params, headers=self.headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 3000\n\n')
+        return chunks
+
+    async def disconnect(self, chunks):
+        # 클라이언트 연결이 끊기면 ASGI 핸들러가 스트림 태스크를 취소한다.
+        pending = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+
+    async def test_new_notification_is_pushed(self):
+        chunks = await self.open_stream(user_id=self.user.user_id)
+        await Notification.objects.acreate(user=self.user, content='hello', notification_type='other')
+
+        chunk = await asyncio.wait_for(anext(chunks), 5)
+        self.assertTrue(chunk.startswith(b'event: notification\n'))
+        self.assertIn(b'"content": "hello"', chunk)
+
+        await self.disconnect(chunks)
+        self.assertFalse(broker.has_subscribers(f'user:{self.user.user_id}'))
+
+    async def test_game_occupancy_is_pushed(self):
+        chunks = await self.open_stream(game_id=self.game.game_id)
+        await sync_to_async(reserve_seat)(self.game, self.user)
+
+        chunk = await asyncio.wait_for(anext(chunks), 5)
+        self.assertTrue(chunk.startswith(b'event: game\n'))
+        self.assertIn(b'"participant_count": 1', chunk)
+        await self.disconnect(chunks)
+
+
+class AdvanceGameStatusesTests(TestCase):
+    def test_advances_by_start_and_end_time(self):
+        level = create_level()
+        now = timezone.make_aware(datetime.datetime(2030, 1, 2, 12, 0))
+
+        def game(status, day, hour):
+            return create_game(level, status=status, game_date=datetime.date(2030, 1, day),
+                               game_time=datetime.time(hour, 0)).game_id
+
+        games = {
+            'later': game('upcoming', 2, 13),
+            'started': game('upcoming', 2, 11),
+            'full_started': game('finished', 2, 12),
+            'ended': game('upcoming', 2, 9),
+            'running_ended': game('in-progress', 1, 20),
+            'cancelled': game('cancelled', 1, 9),
+        }
+
+        with self.assertNumQueries(2):
+            result = advance_game_statuses(now)
+
+        self.assertEqual(result, {'started': 2, 'finished': 2})
+        statuses = dict(Game.objects.values_list('game_id', 'status'))
+        self.assertEqual({name: statuses[game_id] for name, game_id in games.items()}, {
+            'later': 'upcoming',
+            'started': 'in-progress',
+            'full_started': 'in-progress',
+            'ended': 'finished',
+            'running_ended': 'finished',
+            'cancelled': 'cancelled',
+        })
+        self.assertEqual(advance_game_statuses(now), {'started': 0, 'finished': 0})
+
+
+class LevelProgressionTests(TestCase):
+    def setUp(self):
+        self.novice = Level.objects.create(name='Novice', color='#FF0000', whistle=0, level_number=0, min_points=0)
+        self.rookie = Level.objects.create(name='Rookie', color='#000080', whistle=0, level_number=1, min_points=100)
+        self.pro = Level.objects.create(
+            name='Professional', color='#FB36FF', whistle=0, level_number=2, min_points=300,
+            requires_promotion_match=True,
+        )
+        self.unranked = create_level(level_number=3, name='Elite')  # min_points 없음: 자동 승급 대상 아님
+
+        def user(name, points, level=self.novice):
+            return User.objects.create(name=name, level=level, phone_number=name, points=points)
+
+        self.users = {
+            'stays': user('stays', 50),
+            'rookie': user('rookie', 150),
+            'no_match': user('no_match', 500),
+            'pro': user('pro', 500),
+            'unranked': user('unranked', 900, self.unranked),
+        }
+        match = create_game(self.rookie, promotion_match=True, game_date=datetime.date(2000, 1, 1))
+        match.participants.add(self.users['pro'])
+
+    def levels(self):
+        return {user.name: user.level.name for user in User.objects.select_related('level')}
+
+    def test_promotes_by_points_and_promotion_match(self):
+        run = create_progression_run(batch_size=2)
+
+        self.assertEqual((run.status, run.processed_count, run.promoted_count), ('completed', 5, 3))
+        self.assertEqual(self.levels(), {
+            'stays': 'Novice', 'rookie': 'Rookie', 'no_match': 'Rookie', 'pro': 'Professional', 'unranked': 'Elite',
+        })
+        notifications = Notification.objects.filter(notification_type='system_notification')
+        self.assertEqual(
+            sorted(notifications.values_list('user__name', 'content')),
+            [('no_match', '루키 레벨로 승급했습니다.'), ('pro', '프로페셜 레벨로 승급했습니다.'),
+             ('rookie', '루키 레벨로 승급했습니다.')],
+        )
+        self.assertEqual(User.objects.get(name='pro').unread_notification_count, 1)
+
+    def test_resumes_from_checkpoint(self):
+        run = LevelProgressionRun.objects.create()
+        send_batch = progression._progress_batch
+        calls = []
+
+        def fail_second_batch(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError('interrupted')
+            return send_batch(*args)
+
+        with mock.patch.object(progression, '_progress_batch', fail_second_batch):
+            with self.assertRaises(RuntimeError):
+                run_progression(run, batch_size=2)
+
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.last_user_id), ('running', self.users['rookie'].user_id))
+
+        run = run_progression(run, batch_size=2)
+        self.assertEqual((run.status, run.processed_count, run.promoted_count), ('completed', 5, 3))
+        self.assertEqual(Notification.objects.filter(notification_type='system_notification').count(), 3)
+
+    def test_skips_users_whose_level_changed_after_read(self):
+        send_batch = progression._progress_batch
+
+        def change_level_first(run, rows, *args):
+            # 배치를 읽은 뒤 관리자가 레벨을 바꾼 경우
+            User.objects.filter(pk=self.users['rookie'].pk).update(level=self.unranked)
+            return send_batch(run, rows, *args)
+
+        with mock.patch.object(progression, '_progress_batch', change_level_first), \
+                mock.patch.object(progression.leaderboard, 'change_level') as change_level:
+            with self.captureOnCommitCallbacks(execute=True):
+                run = create_progression_run(batch_size=5)
+
+        self.assertEqual((run.processed_count, run.promoted_count), (5, 2))
+        run.refresh_from_db()
+        self.assertEqual(run.promoted_count, 2)
+        self.assertEqual(self.levels()['rookie'], 'Elite')
+        notifications = Notification.objects.filter(notification_type='system_notification')
+        self.assertEqual(sorted(notifications.values_list('user__name', flat=True)), ['no_match', 'pro'])
+        self.assertNotIn(self.users['rookie'].user_id, [call.args[0] for call in change_level.call_args_list])
+
+
+class PaymentSettlementTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(name='payer', level=create_level(), phone_number='payer')
+
+    def pay(self, amount, payment_status='Pending'):
+        return Payment.objects.create(
+            user=self.user, amount=amount, payment_status=payment_status, payment_method='Bank Transfer',
+        )
+
+    def statuses(self):
+        return dict(Payment.objects.values_list('payment_id', 'payment_status'))
+
+    def test_settles_pending_payments_in_batches(self):
+        paid, empty, other = self.pay(1000), self.pay(0), self.pay(500)
+        refunded = self.pay(300, 'Refunded')
+
+        run, report = create_settlement_run(batch_size=2, backend=LocalTransferBackend())
+
+        self.assertEqual(
+            (run.status, run.processed_count, run.completed_count, run.failed_count, run.error_count),
+            ('completed', 3, 2, 1, 0),
+        )
+        self.assertEqual(
+            {key: report[key] for key in ('processed', 'completed', 'failed', 'errors', 'batches')},
+            {'processed': 3, 'completed': 2, 'failed': 1, 'errors': 0, 'batches': 2},
+        )
+        self.assertEqual(self.statuses(), {
+            paid.payment_id: 'Completed', empty.payment_id: 'Failed', other.payment_id: 'Completed',
+            refunded.payment_id: 'Refunded',
+        })
+
+    def test_transfer_error_leaves_payments_pending(self):
+        payment = self.pay(1000)
+        backend = mock.Mock()
+        backend.transfer.side_effect = ConnectionError('bank unavailable')
+
+        with self.assertLogs('kick_off.payments', 'ERROR'):
+            run, report = create_settlement_run(backend=backend)
+
+        self.assertEqual((run.status, run.processed_count, run.error_count, report['errors']), ('completed', 1, 1, 1))
+        self.assertEqual(self.statuses(), {payment.payment_id: 'Pending'})
+
+        # 다음 정산 작업에서 다시 시도
+        run, _ = create_settlement_run(backend=LocalTransferBackend())
+        self.assertEqual((run.completed_count, self.statuses()), (1, {payment.payment_id: 'Completed'}))
+
+    def test_excludes_payments_after_cutoff(self):
+        run = PaymentSettlementRun.objects.create(cutoff_date=timezone.now() - datetime.timedelta(minutes=1))
+        payment = self.pay(1000)
+
+        run, report = run_settlement(run, backend=LocalTransferBackend())
+
+        self.assertEqual((run.status, report['processed']), ('completed', 0))
+        self.assertEqual(self.statuses(), {payment.payment_id: 'Pending'})
+
+    def test_keeps_status_changed_during_transfer(self):
+        refunded, paid = self.pay(1000), self.pay(1000)
+
+        class RefundingBackend(LocalTransferBackend):
+            def transfer(self, batch):
+                Payment.objects.filter(pk=refunded.pk).update(payment_status='Refunded')
+                return super().transfer(batch)
+
+        run, _ = create_settlement_run(backend=RefundingBackend())
+
+        self.assertEqual((run.processed_count, run.completed_count), (2, 1))
+        self.assertEqual(self.statuses(), {refunded.payment_id: 'Refunded', paid.payment_id: 'Completed'})
+
+    def test_resumes_from_checkpoint(self):
+        created = [self.pay(100) for _ in range(5)]
+        run = PaymentSettlementRun.objects.create(cutoff_date=timezone.now())
+        settle_batch = payments._settle_batch
+        calls = []
+
+        def fail_second_batch(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError('interrupted')
+            return settle_batch(*args)
+
+        with mock.patch.object(payments, '_settle_batch', fail_second_batch):
+            with self.assertRaises(RuntimeError):
+                run_settlement(run, batch_size=2, backend=LocalTransferBackend())
+
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.last_payment_id), ('running', created[3].payment_id))
+
+        run, _ = run_settlement(run, batch_size=2, backend=LocalTransferBackend())
+        self.assertEqual((run.status, run.processed_count, run.completed_count), ('completed', 3, 3))
+        # 맡았지만 반영하지 못한 배치는 Pending 으로 남아서 다음 정산 작업의 대상이 된다.
+        self.assertEqual(list(Payment.objects.filter(payment_status='Pending')), created[2:4])
+
+    def test_stale_run_does_not_settle_twice(self):
+        self.pay(100)
+        run = PaymentSettlementRun.objects.create(cutoff_date=timezone.now())
+        stale = PaymentSettlementRun.objects.get(pk=run.pk)
+        backend = mock.Mock()
+        backend.transfer.return_value = {}  # 결과 없음: 결제가 Pending 으로 남아서 stale 작업도 같은 결제를 찾는다.
+
+        run_settlement(run, backend=backend)
+        stale, report = run_settlement(stale, backend=backend)
+
+        self.assertEqual(backend.transfer.call_count, 1)
+        self.assertEqual((stale.status, stale.processed_count, report['processed']), ('completed', 1, 0))
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        self.level = create_level(level_number=1, name='Rookie')
+        self.game = create_game(self.level, max_participants=3)
+
+    def apply(self, users, **kwargs):
+        return [Apply.objects.create(user=user, game=self.game, apply_status='Pending', **kwargs) for user in users]
+
+    def statuses(self):
+        return dict(Apply.objects.filter(game=self.game).values_list('user__name', 'apply_status'))
+
+    def test_accepts_in_priority_then_fifo_order(self):
+        users = create_users(self.level, 5)
+        self.apply(users[:4])
+        self.apply(users[4:], priority=1)
+
+        result = process_waitlist(self.game)
+
+        self.assertEqual(result, {'accepted': 3, 'rejected': 0, 'seated': 3})
+        self.assertEqual(set(self.game.participants.values_list('name', flat=True)), {'user4', 'user0', 'user1'})
+        self.assertEqual(self.statuses()['user2'], 'Pending')
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.participant_count, self.game.status), (3, 'finished'))
+
+    def test_rejects_ineligible_and_skips_already_seated(self):
+        low = create_users(create_level(level_number=0), 1, prefix='low')
+        users = create_users(self.level, 3)
+        reserve_seat(self.game, users[0])
+        self.apply(low + users)
+
+        result = process_waitlist(self.game)
+
+        self.assertEqual(result, {'accepted': 3, 'rejected': 1, 'seated': 2})
+        self.assertEqual(self.statuses()['low0'], 'Rejected')
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.participant_count, 3)
+
+    def test_cancelling_participant_promotes_next_applicant(self):
+        users = create_users(self.level, 4)
+        self.apply(users)
+        process_waitlist(self.game)
+
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create(username='tester'))
+        response = client.post(f'/api/applies/{users[0].user_id}/cancel/{self.game.game_id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(self.game.participants.values_list('name', flat=True)), {'user1', 'user2', 'user3'})
+        self.assertEqual(self.statuses(), {'user1': 'Accepted', 'user2': 'Accepted', 'user3': 'Accepted'})
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.participant_count, self.game.status), (3, 'finished'))
+
+    def test_cancel_participation_reopens_full_upcoming_game(self):
+        users = create_users(self.level, 4)
+        self.apply(users)
+        process_waitlist(self.game)
+
+        result = cancel_participation(self.game, users[1])
+
+        self.assertEqual(result, {'accepted': 1, 'rejected': 0, 'seated': 1})
+        self.assertEqual(set(self.game.participants.values_list('name', flat=True)), {'user0', 'user2', 'user3'})
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.participant_count, self.game.status), (3, 'finished'))
+        with self.assertRaises(ValidationError):
+            cancel_participation(self.game, users[1])
+
+    def test_cancel_participation_keeps_started_game_finished(self):
+        # 오늘 이미 치른 경기 (상태 변경 작업이 finished 로 바꾼 뒤)
+        started = timezone.localtime() - datetime.timedelta(hours=3)
+        game = create_game(self.level, max_participants=1, game_date=started.date(), game_time=started.time())
+        users = create_users(self.level, 2)
+        reserve_seat(game, users[0])
+        Game.objects.filter(pk=game.pk).update(status='finished')
+        Apply.objects.create(user=users[1], game=game, apply_status='Pending')
+
+        result = cancel_participation(game, users[0])
+
+        self.assertEqual(result['seated'], 0)
+        game.refresh_from_db()
+        self.assertEqual((game.participant_count, game.status), (0, 'finished'))
+        self.assertFalse(game.participants.exists())
+
+    def test_query_count_does_not_grow_with_applicants(self):
+        users = create_users(self.level, 10000)
+        small, large = create_game(self.level, max_participants=50), create_game(self.level, max_participants=5000)
+        Apply.objects.bulk_create(
+            Apply(user=user, game=game, apply_status='Pending') for game in (small, large) for user in users
+        )
+
+        # 세이브포인트 2 + 잠금 + 거절 + 대기 신청 조회 + 참가자 추가 + 승인 + 참가자 수 갱신
+        with self.assertNumQueries(8):
+            self.assertEqual(process_waitlist(small)['seated'], 50)
+
+        self.assertEqual(process_waitlist(large)['seated'], 5000)
+        self.assertEqual(large.participants.count(), 5000)
+        self.assertEqual(Apply.objects.filter(game=large, apply_status='Pending').count(), 5000)
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        self.novice, self.rookie, self.pro = [
+            create_level(level_number=i, name=name) for i, name in enumerate(['Novice', 'Rookie', 'Professional'])
+        ]
+        self.user = create_users(self.rookie, 1)[0]
+        self.index = RecommendationIndex()
+        for target in ('kick_off.recommendations.recommendation_index', 'kick_off.games.recommendation_index'):
+            patcher = mock.patch(target, self.index)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # 경기도 여자 경기를 주로 신청/관심 등록한 사용자
+        for _ in range(3):
+            past = create_game(self.rookie, region='gyeonggi', gender='female', game_date=datetime.date(2000, 1, 1))
+            Apply.objects.create(user=self.user, game=past, apply_status='Accepted')
+            Favorite.objects.create(user=self.user, game=past)
+
+    def recommended(self, limit=10):
+        return [game.game_name for game in recommend_games(self.user, limit)]
+
+    def test_ranks_eligible_open_games_by_preference(self):
+        create_game(self.novice, game_name='seoul-male')
+        create_game(self.rookie, game_name='gyeonggi-female', region='gyeonggi', gender='female')
+        create_game(self.rookie, game_name='gyeonggi-female-later', region='gyeonggi', gender='female',
+                    game_date=datetime.date(2030, 2, 1))
+        create_game(self.pro, game_name='too-high', region='gyeonggi', gender='female')
+        create_game(self.rookie, game_name='full', region='gyeonggi', gender='female', max_participants=0)
+        applied = create_game(self.rookie, game_name='applied', region='gyeonggi', gender='female')
+        Apply.objects.create(user=self.user, game=applied, apply_status='Pending')
+
+        self.assertEqual(self.recommended(), ['gyeonggi-female', 'gyeonggi-female-later', 'seoul-male'])
+
+    def test_index_follows_new_and_filled_games(self):
+        game = create_game(self.rookie, game_name='first', max_participants=1)
+        self.assertEqual(self.recommended(), ['first'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_game(self.rookie, game_name='second')
+        self.assertEqual(self.recommended(), ['first', 'second'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_seat(game, create_users(self.rookie, 1, prefix='other')[0])
+        self.assertEqual(self.recommended(), ['second'])
+
+    def test_stale_index_entries_are_checked_against_database(self):
+        create_game(self.rookie, game_name='open')
+        closed = create_game(self.rookie, game_name='closed')
+        self.index.load()
+
+        # 다른 프로세스에서 마감된 경우 (이 프로세스의 인덱스에는 반영되지 않음)
+        Game.objects.filter(pk=closed.pk).update(status='cancelled')
+
+        self.assertEqual(self.recommended(), ['open'])
+        self.assertEqual(self.recommended(), ['open'])
+
+    def test_recommendations_api(self):
+        create_game(self.rookie, game_name='open')
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+        response = client.get(f'/api/users/{self.user.user_id}/recommendations/', {'limit': 5})
+
+        self.assertEqual([game['game_name'] for game in response.data], ['open'])
+        self.assertEqual(client.get('/api/users/999999/recommendations/').status_code, 404)
+
+
+class SQLInstrumentationTests(TestCase):
+    def setUp(self):
+        self.levels = [create_level(level_number=i) for i in range(6)]
+        self.request = RequestFactory().get('/api/levels/')
+
+    # 레벨마다 쿼리를 한 번씩 실행하는 N+1 뷰
+    def n_plus_one_view(self, request):
+        for level in self.levels:
+            Level.objects.filter(pk=level.pk).first()
+        return HttpResponse()
+
+    def test_fingerprint_ignores_values(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "a" IN (%s, %s, %s) AND "b" = \'x\' LIMIT 21'),
+            fingerprint('SELECT * FROM "t" WHERE "a" IN (%s)  AND "b" = \'y\' LIMIT 1'),
+        )
+
+    @override_settings(DEBUG=True, SQL_INSTRUMENTATION_ENABLED=True)
+    def test_debug_headers_flag_n_plus_one(self):
+        response = SQLInstrumentationMiddleware(self.n_plus_one_view)(self.request)
+
+        self.assertEqual(response['X-DB-Query-Count'], '6')
+        self.assertEqual(response['X-DB-Repeated-Queries'], '1')
+        self.assertTrue(response['X-DB-N-Plus-One'].startswith('6x SELECT'))
+        self.assertIn('X-DB-Time-Ms', response)
+
+    @override_settings(DEBUG=False, SQL_INSTRUMENTATION_ENABLED=True, SQL_INSTRUMENTATION_SAMPLE_RATE=1.0)
+    def test_production_logs_sampled_requests(self):
+        middleware = SQLInstrumentationMiddleware(self.n_plus_one_view)
+        with self.assertLogs('kick_off.middleware', 'WARNING') as logs:
+            response = middleware(self.request)
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual((line['path'], line['queries']), ('/api/levels/', 6))
+        self.assertEqual(line['n_plus_one'][0]['count'], 6)
+        self.assertNotIn('X-DB-Query-Count', response)
+
+        with self.settings(SQL_INSTRUMENTATION_N_PLUS_ONE_THRESHOLD=10), \
+                self.assertLogs('kick_off.middleware', 'INFO') as logs:
+            SQLInstrumentationMiddleware(self.n_plus_one_view)(self.request)
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+
+    @override_settings(DEBUG=False, SQL_INSTRUMENTATION_ENABLED=True, SQL_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_instrumented(self):
+        with self.assertNoLogs('kick_off.middleware'):
+            response = SQLInstrumentationMiddleware(self.n_plus_one_view)(self.request)
+        self.assertNotIn('X-DB-Query-Count', response)
+
+    @override_settings(SQL_INSTRUMENTATION_ENABLED=False)
+    def test_disabled_middleware_is_removed(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            SQLInstrumentationMiddleware(self.n_plus_one_view)
+
+    @override_settings(DEBUG=True, SQL_INSTRUMENTATION_ENABLED=True)
+    def test_api_response_headers(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+        user = create_users(self.levels[0], 1)[0]
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'/api/users/{user.user_id}/dashboard/')
+
+        self.assertEqual(response['X-DB-Query-Count'], str(len(queries)))
+        self.assertNotIn('X-DB-N-Plus-One', response)
+
+
+class BenchmarkTests(TestCase):
+    def test_generated_data_is_consistent(self):
+        counts = benchmark.generate_data(users=50, games_per_region=10, missions=5)
+
+        self.assertEqual(counts['users'], User.objects.count())
+        self.assertEqual(counts['games'], Game.objects.count())
+        self.assertEqual(counts['videos'], Video.objects.count())
+        for user in User.objects.all():
+            history = Points.objects.filter(user=user).order_by('-points_id').values_list('total_points', flat=True)
+            self.assertEqual(user.points, history[0])
+            self.assertEqual(
+                user.unread_notification_count, Notification.objects.filter(user=user, is_read=False).count(),
+            )
+        for game in Game.objects.select_related('level').prefetch_related('participants__level'):
+            self.assertEqual(game.participant_count, len(game.participants.all()))
+            validate_participants(game)
+
+    def test_run_endpoints_covers_every_route(self):
+        benchmark.generate_data(users=20, games_per_region=5, missions=3)
+
+        with mock.patch.object(firebase_auth.verifier, 'verify', lambda token: {'uid': token}):
+            results = benchmark.run_endpoints(requests=2, concurrency=1, warmup=0)
+
+        self.assertEqual([result['endpoint'] for result in results], list(benchmark.ROUTES))
+        for result in results:
+            self.assertEqual(result['requests'], 2)
+            self.assertEqual(result['errors'], 0, result)
+            self.assertGreater(result['p99_ms'], 0)
+
+
+class ActivityExportTests(TestCase):
+    def setUp(self):
+        level = create_level()
+        self.user, self.other = create_users(level, 2)
+        game = create_game(level)
+        mission = Mission.objects.create(mission_name='m', mission_content='c', points=10, mission_type='individual')
+        for user in (self.user, self.other):
+            for amount in (10, 20, 30):
+                record_points(user.user_id, amount)
+            Payment.objects.create(user=user, amount='10000.00', payment_status='Completed')
+            Apply.objects.create(user=user, game=game, apply_status='Pending')
+            UserMission.objects.create(user=user, mission=mission, completed=True)
+            Notification.objects.create(user=user, content='알림', notification_type='other')
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+    def export(self, **params):
+        return self.client.get(f'/api/users/{self.user.user_id}/export/', params)
+
+    def test_streams_ndjson(self):
+        response = self.export()
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(
+            [row['type'] for row in rows], ['points'] * 3 + ['payments', 'applies', 'missions', 'notifications'],
+        )
+        self.assertEqual({row['user_id'] for row in rows}, {self.user.user_id})
+        self.assertEqual([row['total_points'] for row in rows[:3]], [10, 30, 60])
+        self.assertEqual(rows[-1]['content'], '알림')
+
+    def test_streams_gzipped_csv(self):
+        response = self.export(output='csv', gzip='1')
+
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn(f'user-{self.user.user_id}-activity.csv.gz', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(b''.join(response.streaming_content)).decode())))
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(
+            (rows[3]['type'], rows[3]['payment_status'], rows[3]['points_amount']), ('payments', 'Completed', ''),
+        )
+
+    def test_rejects_unknown_format(self):
+        self.assertEqual(self.export(output='xml').status_code, 400)
+
+    def test_reads_in_fixed_size_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            batches = list(iter_activity(user_id=self.user.user_id, chunk_size=2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1, 1, 1, 1, 1])
+        # points 는 2행 + 1행 두 번, 나머지는 종류마다 한 번 (마지막 배치가 덜 차면 더 읽지 않음)
+        self.assertEqual(len(queries), 6)
+
+    def test_export_all_writes_shards(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = export_all(directory, shards=3, workers=1, compress=True, chunk_size=2)
+
+            self.assertEqual(len(files), 3)
+            rows = [
+                json.loads(line) for path, _ in files for line in gzip.open(path, 'rt', encoding='utf-8')
+            ]
+        self.assertEqual(sum(count for _, count in files), 14)
+        self.assertEqual(len(rows), 14)
+        self.assertEqual({row['user_id'] for row in rows}, {self.user.user_id, self.other.user_id})
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        self.user = create_users(create_level(), 1)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='tester'))
+        cache.clear()
+
+    def pay(self, key=None, amount='10000'):
+        headers = {'Idempotency-Key': key} if key else {}
+        return self.client.post(
+            f'/api/payments/{self.user.user_id}/make/', {'amount': amount}, format='json', headers=headers,
+        )
+
+    def test_replays_first_response_without_running_view(self):
+        first = self.pay('key-1')
+        with self.assertNumQueries(0):
+            replay = self.pay('key-1')
+
+        self.assertEqual(replay.status_code, first.status_code)
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(Payment.objects.count(), 1)
+
+        self.pay('key-2')
+        self.pay()
+        self.pay()
+        self.assertEqual(Payment.objects.count(), 4)
+
+    def test_rejects_key_reuse_with_different_body(self):
+        self.pay('key-1')
+        self.assertEqual(self.pay('key-1', amount='20000').status_code, 422)
+        self.assertEqual(self.pay('x' * 300).status_code, 400)
+
+    def test_server_errors_are_not_stored(self):
+        with mock.patch('kick_off.views.Payment.objects.create', side_effect=RuntimeError):
+            self.client.raise_request_exception = False
+            self.assertEqual(self.pay('key-1').status_code, 500)
+        self.assertEqual(self.pay('key-1').status_code, 200)
+
+    def test_throttled_response_is_not_stored(self):
+        # 첫 요청만 요청 수 제한에 걸린 경우
+        with mock.patch('kick_off.throttling.throttle_store.consume', side_effect=[1, 0, 0, 0]):
+            self.assertEqual(self.pay('key-1').status_code, 429)
+            retried = self.pay('key-1')
+
+        self.assertEqual(retried.status_code, 200)
+        self.assertNotIn('Idempotent-Replayed', retried)
+        self.assertEqual(Payment.objects.count(), 1)
+
+    def test_retry_on_another_worker_replays(self):
+        # 워커마다 저장소 객체가 따로 있어도 캐시를 함께 쓴다.
+        with mock.patch('kick_off.middleware.idempotency_store', IdempotencyStore()):
+            first = self.pay('key-1')
+        with mock.patch('kick_off.middleware.idempotency_store', IdempotencyStore()):
+            retried = self.pay('key-1')
+
+        self.assertEqual(retried.json(), first.json())
+        self.assertEqual(retried['Idempotent-Replayed'], 'true')
+        self.assertEqual(Payment.objects.count(), 1)
+
+
+class IdempotencyStoreTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_duplicates_execute_once(self):
+        store = IdempotencyStore()
+        calls = []
+
+        def view(request):
+            calls.append(request)
+            time.sleep(0.05)
+            return HttpResponse(f'created {len(calls)}', status=201)
+
+        middleware = IdempotencyMiddleware(view)
+        request_factory = RequestFactory()
+        responses = []
+
+        def send():
+            request = request_factory.post('/api/payments/1/make/', {}, headers={'Idempotency-Key': 'same'})
+            responses.append(middleware(request))
+
+        with mock.patch('kick_off.middleware.idempotency_store', store):
+            threads = [threading.Thread(target=send) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({(r.status_code, r.content) for r in responses}, {(201, b'created 1')})
+
+    def test_waiter_gives_up_after_timeout(self):
+        store = IdempotencyStore()
+        outcome, entry = store.begin('key', b'body')
+        self.assertEqual(outcome, IdempotencyStore.EXECUTE)
+        self.assertEqual(store.begin('key', b'body', wait=0.01), (IdempotencyStore.IN_PROGRESS, None))
+
+        # 실패한 요청은 키를 풀어서 다음 요청이 실행한다.
+        store.complete('key', entry, None)
+        self.assertEqual(store.begin('key', b'body')[0], IdempotencyStore.EXECUTE)
+
+    def test_in_progress_claim_is_kept_until_claim_ttl(self):
+        store = IdempotencyStore(ttl=3600, claim_ttl=60)
+        with mock.patch('time.time', return_value=1000):
+            claim = store.begin('key', b'body')[1]
+            for other in range(100):
+                store.complete(other, store.begin(other, b'')[1], (200, [], b''))
+        with mock.patch('time.time', return_value=1059):
+            self.assertEqual(store.begin('key', b'body')[0], IdempotencyStore.IN_PROGRESS)
+            self.assertEqual(store.begin(0, b'')[0], IdempotencyStore.REPLAY)
+        with mock.patch('time.time', return_value=1061):
+            retry = store.begin('key', b'body')[1]
+            # 만료된 처리 중 표시의 실패 처리가 새로 가져간 키를 풀지 않는다.
+            store.complete('key', claim, None)
+            self.assertEqual(store.begin('key', b'body')[0], IdempotencyStore.IN_PROGRESS)
+            store.complete('key', retry, (201, [], b'created'))
+            self.assertEqual(store.begin('key', b'body'), (IdempotencyStore.REPLAY, (201, [], b'created')))
+
+
+class MissionCatalogTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mission = Mission.objects.create(
+                mission_name='m', mission_content='', points=10, mission_type='individual',
+            )
+
+    def test_matching_etag_returns_304_without_queries(self):
+        response = self.client.get('/api/missions/')
+        etag = response['ETag']
+        self.assertEqual([m['mission_id'] for m in response.json()], [self.mission.mission_id])
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/missions/', headers={'If-None-Match': etag}).status_code, 304)
+            detail = self.client.get(f'/api/missions/{self.mission.mission_id}/', headers={'If-None-Match': etag})
+        self.assertEqual(detail.status_code, 304)
+
+    def test_version_is_shared_and_bumped_on_save(self):
+        etag = self.client.get('/api/missions/')['ETag']
+        # 캐시를 처음 채우는 다른 워커 프로세스도 같은 ETag 를 쓴다.
+        with mock.patch('kick_off.catalog._snapshot', None):
+            self.assertEqual(self.client.get('/api/missions/')['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mission.mission_name = 'renamed'
+            self.mission.save()
+        response = self.client.get('/api/missions/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()[0]['mission_name'], 'renamed')
+
+    def test_other_worker_invalidation_reloads_snapshot(self):
+        self.client.get('/api/missions/')
+        # 다른 워커가 시그널 없이 바꾼 뒤 버전만 갱신한 경우
+        Mission.objects.filter(pk=self.mission.pk).update(points=99)
+        invalidate_mission_catalog()
+        self.assertEqual(self.client.get(f'/api/missions/{self.mission.mission_id}/').json()['points'], 99)
+
+
+class MissionStatusTests(TestCase):
+    def setUp(self):
+        self.user = create_users(create_level(), 1)[0]
+        with self.captureOnCommitCallbacks(execute=True):  # 미션 카탈로그 버전 갱신
+            self.missions = [
+                Mission.objects.create(
+                    mission_name=f'm{i}', mission_content='', points=10, mission_type='individual', is_approved=i < 2,
+                ) for i in range(3)
+            ]
+        UserMission.objects.create(user=self.user, mission=self.missions[2], completed=True)
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+    def test_lists_every_mission_with_one_query(self):
+        self.client.get(f'/api/missions/user/{self.user.user_id}/')  # 미션 캐시 채우기
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/missions/user/{self.user.user_id}/')
+
+        # 승인 여부와 관계없이 기존과 같은 전체 미션 목록
+        self.assertEqual(
+            [(m['mission_id'], m['completed']) for m in response.data],
+            [(self.missions[0].mission_id, False), (self.missions[1].mission_id, False),
+             (self.missions[2].mission_id, True)],
+        )
+
+
+class UserDashboardTests(TestCase):
+    def setUp(self):
+        level = create_level()
+        self.user = create_users(level, 1)[0]
+        with self.captureOnCommitCallbacks(execute=True):  # 미션 카탈로그 버전 갱신
+            missions = [
+                Mission.objects.create(
+                    mission_name=f'm{i}', mission_content='', points=10, mission_type='individual', is_approved=i < 3,
+                ) for i in range(4)
+            ]
+        UserMission.objects.create(user=self.user, mission=missions[0], completed=True)
+        UserMission.objects.create(user=self.user, mission=missions[3], completed=True)
+
+        for day in range(1, 6):
+            game = create_game(level, game_date=datetime.date(2030, 1, day))
+            Apply.objects.create(user=self.user, game=game, apply_status='Pending')
+            Favorite.objects.create(user=self.user, game=game)
+        past = create_game(level, game_date=datetime.date(2000, 1, 1))
+        cancelled = create_game(level, status='cancelled')
+        Apply.objects.create(user=self.user, game=past, apply_status='Accepted')
+        Apply.objects.create(user=self.user, game=cancelled, apply_status='Accepted')
+        Apply.objects.create(user=self.user, game=create_game(level), apply_status='Cancelled')
+        Notification.objects.create(user=self.user, content='hello', notification_type='other')
+
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='tester'))
+        get_approved_missions()  # 미션 캐시는 미리 채워 둔다.
+
+    def test_dashboard_stays_within_query_budget(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/users/{self.user.user_id}/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data['level']['name'], 'Novice')
+        self.assertEqual(data['unread_notification_count'], 1)
+        self.assertEqual(data['missions'], {'total': 3, 'completed': 1})
+        self.assertEqual(
+            [a['game']['game_date'] for a in data['upcoming_games']],
+            [datetime.date(2030, 1, day) for day in range(1, 6)],
+        )
+        self.assertEqual(len(data['favorite_games']), 5)
+
+    def test_unknown_user(self):
+        response = self.client.get('/api/users/999999/dashboard/')
+        self.assertEqual(response.status_code, 404)
+
+
+class BatchRequestTests(TestCase):
+    def setUp(self):
+        self.user = create_users(create_level(), 1)[0]
+        auth_user = get_user_model().objects.create(username='tester')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(auth_user)}')
+
+    def batch(self, requests):
+        return self.client.post('/api/batch/', {'requests': requests}, format='json')
+
+    def test_runs_sub_requests_in_order_with_one_authentication(self):
+        user_id = self.user.user_id
+        authenticate = JWTAuthentication.authenticate
+        with mock.patch.object(JWTAuthentication, 'authenticate', autospec=True, side_effect=authenticate) as spy:
+            response = self.batch([
+                {'path': f'users/{user_id}/'},
+                {'path': f'/api/points/{user_id}/'},
+                {'method': 'POST', 'path': f'points/{user_id}/add/', 'body': {'points': 30}},
+                {'path': f'points/{user_id}/'},
+                {'path': 'missions/'},
+            ])
+        self.assertEqual(spy.call_count, 1)
+
+        self.assertEqual(response.status_code, 200)
+        responses = response.data['responses']
+        self.assertEqual([r['status'] for r in responses], [200, 404, 200, 200, 200])
+        self.assertEqual(responses[0]['body']['name'], self.user.name)
+        self.assertEqual(responses[2]['body']['total_points'], 30)
+        self.assertEqual(responses[3]['body'][0]['points_amount'], 30)
+
+    def test_rejects_invalid_batches(self):
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.batch([{'path': 'nowhere/'}]).status_code, 400)
+        self.assertEqual(self.batch([{'path': 'batch/'}]).status_code, 400)
+        self.assertEqual(self.batch([{'path': 'events/'}]).status_code, 400)
+        self.assertEqual(self.batch([{'path': 'missions/'}] * 21).status_code, 400)
+
+    def test_requires_authentication(self):
+        response = APIClient().post('/api/batch/', {'requests': [{'path': 'missions/'}]}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_sub_requests_share_the_request_connection(self):
+        Notification.objects.create(user=self.user, content='hello', notification_type='other')
+        threads = set()
+        dispatch = batch._run_one
+
+        def run_one(request, entry):
+            threads.add(threading.get_ident())
+            return dispatch(request, entry)
+
+        with mock.patch.object(batch, '_run_one', run_one):
+            response = self.batch([
+                {'path': f'users/{self.user.user_id}/'},
+                {'path': f'notifications/{self.user.user_id}/'},
+                {'path': f'notifications/{self.user.user_id}/unread-count/'},
+            ])
+
+        self.assertEqual(threads, {threading.get_ident()})  # 새 DB 연결을 여는 작업 스레드를 쓰지 않는다.
+        responses = response.data['responses']
+        self.assertEqual([r['status'] for r in responses], [200, 200, 200])
+        self.assertEqual(responses[1]['body'][0]['content'], 'hello')
+        self.assertEqual(responses[2]['body'], {'unread_count': 1})
+
+
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        throttle_store.clear()
+        self.addCleanup(throttle_store.clear)
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+    def test_send_code_limited_per_phone_number(self):
+        url = '/api/auth/send-code/'
+        for _ in range(5):
+            self.assertEqual(self.client.post(url, {'phone_number': '010-1234-5678'}).status_code, 200)
+
+        response = self.client.post(url, {'phone_number': '01012345678'})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        # 다른 번호, 다른 경로는 별도 버킷
+        self.assertEqual(self.client.post(url, {'phone_number': '01099998888'}).status_code, 200)
+        response = self.client.post('/api/auth/verify-code/', {'phone_number': '01012345678', 'verification_code': '1'})
+        self.assertNotEqual(response.status_code, 429)
+
+    def test_user_and_ip_throttles(self):
+        @api_view(['POST'])
+        def write(request):
+            return Response({'ok': True})
+
+        view = throttled(write, user='2/min', ip='4/min')
+        request_factory = APIRequestFactory()
+
+        def post(username, ip='10.0.0.1'):
+            request = request_factory.post('/write/', REMOTE_ADDR=ip)
+            force_authenticate(request, get_user_model()(pk=len(username), username=username))
+            return view(request).status_code
+
+        self.assertEqual([post('a'), post('a'), post('a')], [200, 200, 429])
+        self.assertEqual(post('bb'), 200)
+        self.assertEqual(post('ccc'), 429)  # 사용자 제한에 걸린 요청도 IP 토큰은 사용한다.
+        self.assertEqual(post('ccc', ip='10.0.0.2'), 200)
+
+        throttle_store.enabled = False
+        self.addCleanup(setattr, throttle_store, 'enabled', True)
+        self.assertEqual(post('a'), 200)
+
+    def test_ip_throttle_ignores_spoofed_forwarded_for(self):
+        @api_view(['POST'])
+        def write(request):
+            return Response({'ok': True})
+
+        view = throttled(write, ip='2/min')
+        request_factory = APIRequestFactory()
+        # 요청마다 X-Forwarded-For 를 바꿔도 같은 연결 주소의 버킷을 쓴다.
+        requests = [
+            request_factory.post('/write/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=f'203.0.113.{i}')
+            for i in range(3)
+        ]
+        for request in requests:
+            force_authenticate(request, get_user_model()(pk=1, username='a'))
+        statuses = [view(request).status_code for request in requests]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    def test_bucket_refills_and_store_is_bounded(self):
+        store = TokenBucketStore(max_keys=2)
+        capacity, refill_rate = parse_rate('2/s')
+        with mock.patch('kick_off.throttling.time.monotonic', return_value=100.0) as clock:
+            self.assertEqual([store.consume('a', capacity, refill_rate) for _ in range(2)], [0, 0])
+            self.assertAlmostEqual(store.consume('a', capacity, refill_rate), 0.5)
+            clock.return_value = 100.5
+            self.assertEqual(store.consume('a', capacity, refill_rate), 0)
+
+            store.consume('b', capacity, refill_rate)
+            store.consume('c', capacity, refill_rate)
+        self.assertEqual(len(store), 2)
+        self.assertNotIn('a', store._buckets)
+
+
+class VerificationCodeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        throttle_store.clear()
+        self.addCleanup(throttle_store.clear)
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='tester'))
+
+    def send_code(self, phone_number='010-1234-5678'):
+        with mock.patch('kick_off.views.deliver_code') as deliver_code:
+            response = self.client.post('/api/auth/send-code/', {'phone_number': phone_number})
+        self.assertEqual(response.status_code, 200)
+        return deliver_code.call_args.args[1]
+
+    def verify(self, code, phone_number='01012345678'):
+        response = self.client.post(
+            '/api/auth/verify-code/', {'phone_number': phone_number, 'verification_code': code},
+        )
+        return response.status_code, response.data
+
+    def test_code_is_single_use_and_needs_no_db_writes(self):
+        code = self.send_code()
+        self.assertRegex(code, r'^\d{6}$')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.verify(code), (200, {'message': 'Verification successful'}))
+        self.assertFalse([q for q in queries if not q['sql'].upper().startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))])
+        self.assertEqual(self.verify(code)[1], {'error': 'Verification code expired or not requested'})
+
+    def test_locks_after_max_attempts(self):
+        code = self.send_code()
+        wrong = f'{(int(code) + 1) % 10 ** 6:06d}'
+        results = [self.verify(wrong)[1]['error'] for _ in range(OTP_MAX_ATTEMPTS)]
+
+        self.assertEqual(results[0], 'Invalid verification code')
+        self.assertEqual(results[-1], 'Too many attempts, request a new verification code')
+        self.assertEqual(self.verify(code)[0], 400)
+        # 새 코드를 받으면 다시 검증할 수 있다.
+        self.assertEqual(self.verify(self.send_code())[0], 200)
+
+    def test_codes_expire_and_are_stored_hashed(self):
+        store = OTPStore(ttl=60)
+        with mock.patch('kick_off.otp.time.time', return_value=100.0) as clock:
+            first = store.issue('010-0000-0001')
+            code_hash, expires_at = cache.get('kick_off:otp:01000000001')
+            self.assertNotIn(first.encode(), code_hash)
+            self.assertEqual(expires_at, 160.0)
+
+            # 다른 번호로 코드를 많이 받아도 먼저 받은 유효한 코드는 남아 있다.
+            for i in range(2, 50):
+                store.issue(f'010{i:08d}')
+            self.assertEqual(store.verify('01000000001', first), OTPStore.VERIFIED)
+
+            clock.return_value = 160.0
+            self.assertEqual(store.verify('01000000002', '000000'), OTPStore.EXPIRED)
+
+    def test_attempts_are_shared_between_workers(self):
+        # 같은 캐시를 쓰는 두 워커 프로세스의 저장소
+        workers = [OTPStore(max_attempts=3), OTPStore(max_attempts=3)]
+        code = workers[0].issue('01012345678')
+        wrong = f'{(int(code) + 1) % 10 ** 6:06d}'
+
+        results = [workers[i % 2].verify('01012345678', wrong) for i in range(3)]
+        self.assertEqual(results, [OTPStore.INVALID, OTPStore.INVALID, OTPStore.LOCKED])
+        self.assertEqual(workers[1].verify('01012345678', code), OTPStore.EXPIRED)
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from .otp import normalize_phone_number
+
+
+THROTTLE_ENABLED = getattr(settings, 'THROTTLE_ENABLED', True)
+THROTTLE_MAX_KEYS = getattr(settings, 'THROTTLE_MAX_KEYS', 100000)
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+# DRF 형식의 비율 문자열 → (최대 토큰 수, 초당 충전량)
+# '5/min' 은 한 번에 5개까지 허용하고 12초마다 1개씩 다시 채운다.
+def parse_rate(rate):
+    count, period = rate.split('/')
+    count = int(count)
+    return count, count / PERIODS[period[0]]
+
+
+# 키별 토큰 버킷 저장소 (프로세스 내, 최근 사용 순 최대 max_keys 개)
+# 버킷은 (남은 토큰, 마지막 갱신 시각) 두 값만 저장하고 요청이 들어올 때 지난 시간만큼 채우므로 타이머가 없다.
+# 키가 max_keys 를 넘으면 가장 오래 쓰지 않은 버킷부터 버린다. 버려진 키는 다음 요청에서 가득 찬 버킷으로 다시 시작한다.
+class TokenBucketStore:
+    def __init__(self, max_keys=THROTTLE_MAX_KEYS, enabled=THROTTLE_ENABLED):
+        self.max_keys = max_keys
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    # 토큰 하나 사용. 반환값: 다음 토큰까지 기다려야 하는 초 (0 이면 허용)
+    def consume(self, key, capacity, refill_rate):
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+                self._buckets.move_to_end(key)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / refill_rate
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+throttle_store = TokenBucketStore()
+
+
+# DRF throttle 기본 클래스: get_key() 가 None 이면 제한하지 않는다.
+# scope(경로 이름)별로 버킷이 분리되므로 같은 전화번호라도 코드 전송과 검증은 따로 센다.
+class TokenBucketThrottle(BaseThrottle):
+    kind = None
+    scope = None
+    capacity = None
+    refill_rate = None
+
+    def allow_request(self, request, view):
+        self._wait = 0
+        if not throttle_store.enabled:
+            return True
+        ident = self.get_key(request, view)
+        if ident is None:
+            return True
+        self._wait = throttle_store.consume(f'{self.scope}:{self.kind}:{ident}', self.capacity, self.refill_rate)
+        return not self._wait
+
+    def wait(self):
+        return self._wait
+
+    def get_key(self, request, view):
+        raise NotImplementedError
+
+
+class IPThrottle(TokenBucketThrottle):
+    kind = 'ip'
+
+    def get_key(self, request, view):
+        # X-Forwarded-For 는 REST_FRAMEWORK['NUM_PROXIES'] 설정에 따라 사용
+        return self.get_ident(request)
+
+
+class UserThrottle(TokenBucketThrottle):
+    kind = 'user'
+
+    def get_key(self, request, view):
+        return request.user.pk if request.user and request.user.is_authenticated else None
+
+
+class PhoneNumberThrottle(TokenBucketThrottle):
+    kind = 'phone'
+
+    def get_key(self, request, view):
+        phone_number = request.data.get('phone_number') if hasattr(request.data, 'get') else None
+        return normalize_phone_number(phone_number) if phone_number else None
+
+
+THROTTLE_CLASSES = {'ip': IPThrottle, 'user': UserThrottle, 'phone': PhoneNumberThrottle}
+
+
+# urls.py 에서 경로별 제한 설정: path('auth/send-code/', throttled(view, phone='5/h', ip='30/h'), ...)
+# @api_view 로 만든 뷰를 같은 클래스로 다시 만들면서 throttle_classes 만 바꾼다.
+# 비율은 여기서 미리 해석하므로 잘못된 비율은 URL 설정을 읽을 때 바로 실패한다.
+def throttled(view, scope=None, **rates):
+    scope = scope or view.cls.__name__  # @api_view 가 뷰 함수 이름으로 만든 클래스
+    throttle_classes = []
+    for kind, rate in rates.items():
+        capacity, refill_rate = parse_rate(rate)
+        base = THROTTLE_CLASSES[kind]
+        throttle_classes.append(type(f'{base.__name__}_{scope}', (base,), {
+            'scope': scope, 'capacity': capacity, 'refill_rate': refill_rate,
+        }))
+    return view.cls.as_view(throttle_classes=throttle_classes)
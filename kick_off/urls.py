@@ -1,34 +1,66 @@
 from django.urls import path, include
+from rest_framework_simplejwt.views import TokenRefreshView
+from . import async_views
+from .throttling import throttled
 from .views import (
+    phone_login, verify_firebase_token,
     send_verification_code_view, verify_code_view,
-    get_user_profile, update_user_profile, delete_user,
-    get_game_info, join_game,
-    get_user_points, add_points,
+    get_user_profile, get_user_dashboard, get_game_recommendations, update_user_profile, delete_user,
+    export_user_activity,
+    list_games, get_game_info, join_game,
+    get_user_points, add_points, get_leaderboard, get_user_rank,
     get_missions, get_mission_detail, get_user_mission_status,
     get_favorite_games, add_favorite_game, remove_favorite_game,
     get_user_videos, get_game_videos,
     get_user_payments, make_payment,
     get_user_applies, apply_for_game, cancel_application,
-    get_user_notifications, mark_notification_read
+    get_user_notifications, mark_notification_read, fanout_notifications,
+    get_notification_inbox, get_unread_notification_count, mark_notifications_read_bulk,
+    batch,
 )
 
+# 쓰기 API 요청 제한 (사용자별, IP별 토큰 버킷)
+WRITE_RATES = {'user': '120/min', 'ip': '600/min'}
+
 urlpatterns = [
+    # Firebase 로그인 API
+    path('auth/phone-login/', phone_login, name='phone_login'),
+    path('auth/verify-token/', verify_firebase_token, name='verify_firebase_token'),
+    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+
     # 전화번호 로그인 API
-    path('auth/send-code/', send_verification_code_view, name='send_code'),
-    path('auth/verify-code/', verify_code_view, name='verify_code'),
+    path('auth/send-code/', throttled(send_verification_code_view, phone='5/hour', ip='60/hour'), name='send_code'),
+    path('auth/verify-code/', throttled(verify_code_view, phone='10/hour', ip='120/hour'), name='verify_code'),
+
+    # 비동기(ASGI) 로그인/프로필 API
+    path('async/auth/phone-login/', async_views.phone_login, name='async_phone_login'),
+    path('async/auth/verify-token/', async_views.verify_firebase_token, name='async_verify_firebase_token'),
+    path('async/users/<int:user_id>/', async_views.get_user_profile, name='async_get_user_profile'),
+
+    # 여러 API 요청 일괄 실행
+    path('batch/', throttled(batch, **WRITE_RATES), name='batch'),
+
+    # 실시간 알림/경기 상태 스트림 (SSE, ASGI 전용)
+    path('events/', async_views.event_stream, name='event_stream'),
 
     # 사용자 관련 API
     path('users/<int:user_id>/', get_user_profile, name='get_user_profile'),
-    path('users/<int:user_id>/update/', update_user_profile, name='update_user_profile'),
-    path('users/<int:user_id>/delete/', delete_user, name='delete_user'),
+    path('users/<int:user_id>/dashboard/', get_user_dashboard, name='get_user_dashboard'),
+    path('users/<int:user_id>/recommendations/', get_game_recommendations, name='get_game_recommendations'),
+    path('users/<int:user_id>/update/', throttled(update_user_profile, **WRITE_RATES), name='update_user_profile'),
+    path('users/<int:user_id>/delete/', throttled(delete_user, **WRITE_RATES), name='delete_user'),
+    path('users/<int:user_id>/export/', export_user_activity, name='export_user_activity'),
 
     # 게임 관련 API
+    path('games/', list_games, name='list_games'),
     path('games/<int:game_id>/', get_game_info, name='get_game_info'),
-    path('games/<int:game_id>/join/', join_game, name='join_game'),
+    path('games/<int:game_id>/join/', throttled(join_game, **WRITE_RATES), name='join_game'),
 
     # 포인트 관련 API
     path('points/<int:user_id>/', get_user_points, name='get_user_points'),
-    path('points/<int:user_id>/add/', add_points, name='add_points'),
+    path('points/<int:user_id>/add/', throttled(add_points, **WRITE_RATES), name='add_points'),
+    path('leaderboard/', get_leaderboard, name='get_leaderboard'),
+    path('leaderboard/users/<int:user_id>/', get_user_rank, name='get_user_rank'),
 
     # 미션 관련 API
     path('missions/', get_missions, name='get_missions'),
@@ -37,8 +69,10 @@ urlpatterns = [
 
     # 관심 게임 관련 API
     path('favorites/<int:user_id>/', get_favorite_games, name='get_favorite_games'),
-    path('favorites/<int:user_id>/add/<int:game_id>/', add_favorite_game, name='add_favorite_game'),
-    path('favorites/<int:user_id>/remove/<int:game_id>/', remove_favorite_game, name='remove_favorite_game'),
+    path('favorites/<int:user_id>/add/<int:game_id>/', throttled(add_favorite_game, **WRITE_RATES),
+         name='add_favorite_game'),
+    path('favorites/<int:user_id>/remove/<int:game_id>/', throttled(remove_favorite_game, **WRITE_RATES),
+         name='remove_favorite_game'),
 
     # 영상 관련 API
     path('videos/<int:user_id>/', get_user_videos, name='get_user_videos'),
@@ -46,14 +80,22 @@ urlpatterns = [
 
     # 결제 관련 API
     path('payments/<int:user_id>/', get_user_payments, name='get_user_payments'),
-    path('payments/<int:user_id>/make/', make_payment, name='make_payment'),
+    path('payments/<int:user_id>/make/', throttled(make_payment, **WRITE_RATES), name='make_payment'),
 
     # 신청 내역 관련 API
     path('applies/<int:user_id>/', get_user_applies, name='get_user_applies'),
-    path('applies/<int:user_id>/apply/<int:game_id>/', apply_for_game, name='apply_for_game'),
-    path('applies/<int:user_id>/cancel/<int:game_id>/', cancel_application, name='cancel_application'),
+    path('applies/<int:user_id>/apply/<int:game_id>/', throttled(apply_for_game, **WRITE_RATES), name='apply_for_game'),
+    path('applies/<int:user_id>/cancel/<int:game_id>/', throttled(cancel_application, **WRITE_RATES),
+         name='cancel_application'),
 
     # 알림 관련 API
     path('notifications/<int:user_id>/', get_user_notifications, name='get_user_notifications'),
-    path('notifications/<int:notification_id>/read/', mark_notification_read, name='mark_notification_read'),
+    path('notifications/<int:notification_id>/read/', throttled(mark_notification_read, **WRITE_RATES),
+         name='mark_notification_read'),
+    path('notifications/fanout/', throttled(fanout_notifications, **WRITE_RATES), name='fanout_notifications'),
+    path('notifications/<int:user_id>/inbox/', get_notification_inbox, name='get_notification_inbox'),
+    path('notifications/<int:user_id>/unread-count/', get_unread_notification_count,
+         name='get_unread_notification_count'),
+    path('notifications/<int:user_id>/mark-read/', throttled(mark_notifications_read_bulk, **WRITE_RATES),
+         name='mark_notifications_read_bulk'),
 ]
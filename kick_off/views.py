@@ -1,17 +1,43 @@
+import base64
+import binascii
+
 import firebase_admin
-from django.http import JsonResponse
-from firebase_admin import auth
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Prefetch, Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from django.views.decorators.http import condition
 from firebase_admin.exceptions import FirebaseError
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from .models import User, Points, Mission, Favorite, Video, Payment, Apply, Notification, Game, UserMission
-
-
-# Firebase 전화번호 로그인 처리
+from .accounts import current_player, issue_tokens
+from .batch import parse_batch, run_batch
+from .catalog import (
+    catalog_last_modified, catalog_version, get_approved_missions,
+    get_mission as get_catalog_mission, get_missions as get_catalog_missions,
+)
+from .exports import EXPORT_FORMATS, export_chunks, export_filename, iter_activity
+from .firebase_auth import verify_id_token
+from .games import reserve_seat, validate_participants
+from .leaderboard import leaderboard
+from .ledger import POINTS_MAX_AMOUNT, record_points
+from .models import (
+    User, Points, Favorite, Video, Payment, Apply, Notification, Game, UserMission, Level,
+    NotificationFanout,
+)
+from .notifications import ACTIVE_APPLY_STATUSES, create_fanout, mark_notifications_read
+from .otp import OTPStore, deliver_code, otp_store
+from .recommendations import recommend_games
+from .waitlist import cancel_participation
+
+
+# Firebase 전화번호 로그인 처리 (API 토큰 발급)
 @api_view(['POST'])
+@permission_classes([AllowAny])  # 인증 필요 없는 뷰로 설정
 def phone_login(request):
     id_token = request.data.get('id_token')
 
@@ -20,7 +46,7 @@ def phone_login(request):
 
     try:
         # Firebase ID 토큰 검증
-        decoded_token = auth.verify_id_token(id_token)
+        decoded_token = verify_id_token(id_token)
     except Exception as e:
         return Response({'error': 'Invalid Firebase token'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -40,18 +66,20 @@ def phone_login(request):
     return Response({
         'message': message,
         'user_id': user.user_id,
-        'phone_number': user.phone_number
+        'phone_number': user.phone_number,
+        **issue_tokens(user),
     })
 
 
-# Firebase 토큰 검증 및 사용자 정보 저장
+# Firebase 토큰 검증 및 사용자 정보 저장 (API 토큰 발급)
 @api_view(['POST'])
+@permission_classes([AllowAny])  # 인증 필요 없는 뷰로 설정
 def verify_firebase_token(request):
     id_token = request.data.get('id_token')
 
     try:
         # Firebase ID 토큰 검증
-        decoded_token = auth.verify_id_token(id_token)
+        decoded_token = verify_id_token(id_token)
         uid = decoded_token['uid']
         phone_number = decoded_token.get('phone_number', None)
 
@@ -61,7 +89,7 @@ def verify_firebase_token(request):
             user.phone_number = phone_number
             user.save()
 
-        return JsonResponse({"message": "User authenticated", "user_id": user.id})
+        return JsonResponse({"message": "User authenticated", "user_id": user.user_id, **issue_tokens(user)})
 
     except FirebaseError as e:
         return JsonResponse({"error": str(e)}, status=400)
@@ -75,9 +103,9 @@ def send_verification_code_view(request):
     if not phone_number:
         return Response({'error': 'Missing phone number'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # 인증 코드 생성 및 전송 로직 (예: Twilio 또는 Firebase SMS API 사용)
-    verification_code = "123456"  # 실제 구현에서는 무작위 생성
-    # 인증 코드 전송 로직 필요
+    # 인증 코드 생성 및 전송 (코드는 해시로만 저장, OTP_TTL_SECONDS 후 만료)
+    verification_code = otp_store.issue(phone_number)
+    deliver_code(phone_number, verification_code)
 
     return Response({'message': 'Verification code sent successfully'})
 
@@ -91,9 +119,16 @@ def verify_code_view(request):
     if not phone_number or not verification_code:
         return Response({'error': 'Missing phone number or verification code'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # 인증 코드 검증 로직
-    if verification_code == "123456":  # 실제 구현에서는 검증 과정 추가
+    # 인증 코드 검증 (DB 를 사용하지 않음)
+    result = otp_store.verify(phone_number, verification_code)
+    if result == OTPStore.VERIFIED:
         return Response({'message': 'Verification successful'})
+    if result == OTPStore.EXPIRED:
+        return Response({'error': 'Verification code expired or not requested'}, status=status.HTTP_400_BAD_REQUEST)
+    if result == OTPStore.LOCKED:
+        return Response(
+            {'error': 'Too many attempts, request a new verification code'}, status=status.HTTP_400_BAD_REQUEST,
+        )
 
     return Response({'error': 'Invalid verification code'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -114,6 +149,90 @@ def get_user_profile(request, user_id):
     return Response(data)
 
 
+def _game_summary(game):
+    return {
+        'game_id': game.game_id,
+        'game_name': game.game_name,
+        'game_date': game.game_date,
+        'game_time': game.game_time,
+        'location': game.location,
+        'region': game.region,
+        'status': game.status,
+        'participant_count': game.participant_count,
+        'max_participants': game.max_participants,
+    }
+
+
+# 홈 화면 대시보드 (프로필/레벨, 포인트, 다가오는 신청 경기, 관심 경기, 읽지 않은 알림 수, 미션 진행 현황)
+# 쿼리 3개로 조회한다: 사용자+레벨+완료 미션 수, 다가오는 신청 경기, 관심 경기.
+# 포인트와 읽지 않은 알림 수는 사용자 행의 값을 그대로 쓰고, 전체 미션 수는 미션 캐시에서 가져온다.
+@api_view(['GET'])
+def get_user_dashboard(request, user_id):
+    today = timezone.localdate()
+    upcoming_applies = Apply.objects.filter(
+        apply_status__in=ACTIVE_APPLY_STATUSES,
+        game__game_date__gte=today,
+    ).exclude(game__status='cancelled').select_related('game').order_by(
+        'game__game_date', 'game__game_time', 'game_id',
+    )
+    favorites = Favorite.objects.filter(liked=True).select_related('game').order_by(
+        'game__game_date', 'game__game_time', 'game_id',
+    )
+    users = User.objects.select_related('level').annotate(
+        completed_missions=Count(
+            'usermission__mission', filter=Q(usermission__mission__is_approved=True), distinct=True,
+        ),
+    ).prefetch_related(
+        Prefetch('apply_set', queryset=upcoming_applies, to_attr='upcoming_applies'),
+        Prefetch('favorite_set', queryset=favorites, to_attr='liked_favorites'),
+    )
+    user = get_object_or_404(users, user_id=user_id)
+
+    level = user.level
+    return Response({
+        'user_id': user.user_id,
+        'name': user.name,
+        'email': user.email,
+        'phone_number': user.phone_number,
+        'profile_picture': user.profile_picture,
+        'registration_date': user.registration_date,
+        'level': {
+            'id': level.id,
+            'name': level.name,
+            'color': level.color,
+            'whistle': level.whistle,
+            'level_number': level.level_number,
+        },
+        'points': user.points,
+        'unread_notification_count': user.unread_notification_count,
+        'upcoming_games': [{
+            'apply_id': a.apply_id,
+            'apply_status': a.apply_status,
+            'apply_date': a.apply_date,
+            'game': _game_summary(a.game),
+        } for a in user.upcoming_applies],
+        'favorite_games': [_game_summary(f.game) for f in user.liked_favorites],
+        'missions': {
+            'total': len(get_approved_missions()),
+            'completed': user.completed_missions,
+        },
+    })
+
+
+# 사용자에게 추천하는 신청 가능한 경기 (레벨, 지역/성별 선호도, 인기도, 날짜 순)
+@api_view(['GET'])
+def get_game_recommendations(request, user_id):
+    try:
+        limit = min(int(request.query_params.get('limit', 10)), 50)
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+    user = get_object_or_404(User.objects.select_related('level'), user_id=user_id)
+    return Response([_game_summary(game) for game in recommend_games(user, limit)])
+
+
 # 사용자 프로필 업데이트
 @api_view(['POST'])
 def update_user_profile(request, user_id):
@@ -127,7 +246,8 @@ def update_user_profile(request, user_id):
     if profile_picture:
         user.profile_picture = profile_picture
 
-    user.save()
+    # points, unread_notification_count 등 원자적으로 관리되는 값은 덮어쓰지 않는다.
+    user.save(update_fields=['phone_number', 'profile_picture'])
     return Response({'message': 'Profile updated successfully'})
 
 
@@ -139,6 +259,29 @@ def delete_user(request, user_id):
     return Response({'message': f'User {user.name} deleted successfully'})
 
 
+EXPORT_CONTENT_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv; charset=utf-8'}
+
+
+# 사용자 활동 내역(포인트, 결제, 신청, 미션, 알림) 내보내기
+# ?output=ndjson|csv, ?gzip=1 이면 압축해서 전송. 내역을 배치 단위로 읽으면서 바로 보내므로 메모리 사용량이 일정하다.
+# (DRF 가 ?format= 을 응답 형식 선택에 사용하므로 output 으로 받는다.)
+@api_view(['GET'])
+def export_user_activity(request, user_id):
+    user = get_object_or_404(User, user_id=user_id)
+    export_format = request.query_params.get('output', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return Response({'error': 'Invalid output format'}, status=status.HTTP_400_BAD_REQUEST)
+    compress = request.query_params.get('gzip') in ('1', 'true')
+
+    response = StreamingHttpResponse(
+        export_chunks(iter_activity(user_id=user.user_id), export_format, compress),
+        content_type='application/gzip' if compress else EXPORT_CONTENT_TYPES[export_format],
+    )
+    filename = export_filename(f'user-{user.user_id}-activity', export_format, compress)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 # 게임 정보 조회
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 인증 필요 없는 뷰로 설정
@@ -154,18 +297,128 @@ def get_game_info(request, game_id):
     return Response(data)
 
 
+# 게임 목록 페이지 크기
+GAME_LIST_DEFAULT_LIMIT = 20
+GAME_LIST_MAX_LIMIT = 100
+
+
+def _encode_cursor(*values):
+    # 마지막으로 본 행의 정렬 키 값들을 불투명한 커서 문자열로 인코딩
+    raw = '|'.join(str(value) for value in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor, *parsers):
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        if len(parts) != len(parsers):
+            return None
+        values = [parse(part) for parse, part in zip(parsers, parts)]
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if any(value is None for value in values):
+        return None
+    return values
+
+
+# 게임 목록 조회 (필터 + 키셋 커서 페이지네이션)
+@api_view(['GET'])
+@permission_classes([AllowAny])  # 인증 필요 없는 뷰로 설정
+def list_games(request):
+    params = request.query_params
+    games = Game.objects.all()
+
+    for field in ('region', 'gender', 'status'):
+        value = params.get(field)
+        if value:
+            games = games.filter(**{field: value})
+
+    for param, lookup in (('date_from', 'game_date__gte'), ('date_to', 'game_date__lte')):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            game_date = parse_date(value)
+        except ValueError:
+            game_date = None
+        if game_date is None:
+            return Response({'error': f'Invalid {param} (YYYY-MM-DD)'}, status=status.HTTP_400_BAD_REQUEST)
+        games = games.filter(**{lookup: game_date})
+
+    # level: 사용자 레벨 번호. 최소 레벨 조건을 만족하는 경기만 반환
+    # Level 테이블은 작으므로 id 목록을 먼저 구해 game.level_id 로 필터링 (JOIN 없음)
+    level = params.get('level')
+    if level:
+        try:
+            level_number = int(level)
+        except ValueError:
+            return Response({'error': 'Invalid level'}, status=status.HTTP_400_BAD_REQUEST)
+        level_ids = list(Level.objects.filter(level_number__lte=level_number).values_list('id', flat=True))
+        games = games.filter(level_id__in=level_ids)
+
+    try:
+        limit = min(max(int(params.get('limit', GAME_LIST_DEFAULT_LIMIT)), 1), GAME_LIST_MAX_LIMIT)
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # OFFSET 대신 마지막으로 본 (game_date, game_time, game_id) 이후부터 조회
+    cursor = params.get('cursor')
+    if cursor:
+        position = _decode_cursor(cursor, parse_date, parse_time, int)
+        if position is None:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        game_date, game_time, game_id = position
+        games = games.filter(
+            Q(game_date__gt=game_date)
+            | Q(game_date=game_date, game_time__gt=game_time)
+            | Q(game_date=game_date, game_time=game_time, game_id__gt=game_id)
+        )
+
+    page = list(games.order_by('game_date', 'game_time', 'game_id')[:limit + 1])
+    has_next = len(page) > limit
+    page = page[:limit]
+
+    data = [{
+        'game_id': g.game_id,
+        'game_name': g.game_name,
+        'game_date': g.game_date,
+        'game_time': g.game_time,
+        'location': g.location,
+        'region': g.region,
+        'gender': g.gender,
+        'level': g.level_id,
+        'max_participants': g.max_participants,
+        'status': g.status,
+    } for g in page]
+
+    return Response({
+        'results': data,
+        'next_cursor': _encode_cursor(
+            page[-1].game_date.isoformat(), page[-1].game_time.isoformat(), page[-1].game_id,
+        ) if has_next else None,
+    })
+
+
 # 특정 레벨 사용자 게임 참여
 @api_view(['POST'])
 def join_game(request, game_id):
-    game = get_object_or_404(Game, game_id=game_id)
-    user = request.user  # 인증된 사용자를 가져옵니다.
+    game = get_object_or_404(Game.objects.select_related('level'), game_id=game_id)
+    # request.user 는 로그인 계정이므로 참가할 선수는 로그인 토큰의 player_id 로 찾는다.
+    player = current_player(request)
+    if player is None:
+        return Response({'error': 'Player profile not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    # 사용자의 레벨이 게임에 맞는지 확인
-    if user.level != game.level:
-        return Response({'error': '이 게임은 사용자의 레벨에 맞지 않습니다.'}, status=status.HTTP_403_FORBIDDEN)
+    # 사용자의 레벨이 게임의 최소 레벨을 충족하는지 확인
+    try:
+        validate_participants(game, User.objects.filter(pk=player.pk))
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_403_FORBIDDEN)
 
-    # 게임 참여 로직 실행
-    game.participants.add(user)
+    # 게임 참여 로직 실행 (정원이 찼으면 거절)
+    try:
+        reserve_seat(game, player)
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
     return Response({'message': '게임에 성공적으로 참여했습니다.'})
 
 
@@ -188,60 +441,89 @@ def add_points(request, user_id):
 
     if not points_to_add or not isinstance(points_to_add, int):
         return Response({'error': 'Invalid points value'}, status=status.HTTP_400_BAD_REQUEST)
+    if abs(points_to_add) > POINTS_MAX_AMOUNT:
+        return Response(
+            {'error': f'Points value must be at most {POINTS_MAX_AMOUNT}'}, status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # 잔액 증가와 포인트 내역 기록을 한 트랜잭션에서 처리
+    entry = record_points(user.user_id, points_to_add)
+
+    return Response({
+        'message': f'{points_to_add} points added to user {user.name}',
+        'total_points': entry.total_points,
+    })
+
+
+# 포인트 리더보드 상위 사용자 (level_id 를 주면 해당 레벨 안에서의 순위)
+@api_view(['GET'])
+def get_leaderboard(request):
+    try:
+        limit = min(int(request.query_params.get('limit', 10)), 100)
+        level_id = request.query_params.get('level_id')
+        level_id = int(level_id) if level_id else None
+    except ValueError:
+        return Response({'error': 'Invalid limit or level_id'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({'error': 'Invalid limit or level_id'}, status=status.HTTP_400_BAD_REQUEST)
+
+    entries = leaderboard.top(limit, level_id)
+    names = dict(User.objects.filter(user_id__in=[user_id for _, user_id, _ in entries]).values_list('user_id', 'name'))
+    return Response([{
+        'rank': rank,
+        'user_id': user_id,
+        'name': names.get(user_id),
+        'points': points,
+    } for rank, user_id, points in entries])
+
+
+# 사용자 순위 (전체 / 같은 레벨 안에서)
+@api_view(['GET'])
+def get_user_rank(request, user_id):
+    rank = leaderboard.rank(user_id)
+    if rank is None:
+        return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'user_id': user_id, **rank})
+
 
-    user.points += points_to_add
-    user.save()
+def _mission_catalog_etag(request, *args, **kwargs):
+    return catalog_version()
 
-    return Response({'message': f'{points_to_add} points added to user {user.name}'})
+
+def _mission_catalog_last_modified(request, *args, **kwargs):
+    return catalog_last_modified()
 
 
 # 미션 조회
+# If-None-Match 가 현재 카탈로그 버전과 같으면 DB 조회 없이 304 응답
+@condition(etag_func=_mission_catalog_etag, last_modified_func=_mission_catalog_last_modified)
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 인증 필요 없는 뷰로 설정
 def get_missions(request):
-    missions = Mission.objects.all()
-    data = [{
-        'mission_id': m.mission_id,
-        'mission_name': m.mission_name,
-        'mission_content': m.mission_content,
-        'points': m.points,
-        'video_url': m.video_url,
-        'mission_type': m.mission_type
-    } for m in missions]
-    return Response(data)
+    return Response(get_catalog_missions())
 
 
 # 특정 미션 조회
+@condition(etag_func=_mission_catalog_etag, last_modified_func=_mission_catalog_last_modified)
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 인증 필요 없는 뷰로 설정
 def get_mission_detail(request, mission_id):
-    mission = get_object_or_404(Mission, mission_id=mission_id)
-    data = {
-        'mission_id': mission.mission_id,
-        'mission_name': mission.mission_name,
-        'mission_content': mission.mission_content,
-        'points': mission.points,
-        'video_url': mission.video_url,
-        'mission_type': mission.mission_type,
-    }
-    return Response(data)
+    mission = get_catalog_mission(mission_id)
+    if mission is None:
+        raise Http404('No Mission matches the given query.')
+    return Response(mission)
 
 
 # 사용자 미션 완료 상태 조회
 @api_view(['GET'])
 def get_user_mission_status(request, user_id):
-    user_missions = UserMission.objects.filter(user__user_id=user_id)
-    all_missions = Mission.objects.all()
+    # 미션 목록은 캐시에서, 완료한 미션 ID는 한 번의 쿼리로 가져온다.
+    completed_ids = set(UserMission.objects.filter(user_id=user_id).values_list('mission_id', flat=True))
 
     data = [{
-        'mission_id': mission.mission_id,
-        'mission_name': mission.mission_name,
-        'mission_content': mission.mission_content,
-        'points': mission.points,
-        'video_url': mission.video_url,
-        'mission_type': mission.mission_type,
-        'completed': user_missions.filter(mission=mission).exists()  # 미션 완료 여부 확인
-    } for mission in all_missions]
+        **mission,
+        'completed': mission['mission_id'] in completed_ids  # 미션 완료 여부 확인
+    } for mission in get_catalog_missions()]
 
     return Response(data)
 
@@ -249,7 +531,7 @@ def get_user_mission_status(request, user_id):
 # 관심 게임 조회
 @api_view(['GET'])
 def get_favorite_games(request, user_id):
-    favorites = Favorite.objects.filter(user__user_id=user_id)
+    favorites = Favorite.objects.filter(user__user_id=user_id).select_related('game')
     if favorites.exists():
         data = [{'game': f.game.game_name, 'liked': f.liked} for f in favorites]
         return Response(data)
@@ -332,7 +614,7 @@ def make_payment(request, user_id):
 # 신청 내역 조회
 @api_view(['GET'])
 def get_user_applies(request, user_id):
-    applies = Apply.objects.filter(user__user_id=user_id)
+    applies = Apply.objects.filter(user__user_id=user_id).select_related('game')
     if applies.exists():
         data = [{'game': a.game.game_name, 'status': a.apply_status, 'apply_date': a.apply_date} for a in applies]
         return Response(data)
@@ -365,6 +647,12 @@ def cancel_application(request, user_id, game_id):
     if not application:
         return Response({'error': 'No application found for this game'}, status=status.HTTP_404_NOT_FOUND)
 
+    # 참가가 확정된 신청이면 자리를 비우고 대기열의 다음 신청자를 참가자로 올린다.
+    if application.apply_status == 'Accepted':
+        try:
+            cancel_participation(game, user)
+        except ValidationError:
+            pass  # 참가자 명단에 없는 경우 신청 내역만 삭제
     application.delete()
     return Response({'message': 'Application cancelled successfully'}, status=status.HTTP_200_OK)
 
@@ -380,12 +668,126 @@ def get_user_notifications(request, user_id):
     return Response({'error': 'Notifications not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+# 경기/지역 참가자·신청자에게 알림 일괄 발송
+@api_view(['POST'])
+def fanout_notifications(request):
+    content = request.data.get('content')
+    notification_type = request.data.get('notification_type', 'game_notification')
+    audience = request.data.get('audience', 'all')
+    game_id = request.data.get('game_id')
+    region = request.data.get('region')
+
+    if not content:
+        return Response({'error': 'Missing content'}, status=status.HTTP_400_BAD_REQUEST)
+    if bool(game_id) == bool(region):
+        return Response({'error': 'Specify exactly one of game_id or region'}, status=status.HTTP_400_BAD_REQUEST)
+    if region and region not in dict(Game.REGION_CHOICES):
+        return Response({'error': 'Invalid region'}, status=status.HTTP_400_BAD_REQUEST)
+    if audience not in dict(NotificationFanout.AUDIENCE_CHOICES):
+        return Response({'error': 'Invalid audience'}, status=status.HTTP_400_BAD_REQUEST)
+    if notification_type not in dict(Notification.NOTIFICATION_TYPE_CHOICES):
+        return Response({'error': 'Invalid notification type'}, status=status.HTTP_400_BAD_REQUEST)
+
+    game = get_object_or_404(Game, game_id=game_id) if game_id else None
+    fanout = create_fanout(content, notification_type, game=game, region=region, audience=audience)
+
+    return Response({
+        'fanout_id': fanout.fanout_id,
+        'status': fanout.status,
+        'sent_count': fanout.sent_count,
+    }, status=status.HTTP_201_CREATED)
+
+
 # 알림 읽음 처리
 @api_view(['POST'])
 def mark_notification_read(request, notification_id):
     notification = get_object_or_404(Notification, notification_id=notification_id)
     # 알림 읽음 처리 로직
-    notification.read = True
-    notification.save()
+    mark_notifications_read(notification.user_id, [notification.notification_id])
+
+    return Response({'message': 'Notification marked as read'}, status=status.HTTP_200_OK)
+
+
+# 알림함 페이지 크기
+NOTIFICATION_INBOX_DEFAULT_LIMIT = 20
+NOTIFICATION_INBOX_MAX_LIMIT = 100
+
+
+# 알림함 조회 (최신순, 키셋 커서 페이지네이션)
+@api_view(['GET'])
+def get_notification_inbox(request, user_id):
+    params = request.query_params
+    notifications = Notification.objects.filter(user_id=user_id)
+    if params.get('unread') in ('1', 'true'):
+        notifications = notifications.filter(is_read=False)
+
+    try:
+        limit = min(max(int(params.get('limit', NOTIFICATION_INBOX_DEFAULT_LIMIT)), 1), NOTIFICATION_INBOX_MAX_LIMIT)
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 마지막으로 본 (creation_date, notification_id) 보다 오래된 알림부터 조회
+    cursor = params.get('cursor')
+    if cursor:
+        position = _decode_cursor(cursor, parse_datetime, int)
+        if position is None:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        creation_date, notification_id = position
+        notifications = notifications.filter(
+            Q(creation_date__lt=creation_date)
+            | Q(creation_date=creation_date, notification_id__lt=notification_id)
+        )
+
+    page = list(notifications.order_by('-creation_date', '-notification_id')[:limit + 1])
+    has_next = len(page) > limit
+    page = page[:limit]
+
+    data = [{
+        'notification_id': n.notification_id,
+        'content': n.content,
+        'notification_type': n.notification_type,
+        'is_read': n.is_read,
+        'creation_date': n.creation_date,
+    } for n in page]
+
+    return Response({
+        'results': data,
+        'next_cursor': _encode_cursor(
+            page[-1].creation_date.isoformat(), page[-1].notification_id,
+        ) if has_next else None,
+    })
+
+
+# 읽지 않은 알림 수 조회 (집계 없이 사용자 행의 카운터를 반환)
+@api_view(['GET'])
+def get_unread_notification_count(request, user_id):
+    unread_count = User.objects.filter(user_id=user_id).values_list('unread_notification_count', flat=True).first()
+    if unread_count is None:
+        return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'unread_count': unread_count})
+
+
+# 알림 일괄 읽음 처리 (notification_ids 가 없으면 전체)
+@api_view(['POST'])
+def mark_notifications_read_bulk(request, user_id):
+    notification_ids = request.data.get('notification_ids')
+    if notification_ids is not None and (
+        not isinstance(notification_ids, list) or not all(isinstance(i, int) for i in notification_ids)
+    ):
+        return Response({'error': 'notification_ids must be a list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    updated = mark_notifications_read(user_id, notification_ids)
+    return Response({'message': 'Notifications marked as read', 'updated': updated})
+
+
+# 여러 API 요청을 한 번에 실행 (앱 시작 시 프로필/포인트/미션/관심 경기/신청/알림 조회 등)
+# 요청 본문: {"requests": [{"method": "GET", "path": "users/1/"}, {"method": "POST", "path": "...", "body": {...}}]}
+# 응답: 요청 순서대로 {"status": ..., "body": ...}
+@api_view(['POST'])
+def batch(request):
+    try:
+        parsed = parse_batch(request.data.get('requests'))
+    except ValidationError as e:
+        return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response({'message': 'Notification marked as read'}, status=status.HTTP_200_OK)
\ No newline at end of file
+    return Response({'responses': run_batch(request, parsed)})
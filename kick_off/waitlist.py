@@ -0,0 +1,94 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .games import _starts_after, game_state_changed
+from .models import Apply, Game
+
+
+GameParticipant = Game.participants.through
+
+WAITLIST_BATCH_SIZE = 2000
+
+
+# 경기 행 잠금: 같은 경기의 대기열 처리, 참가 취소, 자리 예약(reserve_seat 의 조건부 UPDATE)을 직렬화한다.
+def _lock_game(game_id):
+    return Game.objects.select_for_update(of=('self',)).select_related('level').get(game_id=game_id)
+
+
+# 경기 대기열 처리
+# 1. 최소 레벨을 만족하지 못하는 대기 신청은 UPDATE 한 번으로 모두 거절
+# 2. 남은 자리만큼 대기 신청을 우선순위(높은 순) → 신청 순으로 가져와 참가자로 추가 (through 테이블 bulk_create)
+# 3. 참가자 수/상태를 UPDATE 한 번으로 반영
+# 신청자 수와 관계없이 배치마다 쿼리 수가 고정되며, 남은 자리보다 많은 신청은 읽지 않는다.
+def process_waitlist(game, batch_size=WAITLIST_BATCH_SIZE):
+    with transaction.atomic():
+        game = _lock_game(game.game_id)
+        pending = Apply.objects.filter(game_id=game.game_id, apply_status='Pending')
+
+        rejected = pending.filter(
+            user__level__level_number__lt=game.level.level_number,
+        ).update(apply_status='Rejected')
+
+        accepted = seated = 0
+        free = game.max_participants - game.participant_count if game.status == 'upcoming' else 0
+        while free > 0:
+            batch = list(pending.order_by('-priority', 'apply_date', 'apply_id').values_list(
+                'apply_id', 'user_id',
+            )[:min(free, batch_size)])
+            if not batch:
+                break
+
+            user_ids = [user_id for _, user_id in batch]
+            # join_game 으로 이미 참가한 사용자는 자리를 새로 차지하지 않는다. (참가자가 없던 경기는 확인 생략)
+            already_seated = set()
+            if game.participant_count:
+                already_seated = set(GameParticipant.objects.filter(
+                    game_id=game.game_id, user_id__in=user_ids,
+                ).values_list('user_id', flat=True))
+            GameParticipant.objects.bulk_create([
+                GameParticipant(game_id=game.game_id, user_id=user_id)
+                for user_id in user_ids if user_id not in already_seated
+            ])
+            Apply.objects.filter(apply_id__in=[apply_id for apply_id, _ in batch]).update(apply_status='Accepted')
+
+            added = len(user_ids) - len(already_seated)
+            free -= added
+            seated += added
+            accepted += len(batch)
+
+        if seated:
+            Game.objects.filter(game_id=game.game_id).update(
+                # MySQL은 SET 절을 왼쪽부터 적용하므로 status 를 participant_count 보다 먼저 둔다.
+                status=Case(
+                    When(participant_count__gte=F('max_participants') - seated, then=Value('finished')),
+                    default=F('status'),
+                ),
+                participant_count=F('participant_count') + seated,
+            )
+            game_state_changed([game.game_id])
+
+    return {'accepted': accepted, 'rejected': rejected, 'seated': seated}
+
+
+# 참가 취소 후 대기열의 다음 신청자를 참가자로 올림
+# 정원이 차서 마감(finished)된 경기는 아직 시작하지 않았다면 다시 신청 가능(upcoming)으로 되돌린다.
+# (이미 시작했거나 끝난 경기는 그대로 두므로 대기열에서 참가자를 올리지 않는다.)
+# 신청 내역(Apply) 처리는 호출하는 쪽에서 한다.
+def cancel_participation(game, user):
+    with transaction.atomic():
+        game = _lock_game(game.game_id)
+        removed, _ = GameParticipant.objects.filter(game_id=game.game_id, user_id=user.pk).delete()
+        if not removed:
+            raise ValidationError('참가하지 않은 경기입니다.')
+
+        Game.objects.filter(game_id=game.game_id).update(
+            status=Case(
+                When(Q(status='finished') & _starts_after(timezone.localtime()), then=Value('upcoming')),
+                default=F('status'),
+            ),
+            participant_count=F('participant_count') - 1,
+        )
+        game_state_changed([game.game_id])
+        return process_waitlist(game)
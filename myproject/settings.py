@@ -58,9 +58,14 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # 앞단 프록시(로드밸런서) 수. 0 이면 X-Forwarded-For 를 무시하고 REMOTE_ADDR 로 IP 요청 수를 제한한다.
+    # 프록시 뒤에서 운영할 때는 프록시 수로 바꿔야 한다. (None 이면 클라이언트가 보낸 헤더를 그대로 믿는다.)
+    'NUM_PROXIES': 0,
 }
 
 MIDDLEWARE = [
+    'kick_off.middleware.SQLInstrumentationMiddleware',
+    'kick_off.middleware.IdempotencyMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -105,6 +110,14 @@ DATABASES = {
     }
 }
 
+# 여러 워커 프로세스가 함께 쓰는 캐시 (미션 카탈로그 버전, 인증 코드)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',  # 로컬 Redis 서버
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -126,6 +139,19 @@ AUTH_PASSWORD_VALIDATORS = [
 
 SITE_ID = 1
 
+# 요청별 SQL 계측 로그 (kick_off.middleware, 운영 환경에서 SQL_INSTRUMENTATION_ENABLED = True 일 때)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'kick_off.middleware': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'kick_off.otp': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 